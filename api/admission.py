@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import deque
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted before its deadline"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Overloaded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+class AdmissionController:
+    def __init__(self, max_concurrency: int, max_wait_seconds: float, initial_latency_seconds: float = 1.0,
+                 smoothing: float = 0.2):
+        """
+        Initialize admission control for one route
+
+        Requests beyond max_concurrency wait in a FIFO queue. The queue is sized
+        from the observed service time: a request is rejected up front when its
+        estimated wait would exceed max_wait_seconds, so admitted requests keep a
+        stable latency instead of all timing out together.
+        :param max_concurrency: Requests processed at once
+        :param max_wait_seconds: Longest a request may wait for a slot
+        :param initial_latency_seconds: Service time assumed before any is observed
+        :param smoothing: Weight of the newest sample in the service time average
+        """
+        self.max_concurrency = max_concurrency
+        self.max_wait_seconds = max_wait_seconds
+        self.smoothing = smoothing
+        self.latency = initial_latency_seconds
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: deque = deque()
+
+    def estimated_wait(self, position: int) -> float:
+        """
+        Estimate how long a request at a queue position waits for a slot
+        :param position: 1-based position in the wait queue
+        :return: Estimated wait in seconds
+        """
+        return math.ceil(position / self.max_concurrency) * self.latency
+
+    async def acquire(self):
+        """
+        Wait for a processing slot
+        :raises Overloaded: If the slot would not be available within max_wait_seconds
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            return
+
+        wait = self.estimated_wait(len(self._waiters) + 1)
+        if wait > self.max_wait_seconds:
+            self.rejected += 1
+            raise Overloaded(wait)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot straight to the waiter, in_flight stays as is
+            await asyncio.wait_for(waiter, self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            self._waiters.remove(waiter)
+            self.rejected += 1
+            raise Overloaded(self.estimated_wait(len(self._waiters) + 1))
+        except BaseException:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the client went away, pass it on
+                self.release()
+            raise
+
+    def release(self, duration: Optional[float] = None):
+        """
+        Free a processing slot, handing it to the next waiter if there is one
+        :param duration: Seconds the finished request took, to update the service time estimate
+        """
+        if duration is not None:
+            self.latency += self.smoothing * (duration - self.latency)
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get admission statistics
+        :return: Dictionary of in-flight, queued and rejected counts and the latency estimate
+        """
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "rejected": self.rejected,
+            "latency_seconds": round(self.latency, 3)
+        }
+
+class AdmissionMiddleware:
+    def __init__(self, app, limits: Dict[str, AdmissionController]):
+        """
+        ASGI middleware applying per-route admission control
+        :param app: ASGI application
+        :param limits: Admission controller per request path, other paths are not limited
+        """
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        controller = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await controller.acquire()
+        except Overloaded as e:
+            logger.warning(f"Shedding request to {scope['path']}: {str(e)}")
+            body = json.dumps({"detail": "Service overloaded, please retry later"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(e.retry_after))).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        started = time.perf_counter()
+        try:
+            # Streaming responses keep their slot until the last chunk is sent
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - started)
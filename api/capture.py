@@ -0,0 +1,80 @@
+import random
+import time
+from typing import Iterable
+from observability.capture import RequestCapture
+from observability.tracing import current_trace
+
+class CaptureMiddleware:
+    def __init__(self, app, capture: RequestCapture, sample_rate: float, max_body_bytes: int = 10 * 1024 * 1024,
+                 prefixes: Iterable[str] = ("/api/",), exclude_prefixes: Iterable[str] = ("/api/debug",)):
+        """
+        ASGI middleware recording a sample of requests for later replay
+        :param app: ASGI application
+        :param capture: Writer of the captured envelopes
+        :param sample_rate: Fraction of requests captured
+        :param max_body_bytes: Larger bodies are recorded by size only
+        :param prefixes: Paths captured
+        :param exclude_prefixes: Paths never captured
+        """
+        self.app = app
+        self.capture = capture
+        self.sample_rate = sample_rate
+        self.max_body_bytes = max_body_bytes
+        self.prefixes = tuple(prefixes)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    def _sampled(self, scope) -> bool:
+        if scope["type"] != "http":
+            return False
+        path = scope["path"]
+        if not path.startswith(self.prefixes) or path.startswith(self.exclude_prefixes):
+            return False
+        return random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if not self._sampled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        wall_started = time.time()
+        started = time.perf_counter()
+        chunks = []
+        sizes = {"request": 0, "response": 0}
+        status = {"code": None}
+
+        async def receive_capturing():
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                sizes["request"] += len(body)
+                if sizes["request"] <= self.max_body_bytes:
+                    chunks.append(body)
+            return message
+
+        async def send_capturing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_capturing, send_capturing)
+        finally:
+            headers = dict(scope.get("headers", []))
+            trace = current_trace()
+            envelope = {
+                "ts": wall_started,
+                "method": scope["method"],
+                "route": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "content_type": headers.get(b"content-type", b"").decode("latin-1"),
+                "status": status["code"],
+                "request_bytes": sizes["request"],
+                "response_bytes": sizes["response"],
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "trace_id": trace.trace_id if trace is not None else None,
+                "body_ref": None
+            }
+            body = b"".join(chunks) if chunks and sizes["request"] <= self.max_body_bytes else None
+            self.capture.record(envelope, body)
\ No newline at end of file
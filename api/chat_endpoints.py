@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from typing import Dict, Optional
+import logging
+import os
+from api.dependencies import get_chat_session_store, get_openai_service
+from services.chat_session_store import ChatSessionError
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Most recent messages sent to the model as context
+CONTEXT_MESSAGES = int(os.getenv("CHAT_CONTEXT_MESSAGES", "20"))
+
+class ChatRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None  # Omit to start a new session
+    language: str = "en"  # Only used when starting a new session
+
+@router.post("/chat")
+async def chat(
+    request: ChatRequest,
+    store=Depends(get_chat_session_store),
+    openai_service=Depends(get_openai_service)
+) -> Dict:
+    """
+    Answer a chat message in a server-side session
+
+    Clients send only the session ID and the new message; the conversation
+    state and history stay on the server. Each message also advances the
+    intake flow, whose next question and progress come back as "flow".
+    """
+    async with store.checkout(request.session_id, request.language) as session:
+        if session is None:
+            raise HTTPException(status_code=404, detail="Chat session not found")
+
+        async with session.lock:
+            context = session.history[-CONTEXT_MESSAGES:]
+            try:
+                response = "".join([
+                    token async for token in openai_service.stream_legal_response(context, request.message)
+                ])
+            except Exception as e:
+                logger.error(f"Chat failed for session {session.session_id}: {str(e)}")
+                raise HTTPException(status_code=502, detail="Failed to get a response")
+
+            # Record the turn only once it succeeded, so a retry does not duplicate it
+            session.add_turn("user", request.message, store.max_history)
+            session.add_turn("assistant", response, store.max_history)
+            flow = session.advance_flow(request.message)
+
+            return {
+                "session_id": session.session_id,
+                "response": response,
+                "flow": flow,
+                "message_count": len(session.conversation_manager.conversation_history)
+            }
+
+@router.get("/chat/{session_id}")
+async def get_chat_history(session_id: str, store=Depends(get_chat_session_store)) -> Dict:
+    """
+    Get the history and progress of a chat session
+    """
+    async with store.checkout(session_id) as session:
+        if session is None:
+            raise HTTPException(status_code=404, detail="Chat session not found")
+        return {
+            "session_id": session.session_id,
+            "language": session.conversation_manager.language,
+            "history": session.history,
+            "summary": session.conversation_manager.get_conversation_summary()
+        }
+
+@router.delete("/chat/{session_id}")
+async def delete_chat_session(session_id: str, store=Depends(get_chat_session_store)) -> Dict:
+    """
+    Delete a chat session from memory and disk
+    """
+    try:
+        deleted = await store.delete(session_id)
+    except ChatSessionError:
+        deleted = False
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return {"status": "deleted", "session_id": session_id}
\ No newline at end of file
@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Literal, Optional
+import asyncio
+import hmac
+import math
+import os
+from observability.profiling import (
+    ProfilerBusyError, ProfilerStateError, collapsed_stacks, cpu_profiler, memory_profiler
+)
+from observability.tracing import slow_traces
+
+router = APIRouter()
+
+# The grouping keys of observability.profiling.GROUP_BY_KEYS, rejected with a 422 otherwise
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+def require_debug_token(x_debug_token: Optional[str] = Header(None)):
+    """Only serve debug endpoints when DEBUG_TOKEN is configured and presented"""
+    expected = os.getenv("DEBUG_TOKEN")
+    # Compared as bytes: compare_digest raises TypeError on non-ASCII strings, and a header may hold any byte
+    if not expected or not x_debug_token or not hmac.compare_digest(expected.encode(), x_debug_token.encode()):
+        # Indistinguishable from a missing route
+        raise HTTPException(status_code=404, detail="Not Found")
+
+@router.get("/traces", dependencies=[Depends(require_debug_token)])
+async def recent_traces(limit: int = 50, min_duration_ms: float = 0.0) -> Dict:
+    """
+    List recent slow requests with their span breakdown, newest first
+    """
+    return {
+        "threshold_ms": slow_traces.threshold_ms,
+        "traces": slow_traces.recent(limit=limit, min_duration_ms=min_duration_ms)
+    }
+
+@router.post("/profile/cpu", dependencies=[Depends(require_debug_token)])
+async def profile_cpu(seconds: float = 10.0, interval_ms: float = 10.0, include_idle: bool = False) -> PlainTextResponse:
+    """
+    Sample all threads of this worker for a while and return collapsed stacks for a flamegraph
+    """
+    try:
+        profile = await asyncio.to_thread(cpu_profiler.profile, seconds, interval_ms / 1000, include_idle)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    return PlainTextResponse(
+        collapsed_stacks(profile),
+        headers={"X-Profile-Samples": str(profile["samples"]), "X-Profile-Seconds": str(profile["duration_seconds"])}
+    )
+
+@router.post("/memory/start", dependencies=[Depends(require_debug_token)])
+async def start_memory_tracing(frames: int = 25) -> Dict:
+    """
+    Start tracemalloc on this worker
+    """
+    return memory_profiler.start(frames)
+
+@router.post("/memory/stop", dependencies=[Depends(require_debug_token)])
+async def stop_memory_tracing() -> Dict:
+    """
+    Stop tracemalloc on this worker
+    """
+    return memory_profiler.stop()
+
+@router.post("/memory/snapshot", dependencies=[Depends(require_debug_token)])
+async def memory_snapshot(limit: int = 25, group_by: GroupBy = "lineno") -> Dict:
+    """
+    Take the baseline snapshot and list the largest allocation sites and object counts
+    """
+    try:
+        return await asyncio.to_thread(memory_profiler.snapshot, limit, group_by)
+    except ProfilerStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/memory/diff", dependencies=[Depends(require_debug_token)])
+async def memory_diff(limit: int = 25, group_by: GroupBy = "lineno", reset_baseline: bool = False) -> Dict:
+    """
+    List the allocation sites that grew the most since the baseline snapshot
+    """
+    try:
+        return await asyncio.to_thread(memory_profiler.diff, limit, group_by, reset_baseline)
+    except ProfilerStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
\ No newline at end of file
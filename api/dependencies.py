@@ -0,0 +1,71 @@
+from typing import Optional
+import logging
+import os
+from services.bhashini_service import BhashiniService
+
+logger = logging.getLogger(__name__)
+
+_bhashini_service: Optional[BhashiniService] = None
+_openai_service = None
+_language_detector = None
+_chat_session_store = None
+_image_processor = None
+
+async def get_bhashini_service() -> BhashiniService:
+    """Share one BhashiniService, and its pooled HTTP session, across requests"""
+    global _bhashini_service
+    if _bhashini_service is None:
+        _bhashini_service = BhashiniService()
+    return _bhashini_service
+
+def get_openai_service():
+    """Share one Azure OpenAI client across requests, importing the SDK on first use"""
+    global _openai_service
+    if _openai_service is None:
+        from services.azure_openai_service import AzureOpenAIService
+        _openai_service = AzureOpenAIService()
+    return _openai_service
+
+def get_language_detector():
+    """Build the language detector, importing NumPy, on first use"""
+    global _language_detector
+    if _language_detector is None:
+        from services.language_detector import LanguageDetector
+        _language_detector = LanguageDetector()
+    return _language_detector
+
+def get_chat_session_store():
+    """Share one chat session store, so sessions survive across requests"""
+    global _chat_session_store
+    if _chat_session_store is None:
+        from services.chat_session_store import ChatSessionStore
+        _chat_session_store = ChatSessionStore(
+            spill_dir=os.getenv("CHAT_SESSION_DIR", "data/chat_sessions"),
+            max_hot_sessions=int(os.getenv("CHAT_MAX_HOT_SESSIONS", "1000")),
+            idle_seconds=float(os.getenv("CHAT_SESSION_IDLE_SECONDS", "600")),
+            max_history=int(os.getenv("CHAT_MAX_HISTORY", "100"))
+        )
+    return _chat_session_store
+
+def get_image_processor():
+    """Share one image processor, importing Pillow on first use"""
+    global _image_processor
+    if _image_processor is None:
+        from services.image_processing import ImageProcessor
+        _image_processor = ImageProcessor(
+            store_dir=os.getenv("IMAGE_STORE_DIR", "data/images"),
+            max_dimension=int(os.getenv("IMAGE_MAX_DIMENSION", "1600")),
+            max_bytes=int(os.getenv("IMAGE_MAX_KB", "300")) * 1024
+        )
+    return _image_processor
+
+async def close_services():
+    """Release upstream connections and persist chat sessions on shutdown"""
+    global _bhashini_service
+    if _chat_session_store is not None:
+        await _chat_session_store.flush()
+        logger.info("Persisted chat sessions")
+    if _bhashini_service is not None and _bhashini_service.session is not None:
+        await _bhashini_service.session.close()
+        logger.info("Closed Bhashini HTTP session")
+    _bhashini_service = None
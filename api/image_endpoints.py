@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+from typing import AsyncIterator, Dict
+import asyncio
+import logging
+import os
+from api.dependencies import get_image_processor
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = int(float(os.getenv("IMAGE_MAX_UPLOAD_MB", "20")) * 1024 * 1024)
+# Room for the multipart boundaries and part headers around the image
+MAX_BODY_BYTES = MAX_UPLOAD_BYTES + 64 * 1024
+
+async def _limited(stream: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[bytes]:
+    """Pass request body chunks through, failing with 413 as soon as more than max_bytes arrived"""
+    received = 0
+    async for chunk in stream:
+        received += len(chunk)
+        if received > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload larger than {MAX_UPLOAD_BYTES} bytes")
+        yield chunk
+
+@router.post("/image")
+async def upload_image(request: Request, processor=Depends(get_image_processor)) -> Dict:
+    """
+    Upload a photo, e.g. of an FIR or notice, and get its compact version
+
+    The photo is sent as the "file" field of a multipart form. The body is
+    parsed here rather than by a File() parameter, so an oversized
+    upload is refused from its Content-Length, or as soon as the limit is
+    passed, instead of after it was spooled in full. The image is spooled to
+    disk and hashed in chunks. Known content returns the stored compact image
+    without decoding; new images are downscaled and re-encoded to a bounded
+    JPEG. Downstream consumers fetch the compact image by its image_id.
+    """
+    from services.image_processing import ImageProcessingError, ImageTooLargeError, hash_stream
+
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail=f"Upload larger than {MAX_UPLOAD_BYTES} bytes")
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Send the image as a multipart form upload")
+
+    try:
+        form = await MultiPartParser(
+            request.headers, _limited(request.stream(), MAX_BODY_BYTES), max_files=1, max_fields=10
+        ).parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    try:
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(status_code=400, detail="Missing file field")
+        if file.content_type and not file.content_type.startswith("image/"):
+            raise HTTPException(status_code=415, detail="Only image uploads are supported")
+
+        image_id, size = await asyncio.to_thread(hash_stream, file.file, MAX_UPLOAD_BYTES)
+        return await processor.process_async(file.file, image_id, size)
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ImageProcessingError as e:
+        logger.warning(f"Rejected image upload: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await form.close()
+
+@router.get("/image/{image_id}")
+async def get_image(image_id: str, processor=Depends(get_image_processor)) -> FileResponse:
+    """
+    Get the compact JPEG of an uploaded image
+    """
+    from services.image_processing import ImageProcessingError
+
+    try:
+        path = processor.compact_path(image_id)
+    except ImageProcessingError:
+        path = None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    # Content addressed, so the image at this URL never changes
+    return FileResponse(path, media_type="image/jpeg", headers={"Cache-Control": "public, max-age=31536000, immutable"})
\ No newline at end of file
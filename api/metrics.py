@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+from starlette.routing import compile_path
+import hmac
+import os
+import time
+from observability.metrics import CONTENT_TYPE, MetricsRegistry, registry as default_registry
+
+router = APIRouter()
+
+UNMATCHED_ROUTE = "unmatched"
+
+class MetricsMiddleware:
+    def __init__(self, app, routes: Iterable[str], registry: MetricsRegistry = default_registry,
+                 exclude_paths: Iterable[str] = ("/metrics",)):
+        """
+        ASGI middleware recording request counts, in-flight requests, latency and payload sizes per route
+        :param app: ASGI application
+        :param routes: Route templates served, e.g. /api/chat/{session_id}; other paths count as unmatched
+        :param registry: Where metrics are recorded
+        :param exclude_paths: Paths not recorded, e.g. the scrape endpoint itself
+        """
+        self.app = app
+        self.registry = registry
+        self.exclude_paths = set(exclude_paths)
+        # Routes without path parameters resolve with one dictionary lookup
+        self._static_routes: Dict[str, str] = {}
+        self._dynamic_routes: List[Tuple[Pattern, str]] = []
+        for template in dict.fromkeys(routes):
+            if "{" in template:
+                self._dynamic_routes.append((compile_path(template)[0], template))
+            else:
+                self._static_routes[template] = template
+
+    def _route_template(self, path: str) -> str:
+        template = self._static_routes.get(path)
+        if template is not None:
+            return template
+        for regex, template in self._dynamic_routes:
+            if regex.match(path):
+                return template
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        route = self._route_template(scope["path"])
+        started = time.perf_counter()
+        sizes = {"request": 0, "response": 0}
+        status = {"code": 500}
+        self.registry.request_started(route)
+
+        async def receive_counting():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["request"] += len(message.get("body", b""))
+            return message
+
+        async def send_counting(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_counting, send_counting)
+        finally:
+            self.registry.request_finished(
+                route, scope["method"], status["code"], time.perf_counter() - started,
+                sizes["request"], sizes["response"]
+            )
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)) -> PlainTextResponse:
+    """
+    Expose request metrics of this worker in the Prometheus text format
+    """
+    expected = os.getenv("METRICS_TOKEN")
+    # Compared as bytes: compare_digest raises TypeError on non-ASCII strings, and a header may hold any byte
+    if expected and not (authorization and hmac.compare_digest(authorization.encode(), f"Bearer {expected}".encode())):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(default_registry.render(), media_type=CONTENT_TYPE)
\ No newline at end of file
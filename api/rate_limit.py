@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+from config.security_config import SECURITY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# (allowed, remaining requests, seconds until the next request would be allowed)
+RateLimitResult = Tuple[bool, int, float]
+
+class SlidingWindowLimiter:
+    def __init__(self, limit: int, window_seconds: float, max_keys: int = 100000):
+        """
+        Initialize an in-process sliding window counter limiter
+
+        Each key keeps the request counts of the current and previous fixed windows.
+        The previous count is weighted by how much of it still overlaps the sliding
+        window, which gives O(1) time and memory per key.
+        :param limit: Requests allowed per window
+        :param window_seconds: Window length in seconds
+        :param max_keys: Maximum tracked keys, least recently seen are evicted first
+        """
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        # key -> [window index, current count, previous count]
+        self._keys: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def _evict(self, window: int):
+        # Keys unseen for two windows carry no state worth keeping
+        while self._keys:
+            oldest_key, oldest = next(iter(self._keys.items()))
+            if oldest[0] < window - 1 or len(self._keys) > self.max_keys:
+                del self._keys[oldest_key]
+            else:
+                break
+
+    async def hit(self, key: str, now: Optional[float] = None) -> RateLimitResult:
+        """
+        Count a request for key
+        :param key: Client key
+        :param now: Current time in seconds, defaults to time.time()
+        :return: Tuple of (allowed, remaining, retry after seconds)
+        """
+        now = time.time() if now is None else now
+        window = int(now // self.window_seconds)
+        elapsed = (now % self.window_seconds) / self.window_seconds
+
+        state = self._keys.get(key)
+        if state is None:
+            state = [window, 0, 0]
+            self._keys[key] = state
+        elif state[0] != window:
+            state[2] = state[1] if state[0] == window - 1 else 0
+            state[1] = 0
+            state[0] = window
+        self._keys.move_to_end(key)
+        self._evict(window)
+
+        allowed, remaining, retry_after = _decide(self.limit, self.window_seconds, elapsed, state[1], state[2])
+        if allowed:
+            state[1] += 1
+        return allowed, remaining, retry_after
+
+class RedisSlidingWindowLimiter:
+    def __init__(self, url: str, limit: int, window_seconds: float, prefix: str = "ratelimit"):
+        """
+        Initialize a sliding window counter limiter shared through Redis
+
+        Lets limits hold across uvicorn workers and hosts. Counters expire on
+        their own, so idle keys cost nothing. Requires the optional redis package.
+        :param url: Redis URL, e.g. redis://localhost:6379/0
+        :param limit: Requests allowed per window
+        :param window_seconds: Window length in seconds
+        :param prefix: Key prefix in Redis
+        """
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.prefix = prefix
+
+    async def hit(self, key: str, now: Optional[float] = None) -> RateLimitResult:
+        """
+        Count a request for key
+        :param key: Client key
+        :param now: Current time in seconds, defaults to time.time()
+        :return: Tuple of (allowed, remaining, retry after seconds)
+        """
+        now = time.time() if now is None else now
+        window = int(now // self.window_seconds)
+        elapsed = (now % self.window_seconds) / self.window_seconds
+        current_key = f"{self.prefix}:{key}:{window}"
+
+        pipeline = self.client.pipeline()
+        pipeline.incr(current_key)
+        pipeline.expire(current_key, math.ceil(self.window_seconds * 2))
+        pipeline.get(f"{self.prefix}:{key}:{window - 1}")
+        current, _, previous = await pipeline.execute()
+
+        # The increment already happened, so judge the count before it
+        allowed, remaining, retry_after = _decide(
+            self.limit, self.window_seconds, elapsed, int(current) - 1, int(previous or 0)
+        )
+        if not allowed:
+            # Rejected requests don't count against the client
+            await self.client.decr(current_key)
+        return allowed, remaining, retry_after
+
+def _decide(limit: int, window_seconds: float, elapsed: float, current: int, previous: int) -> RateLimitResult:
+    """Judge a request against the weighted count of the sliding window"""
+    weighted = previous * (1.0 - elapsed) + current
+    if weighted < limit:
+        return True, max(0, int(limit - weighted - 1)), 0.0
+
+    # Wait until enough of the previous window has slid out, or the next window
+    if previous and current < limit:
+        needed = (weighted - limit + 1) / previous
+        retry_after = needed * window_seconds
+    else:
+        retry_after = (1.0 - elapsed) * window_seconds
+    return False, 0, retry_after
+
+def create_rate_limiter():
+    """
+    Build the limiter from SECURITY_CONFIG['API']['RATE_LIMIT']
+
+    Uses Redis when RATE_LIMIT_REDIS_URL is set, otherwise a per-process limiter.
+    :return: Limiter instance
+    """
+    config = SECURITY_CONFIG['API']['RATE_LIMIT']
+    limit = config['MAX_REQUESTS']
+    window_seconds = config['WINDOW'].total_seconds()
+
+    redis_url = os.getenv("RATE_LIMIT_REDIS_URL")
+    if redis_url:
+        try:
+            return RedisSlidingWindowLimiter(redis_url, limit, window_seconds)
+        except ImportError:
+            logger.warning("RATE_LIMIT_REDIS_URL is set but redis is not installed, limiting per process")
+    return SlidingWindowLimiter(limit, window_seconds)
+
+def _key_digest(api_key: bytes) -> str:
+    return hashlib.sha256(api_key).hexdigest()
+
+def load_api_keys() -> FrozenSet[str]:
+    """
+    Read the API keys that get their own rate limit bucket from API_KEYS (comma separated)
+    :return: Keys
+    """
+    return frozenset(key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip())
+
+class RateLimitMiddleware:
+    def __init__(self, app, limiter=None, exempt_paths: Iterable[str] = ("/docs", "/redoc", "/openapi.json", "/metrics"),
+                 trust_forwarded_for: bool = False, api_keys: Optional[Iterable[str]] = None):
+        """
+        ASGI middleware enforcing a request rate limit per API key, or per client IP
+
+        Only keys listed in api_keys get their own bucket. Any other X-API-Key
+        value is ignored and the request counts against its client IP, so
+        clients cannot escape the limit by inventing keys.
+        :param app: ASGI application
+        :param limiter: Limiter with an async hit(key) method, built from the security config if None
+        :param exempt_paths: Path prefixes that are never limited
+        :param trust_forwarded_for: Key on X-Forwarded-For, only safe behind a trusted proxy
+        :param api_keys: Known API keys, read from API_KEYS if None
+        """
+        self.app = app
+        self.limiter = limiter or create_rate_limiter()
+        self.exempt_paths = tuple(exempt_paths)
+        self.trust_forwarded_for = trust_forwarded_for
+        # Only digests are kept, and used as limiter keys, so keys never reach Redis
+        self._key_digests = frozenset(
+            _key_digest(key.encode("latin-1")) for key in (load_api_keys() if api_keys is None else api_keys)
+        )
+
+    def client_key(self, scope) -> str:
+        headers = dict(scope.get("headers") or [])
+        api_key = headers.get(b"x-api-key")
+        if api_key:
+            digest = _key_digest(api_key)
+            if digest in self._key_digests:
+                return "key:" + digest
+        if self.trust_forwarded_for and b"x-forwarded-for" in headers:
+            return "ip:" + headers[b"x-forwarded-for"].decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            allowed, remaining, retry_after = await self.limiter.hit(self.client_key(scope))
+        except Exception as e:
+            # A broken shared store must not take the API down with it
+            logger.error(f"Rate limiter failed, allowing request: {str(e)}")
+            await self.app(scope, receive, send)
+            return
+
+        limit_headers = [
+            (b"x-ratelimit-limit", str(self.limiter.limit).encode()),
+            (b"x-ratelimit-remaining", str(remaining).encode())
+        ]
+
+        if not allowed:
+            body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": limit_headers + [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + limit_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
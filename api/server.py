@@ -0,0 +1,115 @@
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+import logging
+import os
+from api.admission import AdmissionController, AdmissionMiddleware
+from api.capture import CaptureMiddleware
+from api.chat_endpoints import router as chat_router
+from api.debug_endpoints import router as debug_router
+from api.dependencies import close_services
+from api.image_endpoints import router as image_router
+from api.metrics import MetricsMiddleware, router as metrics_router
+from api.rate_limit import RateLimitMiddleware
+from api.tracing import TracingMiddleware
+from api.voice_endpoints import router as voice_router
+from api.voice_chat_endpoints import router as voice_chat_router
+from observability.capture import create_request_capture
+from observability.logging_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Upstream and CPU bound routes: (concurrent requests, longest acceptable wait for a slot in seconds)
+ROUTE_LIMITS = {
+    "/api/process-voice": (16, 5.0),
+    "/api/speech-to-text": (16, 5.0),
+    "/api/process-text": (32, 3.0),
+    "/api/text-to-speech": (16, 3.0),
+    "/api/voice-chat": (8, 5.0),
+    "/api/chat": (32, 5.0),
+    "/api/image": (4, 10.0)
+}
+
+# (router, path prefix, OpenAPI tags)
+ROUTERS = [
+    (voice_router, "/api", ["voice"]),
+    (voice_chat_router, "/api", ["voice"]),
+    (chat_router, "/api", ["chat"]),
+    (image_router, "/api", ["image"]),
+    (debug_router, "/api/debug", ["debug"]),
+    (metrics_router, "", None)
+]
+
+def create_app() -> FastAPI:
+    """
+    Create the headless Legal Assistant API
+
+    Only the web stack is imported here. Audio, language detection and LLM
+    dependencies load on the first request that needs them, so workers start fast
+    and run on hosts without audio or display libraries.
+    :return: FastAPI application
+    """
+    configure_logging("api.log")
+    app = FastAPI(title="Legal Assistant API")
+
+    # Shed load on upstream-bound routes before requests pile up behind Bhashini and Azure
+    app.state.admission = {
+        path: AdmissionController(max_concurrency, max_wait)
+        for path, (max_concurrency, max_wait) in ROUTE_LIMITS.items()
+    }
+    app.add_middleware(AdmissionMiddleware, limits=app.state.admission)
+
+    # Enforce SECURITY_CONFIG['API']['RATE_LIMIT'], inside CORS so 429s carry CORS headers
+    app.add_middleware(RateLimitMiddleware)
+
+    # Opt-in sampling of requests for replay, outside rate limiting so rejected traffic is part of the load shape
+    app.state.capture = create_request_capture()
+    if app.state.capture is not None:
+        app.add_middleware(
+            CaptureMiddleware,
+            capture=app.state.capture,
+            sample_rate=float(os.getenv("CAPTURE_SAMPLE_RATE"))
+        )
+
+    # Wraps capture, rate limiting and admission, so the trace covers their waits; the last middleware added
+    # runs first, so requests pass CORS, metrics, tracing, capture, rate limiting and admission in that order
+    app.add_middleware(TracingMiddleware)
+
+    # Per-route counts, in-flight requests, latency and payload sizes, scraped from /metrics
+    app.add_middleware(
+        MetricsMiddleware,
+        routes=[prefix + route.path for router, prefix, _ in ROUTERS for route in router.routes]
+    )
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with specific origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    for router, prefix, tags in ROUTERS:
+        app.include_router(router, prefix=prefix, tags=tags)
+
+    # Add startup and shutdown events
+    @app.on_event("startup")
+    async def startup_event():
+        logger.info("Starting up FastAPI application")
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        logger.info("Shutting down FastAPI application")
+        await close_services()
+        if app.state.capture is not None:
+            app.state.capture.close()
+
+    return app
+
+def __getattr__(name):
+    # `uvicorn api.server:app` builds the app, and configures logging, on first access rather than on import,
+    # so tools and REPLs importing this module create no log files
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,33 @@
+from observability.tracing import SlowTraceBuffer, slow_traces, start_trace
+
+class TracingMiddleware:
+    def __init__(self, app, buffer: SlowTraceBuffer = slow_traces):
+        """
+        ASGI middleware tracing each request and reporting it in a Server-Timing header
+        :param app: ASGI application
+        :param buffer: Where slow traces are kept for the debug endpoint
+        """
+        self.app = app
+        self.buffer = buffer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with start_trace(f"{scope['method']} {scope['path']}") as trace:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    trace.status = message["status"]
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", trace.server_timing().encode()),
+                        (b"x-trace-id", trace.trace_id.encode())
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                trace.finish()
+                self.buffer.record(trace)
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import AsyncIterator, Dict, List
+import json
+import logging
+from api.dependencies import get_bhashini_service, get_language_detector, get_openai_service
+from services.bhashini_service import BhashiniService
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+class VoiceChatRequest(BaseModel):
+    audio_data: str  # Base64 encoded audio data
+    language: str
+    conversation_history: List[str] = []  # Previous turns in English
+    include_speech: bool = True
+
+async def encode_events(events: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """Serialize orchestrator events as newline-delimited JSON"""
+    try:
+        async for event in events:
+            yield (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+    except Exception as e:
+        # Headers are already sent, so report failures in-band
+        logger.error(f"Voice chat failed: {str(e)}")
+        yield (json.dumps({"event": "error", "detail": str(e)}) + "\n").encode("utf-8")
+
+@router.post("/voice-chat")
+async def voice_chat(
+    request: VoiceChatRequest,
+    bhashini_service: BhashiniService = Depends(get_bhashini_service),
+    openai_service=Depends(get_openai_service)
+) -> StreamingResponse:
+    """
+    Answer a spoken question in one round trip (ASR, NMT, LLM, NMT, TTS)
+
+    Streams newline-delimited JSON events: transcript, query, one sentence event
+    per answer sentence with its translated text and audio, and a final done
+    event with the per-stage timing breakdown in milliseconds.
+    """
+    from services.voice_chat_orchestrator import VoiceChatOrchestrator
+    orchestrator = VoiceChatOrchestrator(bhashini_service, openai_service, get_language_detector())
+    events = orchestrator.run(
+        audio_data=request.audio_data,
+        language=request.language,
+        conversation_history=request.conversation_history,
+        include_speech=request.include_speech
+    )
+    return StreamingResponse(encode_events(events), media_type="application/x-ndjson")
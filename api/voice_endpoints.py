@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional, Dict
+from api.dependencies import get_bhashini_service, get_language_detector
 from services.bhashini_service import BhashiniService, BhashiniError
 
 router = APIRouter()
@@ -13,21 +14,22 @@ class VoiceRequest(BaseModel):
 
 class TextRequest(BaseModel):
     text: str
-    source_language: str
+    source_language: Optional[str] = None  # Detected locally if omitted
     target_language: str
     include_speech: bool = False
 
 @router.post("/process-voice")
 async def process_voice(
     request: VoiceRequest,
-    bhashini_service: BhashiniService = Depends()
+    bhashini_service: BhashiniService = Depends(get_bhashini_service)
 ) -> Dict:
     """
     Process voice input with translation and optional speech output
     """
     try:
+        audio_data = await bhashini_service.prepare_audio(request.audio_data)
         result = await bhashini_service.process_voice_input(
-            audio_data=request.audio_data,
+            audio_data=audio_data,
             source_language=request.source_language,
             target_language=request.target_language,
             include_speech=request.include_speech
@@ -41,22 +43,33 @@ async def process_voice(
 @router.post("/process-text")
 async def process_text(
     request: TextRequest,
-    bhashini_service: BhashiniService = Depends()
+    bhashini_service: BhashiniService = Depends(get_bhashini_service)
 ) -> Dict:
     """
     Process text input with translation and optional speech output
     """
     try:
-        # Translate text
-        translated_text = await bhashini_service.translate_text(
+        # Skip the NMT round trip when the text is already in the target language
+        source_language, detection = get_language_detector().plan_translation(
             text=request.text,
-            source_language=request.source_language,
-            target_language=request.target_language
+            target_language=request.target_language,
+            source_language=request.source_language
         )
         
+        if source_language:
+            translated_text = await bhashini_service.translate_text(
+                text=request.text,
+                source_language=source_language,
+                target_language=request.target_language
+            )
+        else:
+            translated_text = request.text
+        
         result = {
             "source_text": request.text,
             "translated_text": translated_text,
+            "detected_language": detection.language,
+            "translated": source_language is not None,
             "audio": None
         }
         
@@ -79,12 +92,13 @@ async def process_text(
 async def speech_to_text(
     audio_data: str,
     language: str,
-    bhashini_service: BhashiniService = Depends()
+    bhashini_service: BhashiniService = Depends(get_bhashini_service)
 ) -> Dict:
     """
     Convert speech to text
     """
     try:
+        audio_data = await bhashini_service.prepare_audio(audio_data)
         text = await bhashini_service.speech_to_text(
             audio_data=audio_data,
             source_language=language
@@ -99,7 +113,7 @@ async def speech_to_text(
 async def text_to_speech(
     text: str,
     language: str,
-    bhashini_service: BhashiniService = Depends()
+    bhashini_service: BhashiniService = Depends(get_bhashini_service)
 ) -> Dict:
     """
     Convert text to speech
@@ -28,8 +28,6 @@ class BrowserManager:
         if not os.path.exists(self.screenshot_dir):
             os.makedirs(self.screenshot_dir)
 
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
     def get_chrome_version(self):
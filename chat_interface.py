@@ -1,25 +1,37 @@
-from typing import Dict, List, Optional, Callable
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Sequence
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+from concurrent.futures import Future
 import json
+import logging
+import queue
 import threading
 import time
+import uuid
 from datetime import datetime
 from conversation_manager import ConversationManager, Message
-from services.azure_openai_service import AzureOpenAIService
+from services.conversation_journal import (
+    ConversationJournal, journal_records, list_conversations, load_conversation, load_journal_key
+)
+from services.encryption_service import EncryptionError, EncryptionService
+from services.history_index import HistoryIndex, HistoryRecord, load_index, tokenize
 import asyncio
-import sounddevice as sd
-import numpy as np
-from scipy.io.wavfile import write
-import wave
 import os
-from PIL import Image, ImageTk
 
 class VoiceRecorder:
     def __init__(self):
+        # sounddevice, NumPy and SciPy take a while to import, so the recorder is built off the Tk thread
+        import sounddevice as sd
+        import numpy as np
+        from scipy.io import wavfile
+        self.sd = sd
+        self.np = np
+        self.wavfile = wavfile
         self.recording = False
         self.frames = []
         self.sample_rate = 44100
+        # Fails early when there is no microphone
+        sd.query_devices(kind="input")
         
     def start_recording(self):
         self.recording = True
@@ -29,7 +41,7 @@ class VoiceRecorder:
             if self.recording:
                 self.frames.append(indata.copy())
                 
-        self.stream = sd.InputStream(
+        self.stream = self.sd.InputStream(
             channels=1,
             samplerate=self.sample_rate,
             callback=callback
@@ -48,42 +60,691 @@ class VoiceRecorder:
         filename = f"recordings/recording_{timestamp}.wav"
         
         if self.frames:
-            audio_data = np.concatenate(self.frames, axis=0)
-            write(filename, self.sample_rate, audio_data)
+            audio_data = self.np.concatenate(self.frames, axis=0)
+            self.wavfile.write(filename, self.sample_rate, audio_data)
             return filename
         return None
 
+logger = logging.getLogger(__name__)
+
+class BackgroundLoop:
+    def __init__(self, name: str = "chat-event-loop"):
+        """
+        Run one asyncio event loop for the lifetime of the client on a daemon thread
+
+        Coroutines from the Tk thread are submitted here instead of each request
+        creating and closing its own loop, so async clients keep their
+        connection pools between messages.
+        :param name: Thread name
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        """
+        Schedule a coroutine on the background loop, callable from any thread
+        :param coroutine: Coroutine to run
+        :return: Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Cancel pending work, stop the loop and wait for the thread to exit
+        :param timeout: Seconds to wait for cancelled work and for the thread
+        """
+        if not self._thread.is_alive():
+            return
+
+        async def cancel_pending():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.loop.shutdown_asyncgens()
+
+        try:
+            self.submit(cancel_pending()).result(timeout)
+        except Exception as e:
+            logger.warning(f"Background tasks did not stop cleanly: {str(e)}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+class UiDispatcher:
+    def __init__(self, root: tk.Misc, frame_interval_ms: int = 33):
+        """
+        Marshal calls from worker threads onto the Tk thread
+
+        Workers put calls on a queue that the Tk thread drains once per frame
+        with root.after. Streamed text for the same sink arriving within one
+        frame is joined into a single call, so fast token streams cost one
+        widget update per frame instead of one per token.
+        :param root: Tk root whose event loop runs the calls
+        :param frame_interval_ms: Milliseconds between drains (33 is about 30 frames per second)
+        """
+        self.root = root
+        self.frame_interval_ms = frame_interval_ms
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._after_id = None
+
+    def start(self):
+        """Start draining the queue on the Tk thread"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.frame_interval_ms, self._drain)
+
+    def stop(self):
+        """Stop draining; queued calls are dropped"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def call(self, callback: Callable, *args: Any):
+        """
+        Run a callback on the Tk thread at the next frame, callable from any thread
+        :param callback: Callable touching Tk widgets
+        :param args: Positional arguments
+        """
+        self._queue.put((callback, args, False))
+
+    def stream(self, sink: Callable[[str], None], text: str):
+        """
+        Append streamed text through a sink on the Tk thread, coalesced per frame
+        :param sink: Callable receiving the joined text
+        :param text: Text fragment
+        """
+        self._queue.put((sink, (text,), True))
+
+    def _drain(self):
+        pending_sink, pending = None, []
+        try:
+            while True:
+                try:
+                    callback, args, coalesce = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if coalesce and callback == pending_sink:
+                    pending.append(args[0])
+                    continue
+                # Keep the order: flush buffered text before anything queued after it
+                if pending:
+                    pending_sink("".join(pending))
+                    pending_sink, pending = None, []
+                if coalesce:
+                    pending_sink, pending = callback, [args[0]]
+                else:
+                    callback(*args)
+            if pending:
+                pending_sink("".join(pending))
+        except Exception as e:
+            logger.error(f"UI update failed: {str(e)}", exc_info=True)
+        finally:
+            self._after_id = self.root.after(self.frame_interval_ms, self._drain)
+
+class DeferredService:
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, name: str, factory: Callable[[], Any], dispatcher: UiDispatcher,
+                 on_ready: Optional[Callable[[Any], None]] = None,
+                 on_failed: Optional[Callable[[Exception], None]] = None):
+        """
+        Build a slow service on its own daemon thread, so it never delays the window
+
+        state changes on the Tk thread, where on_ready or on_failed is called;
+        coroutines on the background loop can await get() instead. The time the
+        factory took is logged either way.
+        :param name: Service name for logs
+        :param factory: Builds the service, called on the worker thread
+        :param dispatcher: Dispatcher of the Tk thread
+        :param on_ready: Called with the service once it is ready
+        :param on_failed: Called with the error if the factory raised
+        """
+        self.name = name
+        self.factory = factory
+        self.dispatcher = dispatcher
+        self.on_ready = on_ready
+        self.on_failed = on_failed
+        self.state = self.PENDING
+        self.elapsed: Optional[float] = None
+        self.future: Future = Future()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == self.READY
+
+    @property
+    def value(self) -> Any:
+        """The service, or None until it is ready"""
+        return self.future.result() if self.ready else None
+
+    def start(self):
+        """Start building the service, once"""
+        if self.state != self.PENDING:
+            return
+        self.state = self.LOADING
+        threading.Thread(target=self._run, name=f"init-{self.name}", daemon=True).start()
+
+    async def get(self) -> Any:
+        """
+        Wait for the service from the background loop
+        :return: The service
+        """
+        return await asyncio.wrap_future(self.future)
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            value = self.factory()
+        except Exception as e:
+            self.elapsed = time.perf_counter() - started
+            logger.error(f"Failed to initialize {self.name} after {self.elapsed * 1000:.0f} ms: {str(e)}")
+            self.future.set_exception(e)
+        else:
+            self.elapsed = time.perf_counter() - started
+            logger.info(f"Initialized {self.name} in {self.elapsed * 1000:.0f} ms")
+            self.future.set_result(value)
+        self.dispatcher.call(self._finished)
+
+    def _finished(self):
+        error = self.future.exception()
+        if error is None:
+            self.state = self.READY
+            if self.on_ready:
+                self.on_ready(self.future.result())
+        else:
+            self.state = self.FAILED
+            if self.on_failed:
+                self.on_failed(error)
+
+def create_openai_service():
+    """Import and build the Azure OpenAI service; importing openai alone takes most of a second"""
+    from services.azure_openai_service import AzureOpenAIService
+    return AzureOpenAIService()
+
+def model_turns(messages: Sequence[Message]) -> List[str]:
+    """
+    Rebuild the turns sent to the model, as collected by finish_response, from a conversation
+
+    The model history alternates user and assistant strings, so a question is
+    kept only together with the answer that followed it: a question whose
+    answer failed or was cut off by a crash is dropped rather than shifting
+    every later turn into the wrong role.
+    :param messages: Conversation messages, oldest first
+    :return: Alternating user and assistant texts
+    """
+    turns = []
+    question = None
+    for message in messages:
+        if message.sender == "user" and message.message_type == "text":
+            question = message.content
+        elif message.sender == "assistant":
+            if message.message_type == "text" and question is not None:
+                turns.extend([question, message.content])
+            question = None
+    return turns
+
+class TranscriptView:
+    def __init__(self, parent: tk.Misc, messages: Callable[[], Sequence[Message]], max_rendered: int = 200,
+                 page_size: int = 50):
+        """
+        Chat transcript that keeps only a window of the conversation in its Text widget
+
+        Each rendered message starts at a mark named after its index in the
+        store. New messages are appended and the oldest ones dropped while the
+        view follows the conversation; scrolling to the top loads the previous
+        page from the store, scrolling back down loads the next one. Inserts
+        therefore cost the same after ten or ten thousand messages.
+        :param parent: Parent widget
+        :param messages: Returns the conversation store, oldest message first
+        :param max_rendered: Messages kept in the widget
+        :param page_size: Messages loaded per scroll step
+        """
+        self.messages = messages
+        self.max_rendered = max_rendered
+        self.page_size = page_size
+        self.first = 0  # Store index of the first rendered message
+        self.last = 0  # One past the store index of the last rendered message
+        self.streaming = False
+        self._edge_check = None
+
+        self.text = scrolledtext.ScrolledText(
+            parent,
+            wrap=tk.WORD,
+            font=("Arial", 11),
+            padx=15,
+            pady=15,
+            height=25,
+            background="#ffffff",
+            borderwidth=0
+        )
+        self.text.config(state=tk.DISABLED)
+        self.text.configure(yscrollcommand=self._on_scroll)
+        self.configure_tags()
+
+    def configure_tags(self):
+        """Configure text tags for message styling"""
+        self.text.tag_configure("user_name", foreground="blue", font=("Arial", 10, "bold"))
+        self.text.tag_configure("user_message", font=("Arial", 10))
+        self.text.tag_configure("system_name", foreground="green", font=("Arial", 10, "bold"))
+        self.text.tag_configure("system_message", font=("Arial", 10))
+        self.text.tag_configure("error_message", foreground="red", font=("Arial", 10))
+
+    @staticmethod
+    def format_message(message: Message) -> tuple:
+        """Build the Text.insert arguments (text, tags, text, tags) of a message"""
+        timestamp = datetime.fromisoformat(message.timestamp).strftime("%H:%M")
+        if message.sender == "user":
+            return f"\nYou ({timestamp}):\n", "user_name", f"{message.content}\n", "user_message"
+        body_tag = "error_message" if message.message_type == "error" else "system_message"
+        return f"\nAssistant ({timestamp}):\n", "system_name", f"{message.content}\n", body_tag
+
+    def following(self) -> bool:
+        """Whether the view shows the end of the transcript"""
+        return self.text.yview()[1] >= 0.999
+
+    def append(self, message: Message):
+        """
+        Show a message that was just added to the store
+        :param message: Last message of the store
+        """
+        index = len(self.messages()) - 1
+        if self.last != index:
+            # The newest messages were unloaded while scrolled up: jump back to the end
+            self.show_latest()
+            return
+        follow = self.following()
+        self.text.config(state=tk.NORMAL)
+        self._insert_at_end(index, message)
+        self.last = index + 1
+        self.text.config(state=tk.DISABLED)
+        self._trim(follow)
+        if follow:
+            self.text.see(tk.END)
+
+    def show_latest(self):
+        """Render the last page of the store and scroll to it"""
+        messages = self.messages()
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        for index in range(self.first, self.last):
+            self.text.mark_unset(f"msg{index}")
+        self.first = self.last = max(0, len(messages) - self.page_size)
+        for index in range(self.first, len(messages)):
+            self._insert_at_end(index, messages[index])
+        self.last = len(messages)
+        self.text.config(state=tk.DISABLED)
+        self.text.see(tk.END)
+
+    def begin_stream(self):
+        """Start an assistant message whose text arrives in fragments"""
+        if self.last != len(self.messages()):
+            self.show_latest()
+        self.streaming = True
+        self.text.config(state=tk.NORMAL)
+        self.text.mark_set("stream", "end-1c")
+        self.text.mark_gravity("stream", tk.LEFT)
+        timestamp = datetime.now().strftime("%H:%M")
+        self.text.insert(tk.END, f"\nAssistant ({timestamp}):\n", "system_name")
+        self.text.config(state=tk.DISABLED)
+        self.text.see(tk.END)
+
+    def append_stream(self, text: str):
+        """Append a fragment to the streamed message"""
+        follow = self.following()
+        self.text.config(state=tk.NORMAL)
+        self.text.insert(tk.END, text, "system_message")
+        self.text.config(state=tk.DISABLED)
+        if follow:
+            self.text.see(tk.END)
+
+    def end_stream(self):
+        """Adopt the streamed text as the message just added to the store"""
+        self.text.config(state=tk.NORMAL)
+        self.text.insert(tk.END, "\n", "system_message")
+        self.text.mark_set(f"msg{self.last}", "stream")
+        self.text.mark_gravity(f"msg{self.last}", tk.LEFT)
+        self.text.mark_unset("stream")
+        self.text.config(state=tk.DISABLED)
+        self.last += 1
+        self.streaming = False
+        self._trim(self.following())
+
+    def cancel_stream(self):
+        """Remove a streamed message that never made it into the store"""
+        if not self.streaming:
+            return
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("stream", "end-1c")
+        self.text.mark_unset("stream")
+        self.text.config(state=tk.DISABLED)
+        self.streaming = False
+
+    def _insert_at_end(self, index: int, message: Message):
+        self.text.mark_set(f"msg{index}", "end-1c")
+        self.text.mark_gravity(f"msg{index}", tk.LEFT)
+        self.text.insert(tk.END, *self.format_message(message))
+
+    def _trim(self, follow: bool):
+        # While following drop the oldest messages; while reading, allow one extra page before doing so
+        excess = (self.last - self.first) - self.max_rendered
+        if excess > 0 and (follow or excess > self.page_size):
+            self._drop_head(excess)
+
+    def _drop_head(self, count: int):
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", f"msg{self.first + count}")
+        for index in range(self.first, self.first + count):
+            self.text.mark_unset(f"msg{index}")
+        self.text.config(state=tk.DISABLED)
+        self.first += count
+
+    def _drop_tail(self, count: int):
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(f"msg{self.last - count}", "end-1c")
+        for index in range(self.last - count, self.last):
+            self.text.mark_unset(f"msg{index}")
+        self.text.config(state=tk.DISABLED)
+        self.last -= count
+
+    def load_older(self):
+        """Render the page before the first rendered message, keeping the view in place"""
+        if self.first == 0:
+            return
+        messages = self.messages()
+        anchor = f"msg{self.first}"
+        start = max(0, self.first - self.page_size)
+        self.text.config(state=tk.NORMAL)
+        # Insert newest first at the top; the mark below must move with the inserted text
+        for index in range(self.first - 1, start - 1, -1):
+            below = f"msg{index + 1}"
+            self.text.mark_gravity(below, tk.RIGHT)
+            self.text.insert("1.0", *self.format_message(messages[index]))
+            self.text.mark_gravity(below, tk.LEFT)
+            self.text.mark_set(f"msg{index}", "1.0")
+            self.text.mark_gravity(f"msg{index}", tk.LEFT)
+        self.text.config(state=tk.DISABLED)
+        self.first = start
+        self.text.yview(anchor)
+        excess = (self.last - self.first) - self.max_rendered
+        if excess > 0 and not self.streaming:
+            self._drop_tail(excess)
+
+    def load_newer(self):
+        """Render the page after the last rendered message"""
+        messages = self.messages()
+        end = min(len(messages), self.last + self.page_size)
+        if end == self.last:
+            return
+        self.text.config(state=tk.NORMAL)
+        for index in range(self.last, end):
+            self._insert_at_end(index, messages[index])
+        self.text.config(state=tk.DISABLED)
+        self.last = end
+        excess = (self.last - self.first) - self.max_rendered
+        if excess > 0:
+            self._drop_head(excess)
+
+    def _on_scroll(self, first: str, last: str):
+        self.text.vbar.set(first, last)
+        # Loading changes the scroll position, so do it after the current redraw
+        if self._edge_check is None:
+            self._edge_check = self.text.after_idle(self._load_at_edges)
+
+    def _load_at_edges(self):
+        self._edge_check = None
+        top, bottom = self.text.yview()
+        if top <= 0.0 and self.first > 0:
+            self.load_older()
+        elif bottom >= 1.0 and self.last < len(self.messages()) and not self.streaming:
+            self.load_newer()
+
+class HistoryPanel:
+    def __init__(self, root: tk.Misc, index: HistoryIndex, page_size: int = 100):
+        """
+        History window with keyword search, paged from the history index
+
+        The window is built once and hidden when closed. Rows are fetched one
+        page at a time as the list is scrolled, and new messages are prepended
+        while the window is open instead of rebuilding the list.
+        :param root: Tk root
+        :param index: Index over archived messages
+        :param page_size: Rows fetched per page
+        """
+        self.root = root
+        self.index = index
+        self.page_size = page_size
+        self.window = None
+        self.ready = False
+        self.offset = 0
+        self.total = 0
+        self.rows: Dict[str, HistoryRecord] = {}
+        self._search_job = None
+        self._edge_check = None
+
+    def show(self):
+        """Open the window, building it on first use"""
+        if self.window is None:
+            self._build()
+            self.refresh()
+        else:
+            self.window.deiconify()
+            self.window.lift()
+
+    def _build(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Conversation History")
+        self.window.geometry("800x500")
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        self.window.grid_columnconfigure(0, weight=1)
+        self.window.grid_rowconfigure(1, weight=1)
+
+        search_frame = ttk.Frame(self.window, padding=(10, 10, 10, 5))
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
+        search_frame.grid_columnconfigure(1, weight=1)
+        ttk.Label(search_frame, text="Search:").grid(row=0, column=0, padx=(0, 5))
+        self.search_input = ttk.Entry(search_frame, font=("Arial", 11))
+        self.search_input.grid(row=0, column=1, sticky="ew")
+        self.search_input.bind("<KeyRelease>", self._schedule_search)
+        self.count_label = ttk.Label(search_frame, text="", foreground="gray")
+        self.count_label.grid(row=0, column=2, padx=(10, 0))
+
+        self.tree = ttk.Treeview(self.window, columns=("time", "sender", "text"), show="headings")
+        self.tree.heading("time", text="Time")
+        self.tree.heading("sender", text="From")
+        self.tree.heading("text", text="Message")
+        self.tree.column("time", width=130, stretch=False)
+        self.tree.column("sender", width=80, stretch=False)
+        self.tree.column("text", width=560)
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=(10, 0))
+        self.scrollbar = ttk.Scrollbar(self.window, orient=tk.VERTICAL, command=self.tree.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 10))
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.tree.bind("<<TreeviewSelect>>", self._show_selected)
+
+        self.detail = scrolledtext.ScrolledText(self.window, wrap=tk.WORD, font=("Arial", 11), height=6,
+                                                padx=10, pady=10)
+        self.detail.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=10)
+        self.detail.config(state=tk.DISABLED)
+
+    def set_ready(self):
+        """Called once archived messages are indexed"""
+        self.ready = True
+        if self.window is not None:
+            self.refresh()
+
+    def refresh(self):
+        """Show the first page for the current query"""
+        self.tree.delete(*self.tree.get_children())
+        self.rows.clear()
+        self.offset = 0
+        self.load_page()
+
+    def load_page(self):
+        """Append the next page of results"""
+        if not self.ready:
+            self.count_label.config(text="Indexing history...")
+            return
+        records, self.total = self.index.search(self.search_input.get(), self.offset, self.page_size)
+        for record in records:
+            self._insert(record, tk.END)
+        self.offset += len(records)
+        self._update_count()
+
+    def add(self, record: HistoryRecord):
+        """
+        Show a new message at the top if it matches the current query
+        :param record: Message just indexed
+        """
+        if self.window is None or not self.ready:
+            return
+        terms = set(tokenize(self.search_input.get()))
+        if terms and not terms.issubset(tokenize(record.content)):
+            return
+        self._insert(record, 0)
+        self.offset += 1
+        self.total += 1
+        self._update_count()
+
+    def _insert(self, record: HistoryRecord, position):
+        timestamp = datetime.fromisoformat(record.timestamp).strftime("%Y-%m-%d %H:%M")
+        sender = "You" if record.sender == "user" else "Assistant"
+        preview = " ".join(record.content.split())[:150]
+        item = self.tree.insert("", position, values=(timestamp, sender, preview))
+        self.rows[item] = record
+
+    def _update_count(self):
+        self.count_label.config(text=f"{self.offset} of {self.total}")
+
+    def _schedule_search(self, event=None):
+        # Wait for a pause in typing instead of searching on every key
+        if self._search_job is not None:
+            self.window.after_cancel(self._search_job)
+        self._search_job = self.window.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        self.refresh()
+
+    def _on_scroll(self, first: str, last: str):
+        self.scrollbar.set(first, last)
+        if self._edge_check is None and float(last) >= 1.0 and self.offset < self.total:
+            self._edge_check = self.window.after_idle(self._load_more)
+
+    def _load_more(self):
+        self._edge_check = None
+        self.load_page()
+
+    def _show_selected(self, event=None):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        record = self.rows[selection[0]]
+        self.detail.config(state=tk.NORMAL)
+        self.detail.delete("1.0", tk.END)
+        self.detail.insert(tk.END, record.content)
+        self.detail.config(state=tk.DISABLED)
+
 class ChatInterface:
     def __init__(self, root):
         """Initialize chat interface"""
+        self.created = time.perf_counter()
         self.root = root
         self.root.title("Legal Assistant Chat")
         self.conversation_manager = ConversationManager()
-        self.openai_service = AzureOpenAIService()
         self.conversation_history = []
-        self.voice_recorder = VoiceRecorder()
+
+        # One event loop for all requests, results come back through the dispatcher
+        self.background = BackgroundLoop()
+        self.dispatcher = UiDispatcher(self.root)
+        self.dispatcher.start()
+
+        # The LLM client and audio input are built in the background once the window is painted
+        self.openai_service = DeferredService(
+            "Azure OpenAI client", create_openai_service, self.dispatcher, on_failed=self.openai_failed
+        )
+        self.voice_recorder = DeferredService(
+            "audio input", VoiceRecorder, self.dispatcher, on_ready=self.audio_ready, on_failed=self.audio_failed
+        )
+        self.tts_service = None
+        self.speech_output = DeferredService("speech output", self.create_speech_output, self.dispatcher)
+        # Answers are read aloud when SPEAK_RESPONSES=true or when switched on in the settings
+        self.speak_responses = tk.BooleanVar(
+            master=self.root, value=os.getenv("SPEAK_RESPONSES", "false").lower() == "true"
+        )
+        self.response_started = False
+        self.is_typing = False
+        self.typing_dots = 0
+
+        # Messages and state changes go to an encrypted journal, the last conversation resumes from it
+        self.journal_encryption = EncryptionService(load_journal_key())
+        self.resume_conversation()
+
+        # Every message is also indexed for the history panel; past conversations load in the background
+        self.history_index = HistoryIndex()
+        self.history_panel = HistoryPanel(self.root, self.history_index)
+        self.pending_history: List[HistoryRecord] = [
+            self.history_record(message) for message in self.conversation_manager.conversation_history
+        ]
         
         # Configure root window
         self.root.geometry("1200x800")  # Increased window size
         self.setup_ui()
         
         # Initialize state
-        self.is_typing = False
         self.is_recording = False
-        self.typing_thread = None
         self.current_view = "chat"  # Track current view
-        
-        # Configure text tags
-        self.configure_tags()
 
-    def configure_tags(self):
-        """Configure text tags for message styling"""
-        self.chat_display.tag_configure("user_name", foreground="blue", font=("Arial", 10, "bold"))
-        self.chat_display.tag_configure("user_message", font=("Arial", 10))
-        self.chat_display.tag_configure("system_name", foreground="green", font=("Arial", 10, "bold"))
-        self.chat_display.tag_configure("system_message", font=("Arial", 10))
-        self.chat_display.tag_configure("error_message", foreground="red", font=("Arial", 10))
-        self.chat_display.tag_configure("typing_indicator", foreground="gray", font=("Arial", 10, "italic"))
+        # Idle callbacks run before the window is even mapped, so wait for the Map event instead
+        if self.root.winfo_ismapped():
+            self.root.after_idle(self.start_services)
+        else:
+            self._map_binding = self.root.bind("<Map>", self.window_mapped, add="+")
+
+    def window_mapped(self, event):
+        """Start background initialization once the window is mapped and drawn"""
+        # Child widgets report their Map events through the root's binding too
+        if event.widget is not self.root:
+            return
+        self.root.unbind("<Map>", self._map_binding)
+        # Draw the widgets now, then start once the events queued meanwhile were handled
+        self.root.update_idletasks()
+        self.root.after(0, self.start_services)
+
+    def start_services(self):
+        """Start background initialization once the first frame is on screen"""
+        logger.info(f"Window mapped and drawn {(time.perf_counter() - self.created) * 1000:.0f} ms after start")
+        self.openai_service.start()
+        self.voice_recorder.start()
+        self.speech_output.start()
+        threading.Thread(target=self.load_history, name="history-loader", daemon=True).start()
+
+    def create_speech_output(self):
+        """Build speech output with Bhashini TTS as its source, run on a worker thread"""
+        from services.bhashini_service import BhashiniService
+        from speech_output import SpeechOutput
+        self.tts_service = BhashiniService()
+        return SpeechOutput(self.tts_service.text_to_speech)
+
+    def openai_failed(self, error: Exception):
+        """Tell the user answers are unavailable"""
+        self.set_status(f"Assistant unavailable: {str(error)}", error=True)
+
+    def audio_ready(self, recorder: VoiceRecorder):
+        """Enable voice input"""
+        self.voice_button.config(state=tk.NORMAL)
+
+    def audio_failed(self, error: Exception):
+        """Leave voice input disabled"""
+        self.set_status(f"Microphone unavailable: {str(error)}", error=True)
 
     def setup_ui(self):
         """Setup the user interface"""
@@ -121,8 +782,12 @@ class ChatInterface:
         # Apply styles
         self.apply_styles()
         
-        # Start conversation
-        self.start_conversation()
+        # Show the resumed conversation, or start one
+        if self.conversation_manager.conversation_history:
+            self.transcript.show_latest()
+            self.update_progress(self.conversation_manager.state.completion_percentage)
+        else:
+            self.start_conversation()
 
     def create_sidebar(self):
         """Create the sidebar navigation"""
@@ -166,22 +831,39 @@ class ChatInterface:
         chat_frame.grid_columnconfigure(0, weight=1)
         chat_frame.grid_rowconfigure(0, weight=1)
         
-        # Chat display
-        self.chat_display = scrolledtext.ScrolledText(
-            chat_frame,
-            wrap=tk.WORD,
-            font=("Arial", 11),  # Increased font size
-            padx=15,
-            pady=15,
-            height=25,
-            background="#ffffff",
-            borderwidth=0
-        )
-        self.chat_display.grid(row=0, column=0, sticky="nsew", padx=2, pady=2)
-        self.chat_display.config(state=tk.DISABLED)
+        # Chat display, holding a window of recent messages
+        self.transcript = TranscriptView(chat_frame, lambda: self.conversation_manager.conversation_history)
+        self.transcript.text.grid(row=0, column=0, sticky="nsew", padx=2, pady=2)
         
         # Bind scroll event
-        self.chat_display.bind("<MouseWheel>", self.on_mousewheel)
+        self.transcript.text.bind("<MouseWheel>", self.on_mousewheel)
+
+        # Typing indicator, a label below the transcript instead of a line edited inside it
+        self.typing_label = ttk.Label(chat_frame, text="", foreground="gray", font=("Arial", 10, "italic"))
+        self.typing_label.grid(row=1, column=0, sticky="w", padx=15)
+        self.typing_label.grid_remove()
+
+    def create_progress_bar(self):
+        """Create the progress bar and the status line for recording and audio processing"""
+        progress_frame = ttk.Frame(self.content_container)
+        progress_frame.grid(row=2, column=0, sticky="ew", pady=(0, 10))
+        progress_frame.grid_columnconfigure(2, weight=1)
+
+        self.progress_bar = ttk.Progressbar(progress_frame, length=200, maximum=100, mode="determinate")
+        self.progress_bar.grid(row=0, column=0, padx=(10, 10))
+        self.progress_label = ttk.Label(progress_frame, text="Progress: 0.0%")
+        self.progress_label.grid(row=0, column=1, sticky="w")
+        self.status_label = ttk.Label(progress_frame, text="", foreground="gray")
+        self.status_label.grid(row=0, column=2, sticky="e", padx=(10, 10))
+
+    def create_quick_reply_area(self):
+        """Create the container for quick reply buttons"""
+        self.quick_reply_container = ttk.Frame(self.content_container)
+        self.quick_reply_container.grid(row=3, column=0, sticky="ew")
+
+    def set_status(self, text: str, error: bool = False):
+        """Show a short status such as recording or processing state"""
+        self.status_label.config(text=text, foreground="red" if error else "gray")
 
     def create_input_area(self):
         """Create the message input area"""
@@ -198,7 +880,9 @@ class ChatInterface:
             text="🎤",
             command=self.toggle_recording,
             style="Round.TButton",
-            width=3
+            width=3,
+            # Enabled once audio input is initialized
+            state=tk.DISABLED
         )
         self.voice_button.grid(row=0, column=0, padx=(10, 10), pady=10)
         
@@ -260,35 +944,93 @@ class ChatInterface:
 
     def show_history_view(self):
         """Show conversation history view"""
-        # Create history window
-        history_window = tk.Toplevel(self.root)
-        history_window.title("Conversation History")
-        history_window.geometry("600x400")
-        
-        # Add history content
-        history_text = scrolledtext.ScrolledText(
-            history_window,
-            wrap=tk.WORD,
-            font=("Arial", 11),
-            padx=15,
-            pady=15
+        self.history_panel.show()
+
+    def resume_conversation(self):
+        """Restore the most recently journaled conversation, or open a journal for a new one"""
+        started = time.perf_counter()
+        conversations = list_conversations()
+        conversation = None
+        if conversations:
+            try:
+                conversation = load_conversation(conversations[-1], self.journal_encryption)
+            except (EncryptionError, KeyError, TypeError) as e:
+                logger.error(f"Failed to resume conversation {conversations[-1]}: {str(e)}")
+
+        if not conversation or not conversation["conversation_history"]:
+            self.conversation_id = uuid.uuid4().hex
+            self.journal = ConversationJournal(self.conversation_id, self.journal_encryption)
+            return
+
+        self.conversation_id = conversations[-1]
+        self.conversation_manager.restore_state(conversation)
+        self.conversation_history = model_turns(self.conversation_manager.conversation_history)
+        self.journal = ConversationJournal(
+            self.conversation_id, self.journal_encryption, sequence=conversation["seq"]
         )
-        history_text.pack(fill=tk.BOTH, expand=True)
-        
-        # Add conversation history
-        for message in self.conversation_history:
-            timestamp = datetime.fromisoformat(message.timestamp).strftime("%Y-%m-%d %H:%M")
-            sender = "You" if message.sender == "user" else "Assistant"
-            history_text.insert(tk.END, f"{timestamp} - {sender}:\n{message.content}\n\n")
-        
-        history_text.config(state=tk.DISABLED)
+        logger.info(
+            f"Resumed conversation {self.conversation_id} with "
+            f"{len(self.conversation_manager.conversation_history)} messages in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    def load_history(self):
+        """Index journaled conversations, run on a worker thread"""
+        try:
+            count = load_index(
+                journal_records(self.journal_encryption, exclude=(self.conversation_id,)),
+                self.history_index
+            )
+            logger.info(f"Indexed {count} archived messages")
+        except Exception as e:
+            logger.error(f"Failed to load conversation history: {str(e)}")
+        self.dispatcher.call(self.history_loaded)
+
+    def history_loaded(self):
+        """Index the messages of this session that arrived while loading"""
+        for record in self.pending_history:
+            self.history_index.add(record)
+        self.pending_history = []
+        self.history_panel.set_ready()
+
+    def history_record(self, message: Message) -> HistoryRecord:
+        """Describe a message of this conversation for the history index"""
+        return HistoryRecord(
+            conversation_id=self.conversation_id,
+            sender=message.sender,
+            timestamp=message.timestamp,
+            content=message.content,
+            message_type=message.message_type
+        )
+
+    def remember(self, message: Message):
+        """Journal a message and index it for the history panel"""
+        self.journal.record_message(message)
+        self.compact_journal()
+        record = self.history_record(message)
+        if not self.history_panel.ready:
+            # Keep ID order oldest first: these are indexed after the archive
+            self.pending_history.append(record)
+            return
+        self.history_index.add(record)
+        self.history_panel.add(record)
+
+    def remember_state(self):
+        """Journal the conversation state after it changed"""
+        self.journal.record_state(self.conversation_manager.state, self.conversation_manager.language)
+        self.compact_journal()
+
+    def compact_journal(self):
+        """Snapshot the conversation once enough events were journaled"""
+        if self.journal.needs_compaction:
+            self.journal.compact(self.conversation_manager.export_state())
 
     def show_settings_view(self):
         """Show settings view"""
         # Create settings window
         settings_window = tk.Toplevel(self.root)
         settings_window.title("Settings")
-        settings_window.geometry("400x300")
+        settings_window.geometry("400x350")
         
         # Add settings options
         ttk.Label(settings_window, text="Settings", font=("Arial", 16, "bold")).pack(pady=20)
@@ -306,6 +1048,14 @@ class ChatInterface:
         ttk.Radiobutton(settings_window, text="Medium", variable=font_size_var, value="medium").pack()
         ttk.Radiobutton(settings_window, text="Large", variable=font_size_var, value="large").pack()
 
+        # Speech output
+        ttk.Checkbutton(
+            settings_window,
+            text="Read answers aloud",
+            variable=self.speak_responses,
+            state=tk.NORMAL if self.speech_output.ready else tk.DISABLED
+        ).pack(pady=10)
+
     def show_help_view(self):
         """Show help view"""
         # Create help window
@@ -417,55 +1167,27 @@ For more help, visit our documentation or contact support.
         """Show typing indicator"""
         if not self.is_typing:
             self.is_typing = True
+            self.typing_dots = 0
+            self.typing_label.grid()
             self.update_typing_indicator()
 
     def hide_typing_indicator(self):
         """Hide typing indicator"""
         self.is_typing = False
-        self.chat_display.config(state=tk.NORMAL)
-        # Remove typing indicator if present
-        last_line_start = self.chat_display.index("end-2c linestart")
-        last_line = self.chat_display.get(last_line_start, "end-1c")
-        if "Typing" in last_line:
-            self.chat_display.delete(last_line_start, "end-1c")
-        self.chat_display.config(state=tk.DISABLED)
+        self.typing_label.grid_remove()
 
     def update_typing_indicator(self):
         """Update typing indicator animation"""
         if not self.is_typing:
             return
-            
-        self.chat_display.config(state=tk.NORMAL)
-        last_line_start = self.chat_display.index("end-2c linestart")
-        last_line = self.chat_display.get(last_line_start, "end-1c")
-        
-        if "Typing" in last_line:
-            self.chat_display.delete(last_line_start, "end-1c")
-        
-        self.chat_display.insert(tk.END, "\nTyping...", "typing_indicator")
-        self.chat_display.see(tk.END)
-        self.chat_display.config(state=tk.DISABLED)
-        
-        if self.is_typing:
-            self.root.after(500, self.update_typing_indicator)
+        self.typing_dots = self.typing_dots % 3 + 1
+        self.typing_label.config(text="Assistant is typing" + "." * self.typing_dots)
+        self.root.after(500, self.update_typing_indicator)
 
     def add_message(self, message: Message):
         """Add a message to the chat display"""
-        self.chat_display.config(state=tk.NORMAL)
-        
-        # Format timestamp
-        timestamp = datetime.fromisoformat(message.timestamp).strftime("%H:%M")
-        
-        # Add message with appropriate styling
-        if message.sender == "user":
-            self.chat_display.insert(tk.END, f"\nYou ({timestamp}):\n", "user_name")
-            self.chat_display.insert(tk.END, f"{message.content}\n", "user_message")
-        else:
-            self.chat_display.insert(tk.END, f"\nAssistant ({timestamp}):\n", "system_name")
-            self.chat_display.insert(tk.END, f"{message.content}\n", "system_message")
-        
-        self.chat_display.see(tk.END)
-        self.chat_display.config(state=tk.DISABLED)
+        self.transcript.append(message)
+        self.remember(message)
 
     def update_quick_replies(self, quick_replies: List[str]):
         """Update quick reply buttons"""
@@ -509,32 +1231,47 @@ For more help, visit our documentation or contact support.
             # Show typing indicator
             self.show_typing_indicator()
             
-            # Process the message in a separate thread
-            threading.Thread(
-                target=self.process_message,
-                args=(message,),
-                daemon=True
-            ).start()
-
-    async def send_async_message(self, message):
-        """Send a message asynchronously"""
+            # Stream the answer on the background loop
+            self.response_started = False
+            speak = self.speak_responses.get() and self.speech_output.ready
+            self.background.submit(self.stream_response(
+                message,
+                list(self.conversation_history),
+                self.conversation_manager.language if speak else None
+            ))
+
+    async def stream_response(self, message: str, history: List[str], speech_language: Optional[str] = None):
+        """
+        Stream the answer to a message on the background loop, handing text to the Tk thread
+        :param message: User message
+        :param history: Previous turns, copied on the Tk thread
+        :param speech_language: Language to read the answer aloud in, None to stay silent
+        """
+        parts = []
+        speaker = self.speech_output.value.speak(speech_language) if speech_language else None
         try:
-            response = await self.openai_service.get_legal_response(self.conversation_history, message)
-            return {
-                "status": "success",
-                "response": response
-            }
+            # Waits only if the message was sent before the client finished initializing
+            openai_service = await self.openai_service.get()
+            async for token in openai_service.stream_legal_response(history, message):
+                parts.append(token)
+                self.dispatcher.stream(self.append_response_text, token)
+                if speaker:
+                    speaker.add(token)
         except Exception as e:
-            return {
-                "status": "error",
-                "error": str(e)
-            }
+            if speaker:
+                speaker.cancel()
+            self.dispatcher.call(self.fail_response, str(e))
+            return
+        if speaker:
+            speaker.end()
+        self.dispatcher.call(self.finish_response, message, "".join(parts))
 
     async def process_user_input(self, user_input):
         self.conversation_history.append(user_input)
         
         try:
-            response = await self.openai_service.get_legal_response(
+            openai_service = await self.openai_service.get()
+            response = await openai_service.get_legal_response(
                 self.conversation_history, 
                 user_input
             )
@@ -544,70 +1281,55 @@ For more help, visit our documentation or contact support.
             self.logger.error(f"Error getting response from Azure OpenAI: {str(e)}")
             return "I apologize, but I encountered an error processing your request."
 
-    def process_message(self, message: str):
-        """Process a message and handle the response"""
-        try:
-            # Create and run event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Get response
-            response = loop.run_until_complete(self.send_async_message(message))
-            
-            # Close the loop
-            loop.close()
-            
-            # Handle the response
-            if response["status"] == "success":
-                # Add assistant message to chat
-                assistant_message = self.conversation_manager.add_message(
-                    content=response["response"],
-                    sender="assistant"
-                )
-                
-                # Hide typing indicator and enable input
-                self.hide_typing_indicator()
-                self.message_input.config(state=tk.NORMAL)
-                self.send_button.config(state=tk.NORMAL)
-                
-                # Add message to display
-                self.add_message(assistant_message)
-                
-                # Update conversation history
-                self.conversation_history.extend([message, response["response"]])
-            else:
-                # Handle error
-                error_msg = f"Error: {response['error']}"
-                error_message = self.conversation_manager.add_message(
-                    content=error_msg,
-                    sender="assistant",
-                    message_type="error"
-                )
-                
-                # Hide typing indicator and enable input
-                self.hide_typing_indicator()
-                self.message_input.config(state=tk.NORMAL)
-                self.send_button.config(state=tk.NORMAL)
-                
-                # Add error message to display
-                self.add_message(error_message)
-                
-        except Exception as e:
-            # Handle unexpected errors
-            error_msg = f"Unexpected error: {str(e)}"
-            error_message = self.conversation_manager.add_message(
-                content=error_msg,
-                sender="assistant",
-                message_type="error"
-            )
-            
-            # Hide typing indicator and enable input
+    def append_response_text(self, text: str):
+        """Append streamed answer text, starting the assistant message on the first fragment"""
+        if not self.response_started:
+            self.response_started = True
             self.hide_typing_indicator()
-            self.message_input.config(state=tk.NORMAL)
-            self.send_button.config(state=tk.NORMAL)
-            
-            # Add error message to display
-            self.add_message(error_message)
+            self.transcript.begin_stream()
+        self.transcript.append_stream(text)
+
+    def finish_response(self, message: str, response: str):
+        """Record a completed answer, whose text is already on screen"""
+        if not self.response_started:
+            self.append_response_text("")
+        assistant_message = self.conversation_manager.add_message(content=response, sender="assistant")
+        self.transcript.end_stream()
+        self.remember(assistant_message)
+        self.conversation_history.extend([message, response])
+        self.end_response()
+
+    def fail_response(self, error: str):
+        """Replace a partial answer with the error"""
+        self.hide_typing_indicator()
+        self.transcript.cancel_stream()
+        error_message = self.conversation_manager.add_message(
+            content=f"Error: {error}",
+            sender="assistant",
+            message_type="error"
+        )
+        self.add_message(error_message)
+        self.end_response()
+
+    def end_response(self):
+        """Re-enable input after an answer finished or failed"""
+        self.response_started = False
+        self.message_input.config(state=tk.NORMAL)
+        self.send_button.config(state=tk.NORMAL)
+
+    def close(self):
+        """Stop background work and snapshot the journal, called before the window is destroyed"""
+        self.dispatcher.stop()
+        if self.speech_output.ready:
+            self.speech_output.value.interrupt()
+            self.speech_output.value.close()
+        if self.tts_service is not None and self.tts_service.session is not None:
+            try:
+                self.background.submit(self.tts_service.session.close()).result(1.0)
+            except Exception as e:
+                logger.warning(f"Failed to close the TTS session: {str(e)}")
+        self.background.stop()
+        self.journal.close(self.conversation_manager.export_state())
 
     def handle_response(self, result: Dict):
         """Handle the response from message processing"""
@@ -648,6 +1370,7 @@ For more help, visit our documentation or contact support.
             
         # Update progress
         self.update_progress(result["completion_percentage"])
+        self.remember_state()
 
     def handle_quick_reply(self, reply: str):
         """Handle quick reply button click"""
@@ -675,10 +1398,11 @@ For more help, visit our documentation or contact support.
             # Update quick replies if available
             if "quick_replies" in first_question:
                 self.update_quick_replies(first_question["quick_replies"])
+        self.remember_state()
 
     def on_mousewheel(self, event):
         """Handle mouse wheel scrolling"""
-        self.chat_display.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self.transcript.text.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
     def toggle_recording(self):
         """Toggle voice recording on/off"""
@@ -689,15 +1413,17 @@ For more help, visit our documentation or contact support.
 
     def start_recording(self):
         """Start voice recording"""
+        if not self.voice_recorder.ready:
+            return
+        # Barge-in: the user talking stops the answer being read aloud
+        if self.speech_output.ready:
+            self.speech_output.value.interrupt()
         self.is_recording = True
         self.voice_button.configure(text="⏺")
-        self.voice_recorder.start_recording()
+        self.voice_recorder.value.start_recording()
         
-        # Add recording indicator to chat
-        self.chat_display.config(state=tk.NORMAL)
-        self.chat_display.insert(tk.END, "\nRecording audio...\n", "system_message")
-        self.chat_display.see(tk.END)
-        self.chat_display.config(state=tk.DISABLED)
+        # Show recording indicator
+        self.set_status("Recording audio...")
 
     def stop_recording(self):
         """Stop voice recording and process the audio"""
@@ -705,14 +1431,11 @@ For more help, visit our documentation or contact support.
         self.voice_button.configure(text="🎤")
         
         # Stop recording and get the filename
-        audio_file = self.voice_recorder.stop_recording()
+        audio_file = self.voice_recorder.value.stop_recording()
         
         if audio_file:
-            # Add processing indicator to chat
-            self.chat_display.config(state=tk.NORMAL)
-            self.chat_display.insert(tk.END, "Processing audio...\n", "system_message")
-            self.chat_display.see(tk.END)
-            self.chat_display.config(state=tk.DISABLED)
+            # Show processing indicator
+            self.set_status("Processing audio...")
             
             # Process the audio file (you'll need to implement this based on your speech-to-text service)
             self.process_audio_file(audio_file)
@@ -722,16 +1445,10 @@ For more help, visit our documentation or contact support.
         try:
             # Here you would typically send the audio file to a speech-to-text service
             # For now, we'll just add a placeholder message
-            self.chat_display.config(state=tk.NORMAL)
-            self.chat_display.insert(tk.END, f"Audio file saved: {audio_file}\n", "system_message")
-            self.chat_display.see(tk.END)
-            self.chat_display.config(state=tk.DISABLED)
+            self.set_status(f"Audio file saved: {audio_file}")
             
             # TODO: Implement actual speech-to-text processing
             # You can use Azure Speech Services, Google Speech-to-Text, or other services
             
         except Exception as e:
-            self.chat_display.config(state=tk.NORMAL)
-            self.chat_display.insert(tk.END, f"Error processing audio: {str(e)}\n", "error_message")
-            self.chat_display.see(tk.END)
-            self.chat_display.config(state=tk.DISABLED)
\ No newline at end of file
+            self.set_status(f"Error processing audio: {str(e)}", error=True)
\ No newline at end of file
@@ -1,10 +1,41 @@
 from typing import Dict, List, Optional, Any
 import json
 import datetime
+import functools
+import hashlib
 import logging
+import os
 from dataclasses import dataclass, asdict
 import re
 
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+
+# Generic validation messages, localized alongside the flow strings
+COMMON_STRINGS = {
+    "common.question_not_found": "Question not found",
+    "common.required": "This field is required",
+    "common.invalid_input": "Invalid input",
+    "common.select_option": "Please select one of the provided options"
+}
+
+def source_hash(text: str) -> str:
+    """Short hash of an English source string, used to detect stale translations"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+
+@functools.lru_cache(maxsize=32)
+def load_catalog(catalog_dir: str, language: str) -> Dict[str, Any]:
+    """
+    Load a localized question catalog, once per process and language
+    :param catalog_dir: Directory holding <language>.json catalogs
+    :param language: Language code
+    :return: Catalog dictionary, empty if no catalog exists for the language
+    """
+    path = os.path.join(catalog_dir, f"{language}.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
 @dataclass
 class Message:
     """Represents a single message in the conversation"""
@@ -25,8 +56,15 @@ class ConversationState:
     validation_errors: List[str]
 
 class ConversationManager:
-    def __init__(self):
-        """Initialize conversation manager"""
+    def __init__(self, language: str = "en", catalog_dir: str = CATALOG_DIR):
+        """
+        Initialize conversation manager
+        :param language: Language code questions and messages are served in
+        :param catalog_dir: Directory holding pre-translated question catalogs
+        """
+        self.language = language
+        self.catalog_dir = catalog_dir
+        self._strings: Optional[Dict[str, str]] = None
         self.conversation_history: List[Message] = []
         self.state = ConversationState(
             current_topic="",
@@ -37,11 +75,6 @@ class ConversationManager:
             validation_errors=[]
         )
         
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
         self.logger = logging.getLogger(__name__)
         
         # Load conversation flow configuration
@@ -87,6 +120,95 @@ class ConversationManager:
             }
         }
 
+    def flow_strings(self) -> Dict[str, str]:
+        """
+        Get every user-facing English string of the conversation flow
+        :return: Dictionary of stable catalog key to English text
+        """
+        strings = dict(COMMON_STRINGS)
+        for topic_name, topic in self.topics.items():
+            for question in topic["questions"]:
+                prefix = f"{topic_name}.{question['id']}"
+                strings[f"{prefix}.text"] = question["text"]
+                if question.get("error_message"):
+                    strings[f"{prefix}.error_message"] = question["error_message"]
+                for index, reply in enumerate(question.get("quick_replies", [])):
+                    strings[f"{prefix}.quick_replies.{index}"] = reply
+            for q_id, follow_ups in topic.get("follow_up_questions", {}).items():
+                if isinstance(follow_ups, dict) and "question" not in follow_ups:
+                    for answer, text in follow_ups.items():
+                        strings[f"{topic_name}.follow_up.{q_id}.{answer}"] = text
+        return strings
+
+    def flow_version(self) -> str:
+        """
+        Get a version hash of the flow strings, stored in catalogs built from them
+        :return: Version hash
+        """
+        canonical = json.dumps(self.flow_strings(), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+
+    def localized_strings(self) -> Dict[str, str]:
+        """
+        Get the translated flow strings for the conversation language
+        
+        Entries whose English source changed since the catalog was built are
+        dropped, so edited questions fall back to English until the next build.
+        :return: Dictionary of catalog key to translated text
+        """
+        if self._strings is not None:
+            return self._strings
+
+        self._strings = {}
+        if self.language == "en":
+            return self._strings
+
+        catalog = load_catalog(self.catalog_dir, self.language)
+        if not catalog:
+            self.logger.warning(f"No question catalog for language '{self.language}', using English")
+            return self._strings
+
+        if catalog.get("version") != self.flow_version():
+            self.logger.warning(f"Question catalog for '{self.language}' is stale, rebuild it")
+
+        for key, text in self.flow_strings().items():
+            entry = catalog.get("strings", {}).get(key)
+            if entry and entry[0] == source_hash(text):
+                self._strings[key] = entry[1]
+        return self._strings
+
+    def localize(self, key: str, default: str) -> str:
+        """
+        Get the localized text for a catalog key
+        :param key: Catalog key
+        :param default: English text to fall back to
+        :return: Localized text
+        """
+        return self.localized_strings().get(key, default)
+
+    def _localize_question(self, topic_name: str, question: Dict) -> Dict:
+        """Return a copy of a question with localized text and quick replies"""
+        prefix = f"{topic_name}.{question['id']}"
+        localized = dict(question)
+        localized["text"] = self.localize(f"{prefix}.text", question["text"])
+        if "quick_replies" in question:
+            localized["quick_replies"] = [
+                self.localize(f"{prefix}.quick_replies.{index}", reply)
+                for index, reply in enumerate(question["quick_replies"])
+            ]
+        return localized
+
+    def _canonical_reply(self, question_id: str, answer: str) -> str:
+        """Map a localized quick reply back to the English value used by the flow"""
+        for topic_name, topic in self.topics.items():
+            for question in topic["questions"]:
+                if question["id"] != question_id:
+                    continue
+                for index, reply in enumerate(question.get("quick_replies", [])):
+                    if answer == self.localize(f"{topic_name}.{question_id}.quick_replies.{index}", reply):
+                        return reply
+        return answer
+
     def add_message(self, content: str, sender: str, message_type: str = "text", metadata: Dict = None) -> Message:
         """
         Add a message to the conversation history
@@ -129,12 +251,16 @@ class ConversationManager:
                         if follow_ups["condition"](answer):
                             return {"id": f"follow_up_{q_id}", "text": follow_ups["question"]}
                     elif answer in follow_ups:
-                        return {"id": f"follow_up_{q_id}", "text": follow_ups[answer]}
+                        text = self.localize(
+                            f"{self.state.current_topic}.follow_up.{q_id}.{answer}",
+                            follow_ups[answer]
+                        )
+                        return {"id": f"follow_up_{q_id}", "text": text}
 
         # Get next unanswered required question
         for question in current_topic_data["questions"]:
             if question["id"] not in self.state.collected_data and question.get("required", False):
-                return question
+                return self._localize_question(self.state.current_topic, question)
 
         return None
 
@@ -147,7 +273,7 @@ class ConversationManager:
         
         # Find question configuration
         question = None
-        for topic in self.topics.values():
+        for topic_name, topic in self.topics.items():
             for q in topic["questions"]:
                 if q["id"] == question_id:
                     question = q
@@ -156,22 +282,25 @@ class ConversationManager:
                 break
 
         if not question:
-            return ["Question not found"]
+            return [self.localize("common.question_not_found", COMMON_STRINGS["common.question_not_found"])]
 
         # Required field validation
         if question.get("required") and not answer:
-            errors.append("This field is required")
+            errors.append(self.localize("common.required", COMMON_STRINGS["common.required"]))
             return errors
 
         # Pattern validation
         if "validation" in question and answer:
             pattern = question["validation"]
             if not re.match(pattern, answer):
-                errors.append(question.get("error_message", "Invalid input"))
+                if question.get("error_message"):
+                    errors.append(self.localize(f"{topic_name}.{question_id}.error_message", question["error_message"]))
+                else:
+                    errors.append(self.localize("common.invalid_input", COMMON_STRINGS["common.invalid_input"]))
 
         # Quick reply validation
-        if "quick_replies" in question and answer not in question["quick_replies"]:
-            errors.append("Please select one of the provided options")
+        if "quick_replies" in question and self._canonical_reply(question_id, answer) not in question["quick_replies"]:
+            errors.append(self.localize("common.select_option", COMMON_STRINGS["common.select_option"]))
 
         return errors
 
@@ -215,9 +344,9 @@ class ConversationManager:
                 "should_retry": True
             }
 
-        # Store answer
+        # Store answer, keeping the English value of localized quick replies
         if current_question:
-            self.state.collected_data[current_question] = user_input
+            self.state.collected_data[current_question] = self._canonical_reply(current_question, user_input)
         self.state.validation_errors = []
 
         # Update completion percentage
@@ -264,6 +393,28 @@ class ConversationManager:
         else:
             raise ValueError(f"Unsupported export format: {format}")
 
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Export the conversation state and history for persistence
+        :return: JSON serializable dictionary
+        """
+        return {
+            "language": self.language,
+            "state": asdict(self.state),
+            "conversation_history": [asdict(message) for message in self.conversation_history]
+        }
+
+    def restore_state(self, data: Dict[str, Any]):
+        """
+        Restore conversation state and history exported by export_state
+        :param data: Dictionary produced by export_state
+        """
+        self.language = data.get("language", self.language)
+        self._strings = None
+        if data.get("state") is not None:
+            self.state = ConversationState(**data["state"])
+        self.conversation_history = [Message(**message) for message in data.get("conversation_history", [])]
+
     def get_help_message(self, context: str = None) -> str:
         """
         Get contextual help message
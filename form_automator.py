@@ -18,8 +18,6 @@ class FormAutomator:
         self.timeout = timeout
         self.wait = WebDriverWait(driver, timeout)
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
     def wait_for_element(self, locator_type, locator_value, timeout=None):
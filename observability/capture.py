@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode
+from observability.redaction import redact_json_bytes, redact_value
+
+logger = logging.getLogger(__name__)
+
+class RequestCapture:
+    def __init__(self, directory: str = "captures", max_bytes: int = 50 * 1024 * 1024, backup_count: int = 5,
+                 max_queue: int = 10000):
+        """
+        Initialize a writer of request envelopes to a rotating JSONL file
+
+        Envelopes are redacted and written by a background thread so capturing
+        never blocks request handling; when the queue is full, envelopes are
+        dropped. JSON bodies are stored once per content hash next to the log and
+        referenced by hash, other bodies are only recorded by size.
+        :param directory: Directory for requests.jsonl and the bodies/ store
+        :param max_bytes: Size at which requests.jsonl is rotated
+        :param backup_count: Rotated files kept (requests.jsonl.1 is the newest)
+        :param max_queue: Envelopes buffered before new ones are dropped
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, "requests.jsonl")
+        self.body_dir = os.path.join(directory, "bodies")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        os.makedirs(self.body_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="request-capture", daemon=True)
+        self._thread.start()
+
+    def record(self, envelope: Dict[str, Any], body: Optional[bytes] = None):
+        """
+        Queue an envelope for writing
+        :param envelope: Request metadata (route, query, sizes, status, timing)
+        :param body: Raw request body to redact, store and reference, if any
+        """
+        try:
+            self._queue.put_nowait((envelope, body))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0):
+        """Write out queued envelopes and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _store_body(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        path = os.path.join(self.body_dir, digest[:2], digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(body)
+            os.replace(temp_path, path)
+        return digest
+
+    def _rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            envelope, body = item
+            try:
+                if envelope.get("query"):
+                    pairs = parse_qsl(envelope["query"], keep_blank_values=True)
+                    envelope["query"] = urlencode([(key, redact_value({key: value})[key]) for key, value in pairs])
+                if body is not None:
+                    try:
+                        envelope["body_ref"] = self._store_body(redact_json_bytes(body))
+                    except ValueError:
+                        # Not JSON, only its size is recorded
+                        pass
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(envelope, ensure_ascii=False) + "\n")
+                    size = f.tell()
+                if size >= self.max_bytes:
+                    self._rotate()
+            except Exception as e:
+                logger.error(f"Failed to write captured request: {str(e)}")
+
+def create_request_capture() -> Optional[RequestCapture]:
+    """
+    Build the capture writer from the environment; capture is opt-in
+
+    CAPTURE_SAMPLE_RATE (0 to 1) enables it, CAPTURE_DIR, CAPTURE_MAX_MB and
+    CAPTURE_BACKUPS configure the files.
+    :return: Capture writer, or None when capture is disabled
+    """
+    if float(os.getenv("CAPTURE_SAMPLE_RATE", "0")) <= 0:
+        return None
+    return RequestCapture(
+        directory=os.getenv("CAPTURE_DIR", "captures"),
+        max_bytes=int(float(os.getenv("CAPTURE_MAX_MB", "50")) * 1024 * 1024),
+        backup_count=int(os.getenv("CAPTURE_BACKUPS", "5"))
+    )
\ No newline at end of file
@@ -0,0 +1,172 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Tuple
+from observability.redaction import RedactionFilter
+from observability.tracing import current_trace
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the writer thread; drops them instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve everything that depends on the calling thread or on mutable arguments here;
+        # formatting itself happens on the writer thread
+        record = copy.copy(record)
+        if not isinstance(record.msg, dict):
+            # structlog event dicts stay as is for the ProcessorFormatter
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            # exc_text for stdlib formatters, exception_text survives structlog clearing exc_text
+            # The redaction filter may already have formatted and scrubbed it
+            record.exc_text = record.exception_text = (
+                record.exc_text or logging.Formatter().formatException(record.exc_info)
+            )
+            record.exc_info = None
+        trace = current_trace()
+        if trace is not None:
+            record.trace_id = trace.trace_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    """Minimal JSON lines formatter, used when structlog is not installed"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.getMessage()
+        }
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def _add_record_fields(logger, method_name, event_dict):
+    """structlog processor copying the trace ID and exception text prepared on the calling thread"""
+    record = event_dict.get("_record")
+    if record is not None:
+        if getattr(record, "trace_id", None):
+            event_dict["trace_id"] = record.trace_id
+        if getattr(record, "exception_text", None):
+            event_dict["exception"] = record.exception_text
+    return event_dict
+
+def _formatters() -> Tuple[logging.Formatter, logging.Formatter]:
+    """Build the (file, console) formatters"""
+    try:
+        import structlog
+    except ImportError:
+        return JsonFormatter(), logging.Formatter(CONSOLE_FORMAT)
+
+    shared_processors = [
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.add_logger_name,
+        structlog.processors.TimeStamper(fmt="iso", utc=True)
+    ]
+    # structlog loggers go through the same queue and formatter as stdlib ones
+    structlog.configure(
+        processors=[structlog.contextvars.merge_contextvars, *shared_processors,
+                    structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True
+    )
+    file_formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors,
+        processors=[
+            _add_record_fields,
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.JSONRenderer(ensure_ascii=False)
+        ]
+    )
+    console_formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors,
+        processors=[
+            _add_record_fields,
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.dev.ConsoleRenderer(colors=False)
+        ]
+    )
+    return file_formatter, console_formatter
+
+def configure_logging(log_file: str = "app.log", log_dir: Optional[str] = None, level: Optional[str] = None,
+                      console: bool = True, max_bytes: Optional[int] = None,
+                      backup_count: Optional[int] = None, redact: Optional[bool] = None) -> QueueListener:
+    """
+    Configure process-wide logging once: JSON lines to a rotating file, written by a background thread
+
+    Log calls only copy the record onto a bounded queue, so slow disks never add
+    latency to requests; when the queue is full, records are dropped. Calling
+    this again returns the running listener. Phones, emails, Aadhaar and PAN
+    numbers and sensitive field values are redacted from every record. Defaults
+    come from LOG_DIR, LOG_LEVEL, LOG_MAX_MB, LOG_BACKUPS and LOG_REDACT.
+    :param log_file: File name inside log_dir
+    :param log_dir: Log directory
+    :param level: Root log level name
+    :param console: Also write human readable lines to stderr
+    :param max_bytes: Size at which the log file is rotated
+    :param backup_count: Rotated files kept
+    :param redact: Scrub PII from messages and exception text
+    :return: Queue listener owning the writer thread
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_dir = log_dir or os.getenv("LOG_DIR", "logs")
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    max_bytes = max_bytes or int(float(os.getenv("LOG_MAX_MB", "10")) * 1024 * 1024)
+    backup_count = backup_count if backup_count is not None else int(os.getenv("LOG_BACKUPS", "5"))
+    if redact is None:
+        redact = os.getenv("LOG_REDACT", "true").lower() != "false"
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = RotatingFileHandler(
+        os.path.join(log_dir, log_file), maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    file_formatter, console_formatter = _formatters()
+    file_handler.setFormatter(file_formatter)
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setFormatter(console_formatter)
+        handlers.append(console_handler)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    if redact:
+        # Runs once per record on the calling thread, before the record is copied onto the queue
+        queue_handler.addFilter(RedactionFilter())
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # Flush queued records on interpreter exit
+    atexit.register(_listener.stop)
+    return _listener
\ No newline at end of file
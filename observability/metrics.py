@@ -0,0 +1,148 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+class Histogram:
+    """Counts per bucket plus sum and count, buckets are upper bounds"""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, bucket_count: int):
+        # One extra slot for observations above the largest bucket (+Inf)
+        self.counts = [0] * (bucket_count + 1)
+        self.sum = 0.0
+        self.count = 0
+
+def _format_labels(names: Sequence[str], values: Sequence) -> str:
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class MetricsRegistry:
+    def __init__(self, duration_buckets: Sequence[float] = DURATION_BUCKETS,
+                 size_buckets: Sequence[float] = SIZE_BUCKETS):
+        """
+        Initialize a registry of HTTP request metrics for one process
+
+        Routes are labelled by their template (e.g. /api/chat/{session_id}), so
+        label cardinality stays bounded. Recording a request is a few dictionary
+        updates under a lock; formatting happens only when metrics are scraped.
+        :param duration_buckets: Latency histogram buckets in seconds
+        :param size_buckets: Payload size histogram buckets in bytes
+        """
+        self.duration_buckets = tuple(duration_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._durations: Dict[Tuple[str, str], Histogram] = {}
+        self._request_sizes: Dict[Tuple[str, str], Histogram] = {}
+        self._response_sizes: Dict[Tuple[str, str], Histogram] = {}
+
+    def request_started(self, route: str):
+        """
+        Count a request as in flight
+        :param route: Route template
+        """
+        with self._lock:
+            self._in_flight[route] = self._in_flight.get(route, 0) + 1
+
+    def request_finished(self, route: str, method: str, status: int, duration: float, request_bytes: int,
+                         response_bytes: int):
+        """
+        Record a finished request
+        :param route: Route template, as passed to request_started
+        :param method: HTTP method
+        :param status: Response status code
+        :param duration: Seconds from request start to the last response byte
+        :param request_bytes: Request body size
+        :param response_bytes: Response body size
+        """
+        key = (route, method)
+        duration_index = bisect_left(self.duration_buckets, duration)
+        request_index = bisect_left(self.size_buckets, request_bytes)
+        response_index = bisect_left(self.size_buckets, response_bytes)
+
+        with self._lock:
+            self._in_flight[route] -= 1
+            request_key = (route, method, status)
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+            for histograms, index, value, bucket_count in (
+                (self._durations, duration_index, duration, len(self.duration_buckets)),
+                (self._request_sizes, request_index, request_bytes, len(self.size_buckets)),
+                (self._response_sizes, response_index, response_bytes, len(self.size_buckets))
+            ):
+                histogram = histograms.get(key)
+                if histogram is None:
+                    histogram = histograms[key] = Histogram(bucket_count)
+                histogram.counts[index] += 1
+                histogram.sum += value
+                histogram.count += 1
+
+    def _render_histogram(self, lines: List[str], name: str, help_text: str, buckets: Sequence[float],
+                          histograms: Dict[Tuple[str, str], Histogram]):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (route, method), histogram in sorted(histograms.items()):
+            labels = _format_labels(("route", "method"), (route, method))
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ["+Inf"], histogram.counts):
+                cumulative += count
+                bound_label = bound if bound == "+Inf" else _format_value(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{bound_label}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {_format_value(histogram.sum)}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+    def render(self) -> str:
+        """
+        Format all metrics in the Prometheus text exposition format (version 0.0.4)
+        :return: Metrics text
+        """
+        with self._lock:
+            requests = dict(self._requests)
+            in_flight = dict(self._in_flight)
+            durations = {key: _copy(value) for key, value in self._durations.items()}
+            request_sizes = {key: _copy(value) for key, value in self._request_sizes.items()}
+            response_sizes = {key: _copy(value) for key, value in self._response_sizes.items()}
+
+        lines = [
+            "# HELP http_requests_total Requests handled, by route template, method and status",
+            "# TYPE http_requests_total counter"
+        ]
+        for (route, method, status), count in sorted(requests.items()):
+            lines.append(f"http_requests_total{{{_format_labels(('route', 'method', 'status'), (route, method, status))}}} {count}")
+
+        lines.append("# HELP http_requests_in_flight Requests currently being handled")
+        lines.append("# TYPE http_requests_in_flight gauge")
+        for route, count in sorted(in_flight.items()):
+            lines.append(f"http_requests_in_flight{{{_format_labels(('route',), (route,))}}} {count}")
+
+        self._render_histogram(lines, "http_request_duration_seconds", "Request latency until the last response byte",
+                               self.duration_buckets, durations)
+        self._render_histogram(lines, "http_request_size_bytes", "Request body size",
+                               self.size_buckets, request_sizes)
+        self._render_histogram(lines, "http_response_size_bytes", "Response body size",
+                               self.size_buckets, response_sizes)
+
+        lines.append("# HELP process_start_time_seconds Start time of the process since the Unix epoch")
+        lines.append("# TYPE process_start_time_seconds gauge")
+        lines.append(f"process_start_time_seconds {_format_value(round(self.started, 3))}")
+        return "\n".join(lines) + "\n"
+
+def _copy(histogram: Histogram) -> Histogram:
+    copy = Histogram(len(histogram.counts) - 1)
+    copy.counts = list(histogram.counts)
+    copy.sum = histogram.sum
+    copy.count = histogram.count
+    return copy
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = MetricsRegistry()
\ No newline at end of file
@@ -0,0 +1,238 @@
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Leaf functions of threads waiting on I/O or locks, dropped unless idle samples are requested
+IDLE_FUNCTIONS = {"select", "poll", "wait", "_wait_for_tstate_lock", "accept", "recv_into"}
+
+MAX_PROFILE_SECONDS = 60.0
+# Ways tracemalloc can group allocation statistics
+GROUP_BY_KEYS = ("lineno", "filename", "traceback")
+
+# Floor of the sampling interval, so a profile cannot turn into a busy loop
+MIN_SAMPLE_INTERVAL = 0.001
+
+class SamplingProfiler:
+    def __init__(self, min_gap: float = float(os.getenv("PROFILE_MIN_GAP_SECONDS", "30"))):
+        """
+        Initialize a sampling CPU profiler for a live process
+
+        The profiling thread reads the stack of every other thread with
+        sys._current_frames at a fixed interval, so profiled code runs unmodified
+        and the overhead is bounded by the sampling rate. One profile runs at a
+        time, and the next may only start min_gap seconds after the last one
+        ended, so repeated requests cannot keep a worker under the profiler.
+        :param min_gap: Seconds between the end of a profile and the start of the next
+        """
+        self.min_gap = min_gap
+        self._lock = threading.Lock()
+        self._last_ended: Optional[float] = None
+        self._base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        filename = code.co_filename
+        if filename.startswith(self._base):
+            filename = os.path.relpath(filename, self._base)
+        else:
+            filename = os.path.basename(filename)
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+    def profile(self, seconds: float = 10.0, interval: float = 0.01, include_idle: bool = False) -> Dict:
+        """
+        Sample all threads for a while, blocking the calling thread
+        :param seconds: Profiling duration, capped at MAX_PROFILE_SECONDS
+        :param interval: Seconds between samples, at least MIN_SAMPLE_INTERVAL
+        :param include_idle: Keep samples of threads blocked in select, accept or lock waits
+        :return: Dictionary of collapsed stacks (stack to sample count), sample and duration totals
+        :raises ProfilerBusyError: If another profile is running or the last one ended less than min_gap ago
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running", retry_after=MAX_PROFILE_SECONDS)
+        try:
+            if self._last_ended is not None:
+                wait = self._last_ended + self.min_gap - time.monotonic()
+                if wait > 0:
+                    raise ProfilerBusyError(f"The last profile ended less than {self.min_gap:.0f}s ago",
+                                            retry_after=wait)
+            seconds = min(seconds, MAX_PROFILE_SECONDS)
+            interval = max(interval, MIN_SAMPLE_INTERVAL)
+            stacks: Counter = Counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            own_ident = threading.get_ident()
+            samples = 0
+            started = time.perf_counter()
+            deadline = started + seconds
+
+            while time.perf_counter() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    if not include_idle and frame.f_code.co_name in IDLE_FUNCTIONS:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(self._label(frame))
+                        frame = frame.f_back
+                    if ident not in names:
+                        names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    labels.append(names.get(ident, f"thread-{ident}"))
+                    stacks[";".join(reversed(labels))] += 1
+                samples += 1
+                time.sleep(interval)
+
+            self._last_ended = time.monotonic()
+            return {
+                "stacks": dict(stacks),
+                "samples": samples,
+                "duration_seconds": round(time.perf_counter() - started, 3)
+            }
+        finally:
+            self._lock.release()
+
+def collapsed_stacks(profile: Dict) -> str:
+    """
+    Format a profile as collapsed stacks, the input of flamegraph.pl and speedscope
+    :param profile: Result of SamplingProfiler.profile
+    :return: One 'frame;frame;frame count' line per stack, most frequent first
+    """
+    lines = [f"{stack} {count}" for stack, count in Counter(profile["stacks"]).most_common()]
+    return "\n".join(lines) + "\n"
+
+class MemoryProfiler:
+    def __init__(self):
+        """Initialize tracemalloc snapshots and diffs for a live process"""
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 25) -> Dict:
+        """
+        Start tracing allocations; allocations made before this are not attributed
+        :param frames: Stack frames stored per allocation
+        :return: Tracing status
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> Dict:
+        """
+        Stop tracing allocations and drop the baseline, releasing tracemalloc memory
+        :return: Tracing status
+        """
+        with self._lock:
+            self._baseline = None
+        tracemalloc.stop()
+        return self.status()
+
+    def status(self) -> Dict:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "has_baseline": self._baseline is not None
+        }
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise ProfilerStateError("Memory tracing is not started")
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>")
+        ))
+
+    def snapshot(self, limit: int = 25, group_by: str = "lineno") -> Dict:
+        """
+        Take a snapshot, keep it as the baseline for diffs and report the largest allocation sites
+        :param limit: Number of allocation sites
+        :param group_by: 'lineno', 'filename' or 'traceback'
+        :return: Dictionary of top allocation sites and object counts by type
+        :raises ValueError: If group_by is not one of GROUP_BY_KEYS
+        """
+        _check_group_by(group_by)
+        snapshot = self._take_snapshot()
+        with self._lock:
+            self._baseline = snapshot
+        stats = snapshot.statistics(group_by)
+        return {
+            **self.status(),
+            "top": [
+                {"site": _format_traceback(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                for stat in stats[:limit]
+            ],
+            "object_counts": object_counts(limit)
+        }
+
+    def diff(self, limit: int = 25, group_by: str = "lineno", reset_baseline: bool = False) -> Dict:
+        """
+        Compare the current allocations with the baseline snapshot
+        :param limit: Number of allocation sites
+        :param group_by: 'lineno', 'filename' or 'traceback'
+        :param reset_baseline: Make the current snapshot the new baseline
+        :return: Dictionary of allocation sites that grew the most since the baseline
+        :raises ValueError: If group_by is not one of GROUP_BY_KEYS
+        """
+        _check_group_by(group_by)
+        with self._lock:
+            baseline = self._baseline
+        if baseline is None:
+            raise ProfilerStateError("No baseline snapshot, take one first")
+        snapshot = self._take_snapshot()
+        if reset_baseline:
+            with self._lock:
+                self._baseline = snapshot
+
+        stats = snapshot.compare_to(baseline, group_by)
+        return {
+            **self.status(),
+            "growth": [
+                {
+                    "site": _format_traceback(stat.traceback),
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count
+                }
+                for stat in stats[:limit]
+            ]
+        }
+
+def _check_group_by(group_by: str):
+    if group_by not in GROUP_BY_KEYS:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY_KEYS)}")
+
+def _format_traceback(traceback: tracemalloc.Traceback) -> List[str]:
+    # Most recent frame first
+    return [f"{frame.filename}:{frame.lineno}" for frame in reversed(traceback)]
+
+def object_counts(limit: int = 25) -> List[Dict]:
+    """
+    Count live objects tracked by the garbage collector by type, e.g. to spot leaked sessions
+    :param limit: Number of types
+    :return: List of type names and counts, most common first
+    """
+    counts = Counter(
+        f"{type(obj).__module__}.{type(obj).__qualname__}" for obj in gc.get_objects()
+    )
+    return [{"type": name, "count": count} for name, count in counts.most_common(limit)]
+
+cpu_profiler = SamplingProfiler()
+memory_profiler = MemoryProfiler()
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one runs, or too soon after the last one"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class ProfilerStateError(Exception):
+    """Raised when a memory operation needs tracing or a baseline that is missing"""
+    pass
\ No newline at end of file
@@ -0,0 +1,117 @@
+import json
+import logging
+import re
+from re import Match, Pattern
+from typing import Any, Iterable, Set
+from config.security_config import SECURITY_CONFIG
+
+# Strings longer than this, mostly binary payloads (base64 audio, images), are cut to this length
+# before redaction, which keeps scanning cheap and never lets their text through unredacted
+MAX_TEXT_LENGTH = 4096
+
+def sensitive_fields(extra: Iterable[str] = ("password", "token", "api_key", "authorization")) -> Set[str]:
+    """
+    Get the field names whose values are always redacted
+    :param extra: Credential fields redacted in addition to the configured ones
+    :return: Set of lower case field names
+    """
+    config = SECURITY_CONFIG['DATA_PROTECTION']
+    fields = list(config['ANONYMIZATION_FIELDS']) + list(config['SENSITIVE_FIELDS']) + list(extra)
+    return {field.lower() for field in fields}
+
+SENSITIVE_FIELDS = sensitive_fields()
+
+def build_scanner(fields: Iterable[str]) -> Pattern:
+    """
+    Compile all PII patterns into one regex, so a text is scanned in a single pass
+    :param fields: Field names whose values are masked in JSON, dict reprs and key=value pairs
+    :return: Compiled pattern with one named group per kind of match
+    """
+    names = "|".join(re.escape(field) for field in sorted(fields, key=len, reverse=True))
+    return re.compile(
+        # Every kind of match starts at a word boundary: checking that once up front lets the
+        # scan skip over the inside of words without trying each alternative
+        r"(?<!\w)(?:"
+        # "name": "value", 'name': 'value' and name=value, the field name case insensitive
+        rf"""(?P<field>(?<![\w-])(?P<quote>["']?)(?i:{names})(?P=quote)\s*[:=]\s*)"""
+        # An unquoted value runs to the next , ; & or closing bracket or the end of the line, so
+        # "Authorization: Bearer <token>" and multi-word addresses are masked whole
+        r"""(?P<value>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'"""
+        r"""|[^\s,;&)}\]{\["'](?:[^,;&)}\]\r\n]*[^\s,;&)}\]])?)"""
+        r"|(?P<email>(?<![\w.+-])[\w.+-]+@[\w-]+\.[\w.-]+)"
+        r"|(?P<aadhaar>\b[2-9]\d{3}\s?\d{4}\s?\d{4}\b)"
+        r"|(?P<pan>\b(?i:[A-Z]{5}\d{4}[A-Z])\b)"
+        # Ten digits, also written 5 + 5 as in "98765 43210"
+        r"|(?P<phone>(?:\+91[\s-]?|\b0|\b)[6-9]\d{4}[\s-]?\d{5}\b)"
+        r")"
+    )
+
+SCANNER = build_scanner(SENSITIVE_FIELDS)
+
+# The end of a cut string: trailing digits and separators, or a trailing word
+PARTIAL_TAIL = re.compile(r"[+\d][\d\s-]*$|[\w.+@-]+$")
+
+REPLACEMENTS = {"email": "[EMAIL]", "aadhaar": "[AADHAAR]", "pan": "[PAN]", "phone": "[PHONE]"}
+
+def _replace(match: Match) -> str:
+    kind = match.lastgroup
+    if kind == "value":
+        # Keep the key and the quoting of the value, so JSON stays JSON
+        quote = match.group("value")[0]
+        masked = f"{quote}[REDACTED]{quote}" if quote in "\"'" else "[REDACTED]"
+        return match.group("field") + masked
+    return REPLACEMENTS[kind]
+
+def redact_text(text: str) -> str:
+    """
+    Replace phone numbers, emails, Aadhaar and PAN numbers and the values of sensitive fields in free text
+    :param text: Text to redact
+    :return: Redacted text
+    """
+    return SCANNER.sub(_replace, text)
+
+def redact_value(value: Any) -> Any:
+    """
+    Redact a decoded JSON value, masking sensitive fields and PII in strings
+    :param value: JSON value
+    :return: Redacted copy
+    """
+    if isinstance(value, dict):
+        return {
+            key: "[REDACTED]" if key.lower() in SENSITIVE_FIELDS else redact_value(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_value(item) for item in value]
+    if isinstance(value, str):
+        if len(value) <= MAX_TEXT_LENGTH:
+            return redact_text(value)
+        # Also drop what the cut may have left of a number or address, which would no longer match
+        head = value[:MAX_TEXT_LENGTH - 64] + PARTIAL_TAIL.sub("", value[MAX_TEXT_LENGTH - 64:MAX_TEXT_LENGTH])
+        return f"{redact_text(head)}...[{len(value) - len(head)} chars truncated]"
+    return value
+
+def redact_json_bytes(body: bytes) -> bytes:
+    """
+    Redact a JSON request body
+    :param body: Raw JSON body
+    :return: Redacted JSON body
+    :raises ValueError: If the body is not JSON
+    """
+    return json.dumps(redact_value(json.loads(body)), ensure_ascii=False).encode("utf-8")
+
+class RedactionFilter(logging.Filter):
+    """Redacts PII in log messages, arguments and exception text before records leave the process"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, dict):
+            # structlog event dicts
+            record.msg = redact_value(record.msg)
+        else:
+            record.msg = redact_text(record.getMessage())
+            record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        if record.exc_text:
+            record.exc_text = redact_text(record.exc_text)
+        return True
\ No newline at end of file
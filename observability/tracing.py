@@ -0,0 +1,138 @@
+import contextvars
+import functools
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+class Trace:
+    """Spans recorded while handling one request"""
+
+    __slots__ = ("trace_id", "name", "started", "wall_started", "spans", "duration_ms", "status")
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started = time.perf_counter()
+        self.wall_started = time.time()
+        # (name, start offset ms, duration ms, attributes)
+        self.spans: List[tuple] = []
+        self.duration_ms = 0.0
+        self.status: Optional[int] = None
+
+    def finish(self):
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        """
+        Format the spans as a Server-Timing header value, summed per span name
+        :return: Header value, e.g. 'bhashini.compute;dur=812.4, total;dur=1020.0'
+        """
+        totals: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        for name, _, duration, _ in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+            counts[name] = counts.get(name, 0) + 1
+        entries = [
+            f'{name};dur={total:.1f}' + (f';desc="x{counts[name]}"' if counts[name] > 1 else "")
+            for name, total in totals.items()
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.wall_started,
+            "duration_ms": round(self.duration_ms, 1),
+            "status": self.status,
+            "spans": [
+                {"name": name, "start_ms": round(start, 1), "duration_ms": round(duration, 1), **attributes}
+                for name, start, duration, attributes in self.spans
+            ]
+        }
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+
+def current_trace() -> Optional[Trace]:
+    """Get the trace of the request being handled, if any"""
+    return _current_trace.get()
+
+@contextmanager
+def start_trace(name: str) -> Iterator[Trace]:
+    """
+    Start a trace for the current context; tasks and threads spawned inside inherit it
+    :param name: Trace name, e.g. 'POST /api/process-voice'
+    """
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _current_trace.reset(token)
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block as a span of the current trace; a no-op outside of a trace
+    :param name: Span name, e.g. 'bhashini.compute'
+    :param attributes: Extra details stored with the span
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        ended = time.perf_counter()
+        trace.spans.append((name, (started - trace.started) * 1000, (ended - started) * 1000, attributes))
+
+def traced(name: str):
+    """Decorator recording each call of an async function as a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class SlowTraceBuffer:
+    def __init__(self, capacity: int = 200, threshold_ms: float = 1000.0):
+        """
+        Ring buffer keeping the most recent slow traces
+        :param capacity: Number of traces kept
+        :param threshold_ms: Traces at least this slow are kept
+        """
+        self.threshold_ms = threshold_ms
+        self._traces: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def record(self, trace: Trace):
+        if trace.duration_ms >= self.threshold_ms:
+            with self._lock:
+                self._traces.append(trace)
+
+    def recent(self, limit: int = 50, min_duration_ms: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Get recent slow traces, newest first
+        :param limit: Maximum number of traces
+        :param min_duration_ms: Only traces at least this slow
+        :return: List of trace dictionaries
+        """
+        with self._lock:
+            traces = list(self._traces)
+        selected = [trace for trace in reversed(traces) if trace.duration_ms >= min_duration_ms]
+        return [trace.to_dict() for trace in selected[:limit]]
+
+slow_traces = SlowTraceBuffer(
+    capacity=int(os.getenv("TRACE_BUFFER_SIZE", "200")),
+    threshold_ms=float(os.getenv("TRACE_SLOW_MS", "1000"))
+)
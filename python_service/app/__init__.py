@@ -2,8 +2,9 @@ from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+# Shared with the API, installed from the repository root by requirements.txt
+from observability.logging_setup import configure_logging
 
 def create_app():
     app = Flask(__name__)
@@ -21,20 +22,8 @@ def create_app():
     app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'your-secret-key')
     jwt = JWTManager(app)
 
-    # Configure logging
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-
-    file_handler = RotatingFileHandler(
-        'logs/legal_saathi.log',
-        maxBytes=10240,
-        backupCount=10
-    )
-    file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-    ))
-    file_handler.setLevel(logging.INFO)
-    app.logger.addHandler(file_handler)
+    # Configure logging: JSON lines written by a background thread, rotated at LOG_MAX_MB
+    configure_logging('legal_saathi.log')
     app.logger.setLevel(logging.INFO)
     app.logger.info('Legal-Saathi Python Service startup')
 
@@ -42,9 +31,14 @@ def create_app():
     from .modules.browser import bp as browser_bp
     from .modules.form import bp as form_bp
     from .modules.data import bp as data_bp
+    from .modules.debug import bp as debug_bp
+    from .modules.metrics import bp as metrics_bp, routes as metrics_routes
 
     app.register_blueprint(browser_bp, url_prefix='/api/browser')
     app.register_blueprint(form_bp, url_prefix='/api/form')
     app.register_blueprint(data_bp, url_prefix='/api/data')
+    app.register_blueprint(debug_bp, url_prefix='/api/debug')
+    app.register_blueprint(metrics_bp)
+    metrics_routes.instrument(app)
 
     return app 
\ No newline at end of file
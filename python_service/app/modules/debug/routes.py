@@ -0,0 +1,85 @@
+from flask import Response, abort, jsonify, request
+from functools import wraps
+from observability.profiling import (
+    GROUP_BY_KEYS, ProfilerBusyError, ProfilerStateError, collapsed_stacks, cpu_profiler, memory_profiler
+)
+import hmac
+import logging
+import math
+import os
+from . import bp
+
+logger = logging.getLogger(__name__)
+
+def require_debug_token(view):
+    """Only serve debug endpoints when DEBUG_TOKEN is configured and presented."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        expected = os.environ.get('DEBUG_TOKEN')
+        presented = request.headers.get('X-Debug-Token')
+        # Compared as bytes: compare_digest raises TypeError on non-ASCII strings, and a header may hold any byte
+        if not expected or not presented or not hmac.compare_digest(expected.encode(), presented.encode()):
+            # Indistinguishable from a missing route
+            abort(404)
+        return view(*args, **kwargs)
+    return wrapper
+
+@bp.route('/profile/cpu', methods=['POST'])
+@require_debug_token
+def profile_cpu():
+    """Sample all threads of this worker and return collapsed stacks for a flamegraph."""
+    seconds = request.args.get('seconds', 10.0, type=float)
+    interval_ms = request.args.get('interval_ms', 10.0, type=float)
+    include_idle = request.args.get('include_idle', 'false').lower() == 'true'
+    try:
+        profile = cpu_profiler.profile(seconds, interval_ms / 1000, include_idle)
+    except ProfilerBusyError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409, {'Retry-After': str(math.ceil(e.retry_after))}
+
+    response = Response(collapsed_stacks(profile), mimetype='text/plain')
+    response.headers['X-Profile-Samples'] = str(profile['samples'])
+    response.headers['X-Profile-Seconds'] = str(profile['duration_seconds'])
+    return response
+
+@bp.route('/memory/start', methods=['POST'])
+@require_debug_token
+def start_memory_tracing():
+    """Start tracemalloc on this worker."""
+    return jsonify(memory_profiler.start(request.args.get('frames', 25, type=int)))
+
+@bp.route('/memory/stop', methods=['POST'])
+@require_debug_token
+def stop_memory_tracing():
+    """Stop tracemalloc on this worker."""
+    return jsonify(memory_profiler.stop())
+
+@bp.route('/memory/snapshot', methods=['POST'])
+@require_debug_token
+def memory_snapshot():
+    """Take the baseline snapshot and list the largest allocation sites and object counts."""
+    group_by = request.args.get('group_by', 'lineno')
+    if group_by not in GROUP_BY_KEYS:
+        return jsonify({'success': False, 'error': f"group_by must be one of {', '.join(GROUP_BY_KEYS)}"}), 400
+    try:
+        return jsonify(memory_profiler.snapshot(
+            request.args.get('limit', 25, type=int),
+            group_by
+        ))
+    except ProfilerStateError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+
+@bp.route('/memory/diff', methods=['GET'])
+@require_debug_token
+def memory_diff():
+    """List the allocation sites that grew the most since the baseline snapshot."""
+    group_by = request.args.get('group_by', 'lineno')
+    if group_by not in GROUP_BY_KEYS:
+        return jsonify({'success': False, 'error': f"group_by must be one of {', '.join(GROUP_BY_KEYS)}"}), 400
+    try:
+        return jsonify(memory_profiler.diff(
+            request.args.get('limit', 25, type=int),
+            group_by,
+            request.args.get('reset_baseline', 'false').lower() == 'true'
+        ))
+    except ProfilerStateError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
\ No newline at end of file
@@ -0,0 +1,48 @@
+from flask import Response, abort, g, request
+from observability.metrics import CONTENT_TYPE, registry
+import hmac
+import os
+import time
+from . import bp
+
+UNMATCHED_ROUTE = 'unmatched'
+EXCLUDED_PATHS = {'/metrics'}
+
+def instrument(app):
+    """Record request counts, in-flight requests, latency and payload sizes per URL rule."""
+    @app.before_request
+    def start_request_metrics():
+        if request.path in EXCLUDED_PATHS:
+            return
+        g.metrics_route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+        g.metrics_started = time.perf_counter()
+        g.metrics_status = 500
+        g.metrics_response_bytes = 0
+        registry.request_started(g.metrics_route)
+
+    @app.after_request
+    def record_response_metrics(response):
+        if 'metrics_route' in g:
+            g.metrics_status = response.status_code
+            g.metrics_response_bytes = response.content_length or 0
+        return response
+
+    # Runs even when the view raised, so in-flight counts never leak
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        if 'metrics_route' not in g:
+            return
+        registry.request_finished(
+            g.metrics_route, request.method, g.metrics_status, time.perf_counter() - g.metrics_started,
+            request.content_length or 0, g.metrics_response_bytes
+        )
+
+@bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Expose request metrics of this worker in the Prometheus text format."""
+    expected = os.environ.get('METRICS_TOKEN')
+    presented = request.headers.get('Authorization')
+    # Compared as bytes: compare_digest raises TypeError on non-ASCII strings, and a header may hold any byte
+    if expected and not (presented and hmac.compare_digest(presented.encode(), f'Bearer {expected}'.encode())):
+        abort(404)
+    return Response(registry.render(), content_type=CONTENT_TYPE)
\ No newline at end of file
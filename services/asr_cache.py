@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+class ASRCache:
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600.0):
+        """
+        Initialize a content-addressed cache for ASR results
+        :param max_entries: Maximum cached results, least recently used are evicted first
+        :param ttl_seconds: Seconds a cached result stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def make_key(audio_data: str, task_sequence: List[str], source_language: str,
+                 target_language: str) -> str:
+        """
+        Build a cache key from the audio content and what is computed from it
+        :param audio_data: Base64 encoded audio, normalized so identical recordings hash alike
+        :param task_sequence: List of tasks (ASR, NMT, TTS)
+        :param source_language: Source language code
+        :param target_language: Target language code
+        :return: Cache key
+        """
+        digest = hashlib.blake2b(audio_data.encode("ascii", "ignore"), digest_size=16)
+        digest.update(f"|{','.join(task_sequence)}|{source_language}|{target_language}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached result
+        :param key: Cache key
+        :return: Cached result, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        """
+        Store a result, evicting the least recently used entries beyond max_entries
+        :param key: Cache key
+        :param value: Result to cache
+        """
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached result for key, computing it at most once across concurrent callers
+        :param key: Cache key
+        :param compute: Coroutine factory producing the result on a miss
+        :return: Result
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(key, compute))
+            self._in_flight[key] = task
+
+        # One caller giving up must not cancel the computation for the others
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await compute()
+            # Failures are not cached, the next request retries upstream
+            self.set(key, value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics
+        :return: Dictionary of entry, hit, miss, shared and in-flight counts
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "in_flight": len(self._in_flight)
+        }
@@ -0,0 +1,181 @@
+import base64
+import io
+import math
+import re
+from typing import List, Tuple
+import numpy as np
+from scipy.io import wavfile
+from scipy.signal import resample_poly
+
+def decode_wav(audio_data: str) -> Tuple[np.ndarray, int]:
+    """
+    Decode base64 encoded WAV audio into float samples
+    :param audio_data: Base64 encoded WAV audio
+    :return: Tuple of (float32 samples shaped (frames, channels) in [-1, 1], sample rate)
+    """
+    try:
+        sample_rate, samples = wavfile.read(io.BytesIO(base64.b64decode(audio_data)))
+    except Exception as e:
+        raise AudioProcessingError(f"Could not decode WAV audio: {str(e)}")
+
+    if samples.ndim == 1:
+        samples = samples[:, np.newaxis]
+
+    if samples.dtype == np.uint8:
+        samples = (samples.astype(np.float32) - 128.0) / 128.0
+    elif np.issubdtype(samples.dtype, np.integer):
+        samples = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max)
+    else:
+        samples = samples.astype(np.float32)
+
+    return samples, sample_rate
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> str:
+    """
+    Encode float samples as base64 encoded 16-bit PCM WAV audio
+    :param samples: Float samples in [-1, 1], shaped (frames,) or (frames, channels)
+    :param sample_rate: Sample rate in Hz
+    :return: Base64 encoded WAV audio
+    """
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype(np.int16)
+    buffer = io.BytesIO()
+    wavfile.write(buffer, sample_rate, pcm)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+def frame_rms(samples: np.ndarray, sample_rate: int, frame_ms: int = 30) -> np.ndarray:
+    """
+    Compute the RMS energy of consecutive non-overlapping frames
+    :param samples: Float samples shaped (frames,) or (frames, channels)
+    :param sample_rate: Sample rate in Hz
+    :param frame_ms: Frame length in milliseconds
+    :return: Array of per-frame RMS values
+    """
+    mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    frame_count = len(mono) // frame_length
+    if frame_count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = mono[:frame_count * frame_length].reshape(frame_count, frame_length)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+def split_on_silence(samples: np.ndarray, sample_rate: int, max_segment_seconds: float = 30.0,
+                     overlap_seconds: float = 1.0, frame_ms: int = 30,
+                     silence_db: float = -35.0) -> List[Tuple[int, int]]:
+    """
+    Split audio into overlapping segments, preferring to cut inside pauses
+    :param samples: Float samples shaped (frames,) or (frames, channels)
+    :param sample_rate: Sample rate in Hz
+    :param max_segment_seconds: Maximum segment length in seconds
+    :param overlap_seconds: Audio shared between consecutive segments in seconds
+    :param frame_ms: Frame length used for silence detection in milliseconds
+    :param silence_db: Frames quieter than this (relative to loud speech) count as silence
+    :return: List of (start, end) sample indices
+    """
+    total = len(samples)
+    max_length = int(max_segment_seconds * sample_rate)
+    if total <= max_length:
+        return [(0, total)]
+
+    overlap = min(int(overlap_seconds * sample_rate), max_length // 4)
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    rms = frame_rms(samples, sample_rate, frame_ms)
+    threshold = np.percentile(rms, 95) * 10 ** (silence_db / 20) if len(rms) else 0.0
+    silent_frames = np.flatnonzero(rms <= threshold)
+    # Cut points sit in the middle of silent frames
+    silent_points = silent_frames * frame_length + frame_length // 2
+
+    segments = []
+    start = 0
+    while start < total:
+        end = start + max_length
+        if end >= total:
+            segments.append((start, total))
+            break
+
+        # Take the latest pause in the second half of the window, else cut hard
+        lo, hi = np.searchsorted(silent_points, [start + max_length // 2, end])
+        if hi > lo:
+            end = int(silent_points[hi - 1])
+
+        segments.append((start, end))
+        start = end - overlap
+
+    return segments
+
+def trim_silence(samples: np.ndarray, sample_rate: int, silence_db: float = -40.0,
+                 padding_ms: int = 150, frame_ms: int = 30) -> np.ndarray:
+    """
+    Trim leading and trailing silence
+    :param samples: Float samples shaped (frames,) or (frames, channels)
+    :param sample_rate: Sample rate in Hz
+    :param silence_db: Frames quieter than this (relative to loud speech) count as silence
+    :param padding_ms: Audio kept on either side of the voiced region in milliseconds
+    :param frame_ms: Frame length used for silence detection in milliseconds
+    :return: Trimmed samples (unchanged if no voiced frames are found)
+    """
+    rms = frame_rms(samples, sample_rate, frame_ms)
+    if len(rms) == 0:
+        return samples
+
+    threshold = np.percentile(rms, 95) * 10 ** (silence_db / 20)
+    voiced = np.flatnonzero(rms > threshold)
+    if len(voiced) == 0:
+        return samples
+
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    padding = int(sample_rate * padding_ms / 1000)
+    start = max(0, voiced[0] * frame_length - padding)
+    end = min(len(samples), (voiced[-1] + 1) * frame_length + padding)
+    return samples[start:end]
+
+def normalize_audio(audio_data: str, target_rate: int = 16000) -> str:
+    """
+    Prepare client audio for ASR: mono, resampled to the ASR rate, 16-bit PCM, silence trimmed
+    :param audio_data: Base64 encoded WAV audio in any channel layout, rate or sample format
+    :param target_rate: Sample rate expected by the ASR model in Hz
+    :return: Base64 encoded 16-bit mono WAV audio
+    """
+    samples, sample_rate = decode_wav(audio_data)
+
+    # Downmix to mono
+    mono = samples.mean(axis=1)
+
+    # Resample with a polyphase filter, e.g. 44100 -> 16000 is 160/441
+    if sample_rate != target_rate:
+        divisor = math.gcd(sample_rate, target_rate)
+        mono = resample_poly(mono, target_rate // divisor, sample_rate // divisor).astype(np.float32)
+
+    mono = trim_silence(mono, target_rate)
+    return encode_wav(mono, target_rate)
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.lower())
+
+def stitch_transcripts(transcripts: List[str], max_overlap_words: int = 12) -> str:
+    """
+    Join ordered segment transcripts, dropping words repeated across segment overlaps
+    :param transcripts: Transcripts of consecutive overlapping segments
+    :param max_overlap_words: Longest run of repeated words to look for
+    :return: Stitched transcript
+    """
+    words: List[str] = []
+    for transcript in transcripts:
+        next_words = transcript.split()
+        if not next_words:
+            continue
+
+        tail = [_normalize_word(w) for w in words[-max_overlap_words:]]
+        head = [_normalize_word(w) for w in next_words[:max_overlap_words]]
+        duplicated = 0
+        for size in range(min(len(tail), len(head)), 0, -1):
+            if tail[-size:] == head[:size]:
+                duplicated = size
+                break
+
+        words.extend(next_words[duplicated:])
+
+    return " ".join(words)
+
+class AudioProcessingError(Exception):
+    """Custom exception for audio processing errors"""
+    pass
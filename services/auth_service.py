@@ -16,8 +16,6 @@ class AuthService:
         self._failed_attempts = {}
         self._user_sessions = {}
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
     def hash_password(self, password: str) -> str:
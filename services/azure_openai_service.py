@@ -1,8 +1,10 @@
 import openai
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
 import os
+from typing import AsyncIterator, Dict, List
 from dotenv import load_dotenv
 import logging
+from observability.tracing import span
 
 class AzureOpenAIService:
     def __init__(self):
@@ -13,52 +15,96 @@ class AzureOpenAIService:
                 api_version="2024-02-15-preview",  # Update this to your API version
                 azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
             )
+            # Async client for streaming, so tokens don't block the event loop
+            self.async_client = AsyncAzureOpenAI(
+                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                api_version="2024-02-15-preview",
+                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
+            )
             self.model_name = os.getenv("AZURE_OPENAI_MODEL_NAME", "gpt-4")
         except Exception as e:
             logging.error(f"Failed to initialize Azure OpenAI client: {str(e)}")
             raise
 
+    def build_messages(self, conversation_history: List[str], user_input: str) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a legal query
+        :param conversation_history: Previous turns, as {"role", "content"} dicts or alternating user and assistant strings
+        :param user_input: Current user input
+        :return: Chat completion messages
+        """
+        messages = [
+            {
+                "role": "system", 
+                "content": """You are an expert legal assistant focusing on Indian law. Your responses should:
+                1. Always cite relevant sections of Indian laws (IPC, CrPC, specific acts) when applicable
+                2. Provide practical steps with legal backing
+                3. Explain legal terms in simple language
+                4. Mention time limits for legal actions if any
+                5. Provide information about legal remedies and rights
+
+                When a user introduces themselves and states their concern:
+                1. Address them by name
+                2. Acknowledge their concern
+                3. Ask relevant follow-up questions to gather important details
+                4. Provide initial guidance based on the information available
+
+                Format your responses with clear sections and bullet points when appropriate.
+                Be empathetic while maintaining professionalism."""
+            }
+        ]
+
+        # Add conversation history, either role-tagged or alternating plain strings
+        for msg in conversation_history:
+            if isinstance(msg, dict):
+                messages.append({"role": msg["role"], "content": msg["content"]})
+                continue
+            messages.append({
+                "role": "user" if len(messages) % 2 == 1 else "assistant",
+                "content": msg
+            })
+
+        # Add current user input
+        messages.append({"role": "user", "content": user_input})
+        return messages
+
     async def get_legal_response(self, conversation_history, user_input):
         try:
-            messages = [
-                {
-                    "role": "system", 
-                    "content": """You are an expert legal assistant focusing on Indian law. Your responses should:
-                    1. Always cite relevant sections of Indian laws (IPC, CrPC, specific acts) when applicable
-                    2. Provide practical steps with legal backing
-                    3. Explain legal terms in simple language
-                    4. Mention time limits for legal actions if any
-                    5. Provide information about legal remedies and rights
-                    
-                    When a user introduces themselves and states their concern:
-                    1. Address them by name
-                    2. Acknowledge their concern
-                    3. Ask relevant follow-up questions to gather important details
-                    4. Provide initial guidance based on the information available
-                    
-                    Format your responses with clear sections and bullet points when appropriate.
-                    Be empathetic while maintaining professionalism."""
-                }
-            ]
-            
-            # Add conversation history
-            for msg in conversation_history:
-                messages.append({
-                    "role": "user" if len(messages) % 2 == 1 else "assistant",
-                    "content": msg
-                })
-            
-            # Add current user input
-            messages.append({"role": "user", "content": user_input})
+            messages = self.build_messages(conversation_history, user_input)
 
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=800,
-                top_p=0.95
-            )
+            with span("azure_openai.completion", model=self.model_name):
+                response = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=800,
+                    top_p=0.95
+                )
             return response.choices[0].message.content
         except Exception as e:
             logging.error(f"Azure OpenAI API error: {str(e)}")
+            raise
+
+    async def stream_legal_response(self, conversation_history: List, user_input: str) -> AsyncIterator[str]:
+        """
+        Stream the legal response token by token
+        :param conversation_history: Previous turns, as {"role", "content"} dicts or alternating user and assistant strings
+        :param user_input: Current user input
+        :return: Async iterator of response text fragments
+        """
+        try:
+            with span("azure_openai.stream", model=self.model_name):
+                stream = await self.async_client.chat.completions.create(
+                    model=self.model_name,
+                    messages=self.build_messages(conversation_history, user_input),
+                    temperature=0.7,
+                    max_tokens=800,
+                    top_p=0.95,
+                    stream=True
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except Exception as e:
+            logging.error(f"Azure OpenAI streaming error: {str(e)}")
             raise
\ No newline at end of file
@@ -1,23 +1,36 @@
 import aiohttp
+import asyncio
 import json
 import os
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 import logging
+from observability.tracing import span, traced
+from services.asr_cache import ASRCache
 
 # Load environment variables
 load_dotenv()
 
 class BhashiniService:
+    # Shared by all instances so retried and duplicate uploads never reach Bhashini twice
+    asr_cache = ASRCache(
+        max_entries=int(os.getenv("BHASHINI_ASR_CACHE_SIZE", "512")),
+        ttl_seconds=float(os.getenv("BHASHINI_ASR_CACHE_TTL", "3600"))
+    )
+
     def __init__(self):
         """Initialize Bhashini service"""
-        self.base_url = "https://bhashini.gov.in/api"
+        self.base_url = os.getenv("BHASHINI_BASE_URL", "https://bhashini.gov.in/api")
         self.api_key = os.getenv("BHASHINI_API_KEY")
         self.pipeline_id = os.getenv("BHASHINI_PIPELINE_ID")
         self.session = None
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
+        # Long recordings are transcribed as overlapping segments in parallel
+        self.asr_segment_seconds = float(os.getenv("BHASHINI_ASR_SEGMENT_SECONDS", "30"))
+        self.asr_segment_overlap = float(os.getenv("BHASHINI_ASR_SEGMENT_OVERLAP", "1.0"))
+        self.asr_max_workers = int(os.getenv("BHASHINI_ASR_MAX_WORKERS", "4"))
+        self.asr_sample_rate = int(os.getenv("BHASHINI_ASR_SAMPLE_RATE", "16000"))
+        
         self.logger = logging.getLogger(__name__)
 
     async def __aenter__(self):
@@ -60,9 +73,10 @@ class BhashiniService:
             }
             
             session = await self.get_session()
-            async with session.post(url, json=payload, headers=headers) as response:
-                response.raise_for_status()
-                return await response.json()
+            with span("bhashini.search"):
+                async with session.post(url, json=payload, headers=headers) as response:
+                    response.raise_for_status()
+                    return await response.json()
             
         except Exception as e:
             self.logger.error(f"Pipeline search failed: {str(e)}")
@@ -93,9 +107,10 @@ class BhashiniService:
             }
             
             session = await self.get_session()
-            async with session.post(url, json=payload, headers=headers) as response:
-                response.raise_for_status()
-                return await response.json()
+            with span("bhashini.config", tasks=",".join(task_sequence)):
+                async with session.post(url, json=payload, headers=headers) as response:
+                    response.raise_for_status()
+                    return await response.json()
             
         except Exception as e:
             self.logger.error(f"Pipeline config failed: {str(e)}")
@@ -123,17 +138,73 @@ class BhashiniService:
             }
             
             session = await self.get_session()
-            async with session.post(url, json=payload, headers=headers) as response:
-                response.raise_for_status()
-                return await response.json()
+            with span("bhashini.compute", tasks=",".join(config.get("taskSequence", [])), bytes=len(input_data)):
+                async with session.post(url, json=payload, headers=headers) as response:
+                    response.raise_for_status()
+                    return await response.json()
             
         except Exception as e:
             self.logger.error(f"Pipeline computation failed: {str(e)}")
             raise BhashiniError(f"Pipeline computation failed: {str(e)}")
 
+    @traced("audio.normalize")
+    async def prepare_audio(self, audio_data: str) -> str:
+        """
+        Normalize client audio to what the ASR model expects before sending it upstream
+        :param audio_data: Base64 encoded audio as recorded by the client
+        :return: Base64 encoded 16-bit mono WAV, or the original payload if it is not WAV
+        """
+        # NumPy and SciPy are only imported once audio actually arrives
+        from services.audio_processing import AudioProcessingError, normalize_audio
+        try:
+            return await asyncio.to_thread(normalize_audio, audio_data, self.asr_sample_rate)
+        except AudioProcessingError:
+            # Leave formats we cannot decode for the ASR service to handle
+            return audio_data
+
+    def segment_audio(self, audio_data: str) -> List[str]:
+        """
+        Split long audio into overlapping segments at silence boundaries
+        :param audio_data: Base64 encoded audio data
+        :return: List of base64 encoded segments (the original payload if no split is needed)
+        """
+        from services.audio_processing import AudioProcessingError, decode_wav, encode_wav, split_on_silence
+        try:
+            samples, sample_rate = decode_wav(audio_data)
+        except AudioProcessingError:
+            # Not a WAV payload we can cut, send it as is
+            return [audio_data]
+
+        bounds = split_on_silence(
+            samples,
+            sample_rate,
+            max_segment_seconds=self.asr_segment_seconds,
+            overlap_seconds=self.asr_segment_overlap
+        )
+        if len(bounds) == 1:
+            return [audio_data]
+
+        return [encode_wav(samples[start:end], sample_rate) for start, end in bounds]
+
+    @traced("asr")
     async def speech_to_text(self, audio_data: str, source_language: str) -> str:
         """
-        Convert speech to text using ASR
+        Convert speech to text using ASR, reusing results for identical audio
+        :param audio_data: Base64 encoded audio data
+        :param source_language: Source language code
+        :return: Transcribed text
+        """
+        key = self.asr_cache.make_key(audio_data, ["ASR"], source_language, source_language)
+        return await self.asr_cache.get_or_compute(
+            key, lambda: self._speech_to_text(audio_data, source_language)
+        )
+
+    async def _speech_to_text(self, audio_data: str, source_language: str) -> str:
+        """
+        Transcribe audio with the ASR pipeline
+        
+        Recordings longer than the segment length are split at pauses and the
+        segments are transcribed concurrently, at most asr_max_workers at a time.
         :param audio_data: Base64 encoded audio data
         :param source_language: Source language code
         :return: Transcribed text
@@ -146,15 +217,29 @@ class BhashiniService:
                 target_language=source_language
             )
             
-            # Compute ASR
-            result = await self.compute_pipeline(config, audio_data)
+            segments = await asyncio.to_thread(self.segment_audio, audio_data)
+            if len(segments) == 1:
+                result = await self.compute_pipeline(config, segments[0])
+                return result.get("text", "")
             
-            return result.get("text", "")
+            self.logger.info(f"Transcribing {len(segments)} audio segments")
+            semaphore = asyncio.Semaphore(self.asr_max_workers)
+            
+            async def transcribe(segment: str) -> str:
+                async with semaphore:
+                    result = await self.compute_pipeline(config, segment)
+                return result.get("text", "")
+            
+            # gather keeps segment order regardless of completion order
+            transcripts = await asyncio.gather(*(transcribe(segment) for segment in segments))
+            from services.audio_processing import stitch_transcripts
+            return stitch_transcripts(transcripts)
             
         except Exception as e:
             self.logger.error(f"Speech to text failed: {str(e)}")
             raise BhashiniError(f"Speech to text failed: {str(e)}")
 
+    @traced("nmt")
     async def translate_text(self, text: str, source_language: str, 
                            target_language: str) -> str:
         """
@@ -181,6 +266,7 @@ class BhashiniService:
             self.logger.error(f"Translation failed: {str(e)}")
             raise BhashiniError(f"Translation failed: {str(e)}")
 
+    @traced("tts")
     async def text_to_speech(self, text: str, target_language: str) -> str:
         """
         Convert text to speech using TTS
@@ -205,6 +291,7 @@ class BhashiniService:
             self.logger.error(f"Text to speech failed: {str(e)}")
             raise BhashiniError(f"Text to speech failed: {str(e)}")
 
+    @traced("voice_pipeline")
     async def process_voice_input(self, audio_data: str, source_language: str,
                                 target_language: str, include_speech: bool = False) -> Dict:
         """
@@ -215,12 +302,23 @@ class BhashiniService:
         :param include_speech: Whether to include speech output
         :return: Processing results
         """
+        # Define task sequence
+        task_sequence = ["ASR", "NMT"]
+        if include_speech:
+            task_sequence.append("TTS")
+        
+        key = self.asr_cache.make_key(audio_data, task_sequence, source_language, target_language)
+        return await self.asr_cache.get_or_compute(
+            key,
+            lambda: self._process_voice_input(
+                audio_data, task_sequence, source_language, target_language, include_speech
+            )
+        )
+
+    async def _process_voice_input(self, audio_data: str, task_sequence: List[str], source_language: str,
+                                   target_language: str, include_speech: bool) -> Dict:
+        """Run the combined voice pipeline upstream"""
         try:
-            # Define task sequence
-            task_sequence = ["ASR", "NMT"]
-            if include_speech:
-                task_sequence.append("TTS")
-            
             # Get pipeline config
             config = await self.get_pipeline_config(
                 task_sequence=task_sequence,
@@ -0,0 +1,284 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+from conversation_manager import ConversationManager
+
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+class ChatSession:
+    """Server-side state of one chat: conversation flow state plus role-tagged history"""
+
+    def __init__(self, session_id: str, language: str = "en"):
+        self.session_id = session_id
+        self.conversation_manager = ConversationManager(language=language)
+        self.last_active = time.time()
+        # Serializes turns of the same session, never persisted
+        self.lock = asyncio.Lock()
+        # Requests using the session, which keep it from being spilled; never persisted
+        self.pins = 0
+
+    @property
+    def history(self) -> List[Dict[str, str]]:
+        """Conversation history as {"role", "content"} messages"""
+        return [
+            {"role": message.sender, "content": message.content}
+            for message in self.conversation_manager.conversation_history
+        ]
+
+    def add_turn(self, role: str, content: str, max_history: int):
+        """
+        Append a message to the history, keeping at most max_history messages
+        :param role: 'user' or 'assistant'
+        :param content: Message text
+        :param max_history: Maximum messages kept
+        """
+        self.conversation_manager.add_message(content=content, sender=role)
+        del self.conversation_manager.conversation_history[:-max_history]
+        self.last_active = time.time()
+
+    def advance_flow(self, user_input: str) -> Optional[Dict]:
+        """
+        Feed a user message to the conversation flow, once it is no longer complete
+        :param user_input: Message text
+        :return: {"status", "next_question", "errors", "completion_percentage"}, or None if the flow was complete
+        """
+        manager = self.conversation_manager
+        if manager.state.completion_percentage >= 100:
+            return None
+        result = manager.process_user_input(user_input)
+        if result["status"] == "completed":
+            # Only required questions count towards the percentage; the flow is over either way
+            manager.state.completion_percentage = 100.0
+        next_question = result.get("next_question")
+        return {
+            "status": result["status"],
+            "next_question": next_question["text"] if next_question else None,
+            "errors": result.get("errors", []),
+            "completion_percentage": manager.state.completion_percentage
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "last_active": self.last_active,
+            "conversation": self.conversation_manager.export_state()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ChatSession":
+        session = cls(data["session_id"], data["conversation"].get("language", "en"))
+        session.last_active = data["last_active"]
+        session.conversation_manager.restore_state(data["conversation"])
+        return session
+
+def _read_session(path: str) -> "ChatSession":
+    with open(path, encoding="utf-8") as f:
+        session = ChatSession.from_dict(json.load(f))
+    # The session now lives in memory; spilling it again writes a new file
+    os.remove(path)
+    return session
+
+def _remove_file(path: str) -> bool:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+class ChatSessionStore:
+    def __init__(self, spill_dir: str = "data/chat_sessions", max_hot_sessions: int = 1000,
+                 idle_seconds: float = 600.0, max_history: int = 100):
+        """
+        Initialize a session store with a bounded in-memory LRU that spills to disk
+
+        Sessions are used through checkout(), which pins them until the request
+        is done, so a session is never spilled while a handler holds or waits
+        for it. Spill files are written and read in worker threads, and a
+        session is always in exactly one place: in memory, being written, or
+        on disk.
+        :param spill_dir: Directory for sessions evicted from memory
+        :param max_hot_sessions: Sessions kept in memory, not counting pinned ones
+        :param idle_seconds: Sessions idle this long are spilled even below the memory bound
+        :param max_history: Messages kept per session
+        """
+        self.spill_dir = spill_dir
+        self.max_hot_sessions = max_hot_sessions
+        self.idle_seconds = idle_seconds
+        self.max_history = max_history
+        self._hot: "OrderedDict[str, ChatSession]" = OrderedDict()
+        # Spills being written and reloads being read, by session ID
+        self._spilling: Dict[str, asyncio.Future] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(spill_dir, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        if not SESSION_ID_PATTERN.match(session_id):
+            raise ChatSessionError(f"Invalid session ID: {session_id}")
+        return os.path.join(self.spill_dir, f"{session_id}.json")
+
+    @asynccontextmanager
+    async def checkout(self, session_id: Optional[str] = None,
+                       language: str = "en") -> AsyncIterator[Optional[ChatSession]]:
+        """
+        Use a session for the length of a request, creating a new one if no ID is given
+        :param session_id: Session ID, or None to create a session
+        :param language: Language the conversation flow is served in, for a new session
+        :return: Context manager yielding the pinned session, or None if it does not exist
+        """
+        try:
+            session = self.create(language) if session_id is None else await self.get(session_id)
+        except ChatSessionError:
+            session = None
+        if session is None:
+            yield None
+            return
+        try:
+            yield session
+        finally:
+            await self.release(session)
+
+    def create(self, language: str = "en") -> ChatSession:
+        """
+        Create a new session, pinned until passed to release
+        :param language: Language the conversation flow is served in
+        :return: New session
+        """
+        session = ChatSession(uuid.uuid4().hex, language)
+        session.pins += 1
+        self._hot[session.session_id] = session
+        return session
+
+    async def get(self, session_id: str) -> Optional[ChatSession]:
+        """
+        Get a session, pinned until passed to release, reloading it from disk if it was spilled
+        :param session_id: Session ID
+        :return: Session, or None if it does not exist
+        """
+        path = self._path(session_id)
+        while True:
+            session = self._hot.get(session_id)
+            if session is not None:
+                break
+            spilling = self._spilling.get(session_id)
+            if spilling is not None:
+                # Reload only once the spill is complete
+                await asyncio.shield(spilling)
+                continue
+            loading = self._loading.get(session_id)
+            if loading is None:
+                loading = self._loading[session_id] = asyncio.ensure_future(self._load(session_id, path))
+            if not await asyncio.shield(loading):
+                return None
+
+        # Pinned with no await since the lookup, so it cannot have been spilled in between
+        session.pins += 1
+        session.last_active = time.time()
+        self._hot.move_to_end(session_id)
+        return session
+
+    async def release(self, session: ChatSession):
+        """
+        Unpin a session returned by create or get, then spill what no longer fits in memory
+        :param session: Session
+        """
+        session.pins -= 1
+        session.last_active = time.time()
+        await self._spill_excess()
+
+    async def delete(self, session_id: str) -> bool:
+        """
+        Delete a session from memory and disk
+        :param session_id: Session ID
+        :return: True if the session existed
+        """
+        path = self._path(session_id)
+        for pending in (self._spilling.get(session_id), self._loading.get(session_id)):
+            if pending is not None:
+                await asyncio.shield(pending)
+        existed = self._hot.pop(session_id, None) is not None
+        if await asyncio.to_thread(_remove_file, path):
+            existed = True
+        return existed
+
+    async def _load(self, session_id: str, path: str) -> bool:
+        try:
+            session = await asyncio.to_thread(_read_session, path)
+        except FileNotFoundError:
+            return False
+        except (ValueError, KeyError, TypeError) as e:
+            # Dropped, so the client gets a 404 and can start over instead of a 500 on every request
+            self.logger.warning(f"Dropping unreadable chat session {session_id}: {str(e)}")
+            await asyncio.to_thread(_remove_file, path)
+            return False
+        finally:
+            del self._loading[session_id]
+        self._hot[session_id] = session
+        self.logger.debug(f"Reloaded chat session {session_id} from disk")
+        return True
+
+    def _spill(self, session: ChatSession, data: Dict):
+        # Write then rename, so a crash never leaves a truncated session behind
+        fd, temp_path = tempfile.mkstemp(dir=self.spill_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, self._path(session.session_id))
+        self.logger.debug(f"Spilled chat session {session.session_id} to disk")
+
+    async def _spill_to_disk(self, session: ChatSession):
+        try:
+            await asyncio.to_thread(self._spill, session, session.to_dict())
+        except Exception as e:
+            # Kept in memory rather than lost
+            self.logger.error(f"Failed to spill chat session {session.session_id}: {str(e)}")
+            self._hot[session.session_id] = session
+        finally:
+            del self._spilling[session.session_id]
+
+    async def _spill_excess(self):
+        """Spill least recently used sessions beyond the memory bound or idle too long, skipping pinned ones"""
+        cutoff = time.time() - self.idle_seconds
+        excess = len(self._hot) - self.max_hot_sessions
+        victims = []
+        for session in self._hot.values():
+            if excess <= 0 and session.last_active >= cutoff:
+                break
+            if session.pins:
+                # In use by a request, spilling now would lose its turn
+                continue
+            victims.append(session)
+            excess -= 1
+        spills = []
+        for session in victims:
+            del self._hot[session.session_id]
+            spills.append(asyncio.ensure_future(self._spill_to_disk(session)))
+            self._spilling[session.session_id] = spills[-1]
+        if spills:
+            await asyncio.gather(*spills)
+
+    async def flush(self):
+        """Spill every in-memory session, e.g. on shutdown"""
+        if self._spilling:
+            await asyncio.gather(*list(self._spilling.values()))
+        while self._hot:
+            _, session = self._hot.popitem(last=False)
+            await asyncio.to_thread(self._spill, session, session.to_dict())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hot_sessions": len(self._hot),
+            "pinned_sessions": sum(1 for session in self._hot.values() if session.pins),
+            "spilled_sessions": sum(1 for name in os.listdir(self.spill_dir) if name.endswith(".json"))
+        }
+
+class ChatSessionError(Exception):
+    """Custom exception for chat session errors"""
+    pass
\ No newline at end of file
@@ -13,8 +13,6 @@ class ComplianceService:
         self._data_processing_records = {}
         self._privacy_notices = {}
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
     def record_consent(self, user_id: str, purpose: str, data_categories: List[str]) -> Dict:
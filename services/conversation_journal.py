@@ -0,0 +1,313 @@
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from cryptography.fernet import Fernet
+from conversation_manager import ConversationState, Message
+from services.encryption_service import EncryptionError, EncryptionService
+from services.history_index import HistoryRecord
+
+LOG_FILE = "journal.log"
+SNAPSHOT_FILE = "snapshot"
+KEY_FILE = ".key"
+
+def load_journal_key(directory: str = "data/journal") -> bytes:
+    """
+    Get the key journals are encrypted with: JOURNAL_KEY if set, else a key file created on first use
+
+    The key file lives next to the journals and is all that protects them, so
+    whoever can read the directory can read the journals; set JOURNAL_KEY to
+    keep the key elsewhere.
+    :param directory: Journal directory holding the key file
+    :return: Fernet key
+    """
+    key = os.getenv("JOURNAL_KEY")
+    if key:
+        return key.encode()
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, KEY_FILE)
+    try:
+        # Readable by the owner only; O_EXCL keeps two first runs from writing different keys
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "rb") as f:
+            return f.read().strip()
+    key = Fernet.generate_key()
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+def _fsync_directory(directory: str):
+    # Makes a rename durable; directories cannot be opened on Windows
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+class ConversationJournal:
+    def __init__(self, conversation_id: str, encryption: EncryptionService, directory: str = "data/journal",
+                 compact_every: int = 200, sequence: int = 0):
+        """
+        Initialize an append-only, encrypted journal of one conversation's messages and state changes
+
+        Recording an event only serializes it and puts it on a queue. A writer
+        thread encrypts queued events and commits them as a group, with one
+        write and one fsync per batch, so a crash loses at most the events
+        still queued. After compact_every events the caller should pass the
+        full conversation to compact(): a snapshot is written atomically and
+        the log truncated, which keeps resuming to one snapshot plus a short
+        log tail. Events carry sequence numbers, so events already contained
+        in a snapshot are skipped if a crash hits between the two steps.
+        :param conversation_id: Conversation ID, names the journal directory
+        :param encryption: Service with a persistent key, see load_journal_key
+        :param directory: Directory holding one subdirectory per conversation
+        :param compact_every: Events between snapshots
+        :param sequence: Last sequence number already in the journal, when resuming
+        """
+        self.conversation_id = conversation_id
+        self.encryption = encryption
+        self.path = os.path.join(directory, conversation_id)
+        self.compact_every = compact_every
+        self.sequence = sequence
+        self.events_since_snapshot = 0
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.path, exist_ok=True)
+
+        self._queue: queue.Queue = queue.Queue()
+        self._log = open(os.path.join(self.path, LOG_FILE), "ab")
+        if self._log.tell() and not _ends_with_newline(self._log.name):
+            # Terminate a line cut short by a crash, so it cannot swallow the next event
+            self._log.write(b"\n")
+        self._writer = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.events_since_snapshot >= self.compact_every
+
+    def _append(self, event: Dict[str, Any]):
+        self.sequence += 1
+        self.events_since_snapshot += 1
+        event["seq"] = self.sequence
+        self._queue.put(("event", json.dumps(event, ensure_ascii=False)))
+
+    def record_message(self, message: Message):
+        """
+        Journal a message added to the conversation
+        :param message: Message
+        """
+        self._append({"type": "message", "message": asdict(message)})
+
+    def record_state(self, state: ConversationState, language: str):
+        """
+        Journal the conversation state after it changed
+        :param state: Current state
+        :param language: Conversation language
+        """
+        self._append({"type": "state", "state": asdict(state), "language": language})
+
+    def compact(self, conversation: Dict[str, Any]):
+        """
+        Replace the journal with a snapshot, written by the writer thread after all queued events
+        :param conversation: Full conversation as returned by ConversationManager.export_state
+        """
+        snapshot = dict(conversation, seq=self.sequence)
+        self.events_since_snapshot = 0
+        self._queue.put(("snapshot", json.dumps(snapshot, ensure_ascii=False)))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every queued event is on disk
+        :param timeout: Seconds to wait
+        :return: True if the writer caught up in time
+        """
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self, conversation: Optional[Dict[str, Any]] = None, timeout: float = 5.0):
+        """
+        Write outstanding events, optionally compact, and stop the writer thread
+        :param conversation: Full conversation to snapshot, as for compact
+        :param timeout: Seconds to wait for the writer
+        """
+        if conversation is not None and self.events_since_snapshot:
+            self.compact(conversation)
+        self._queue.put(None)
+        self._writer.join(timeout)
+        if self._writer.is_alive():
+            self.logger.warning(f"Journal writer for {self.conversation_id} did not finish in {timeout}s")
+            return
+        self._log.close()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Group commit: everything queued while the previous batch was written goes out together
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                stop = self._write_batch(batch)
+            except Exception as e:
+                self.logger.error(f"Failed to write journal of {self.conversation_id}: {str(e)}")
+                stop = None in batch
+            for item in batch:
+                if item is not None and item[0] == "flush":
+                    item[1].set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List) -> bool:
+        lines: List[str] = []
+        for item in batch:
+            if item is None:
+                break
+            kind, payload = item
+            if kind == "event":
+                lines.append(self.encryption.encrypt_data(payload))
+            elif kind == "snapshot":
+                self._commit(lines)
+                lines = []
+                self._write_snapshot(payload)
+        self._commit(lines)
+        return None in batch
+
+    def _commit(self, lines: List[str]):
+        if not lines:
+            return
+        started = time.perf_counter()
+        self._log.write(("\n".join(lines) + "\n").encode("ascii"))
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self.logger.debug(
+            f"Committed {len(lines)} journal events in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    def _write_snapshot(self, payload: str):
+        # Write then rename, so a crash leaves either the old or the new snapshot
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="ascii") as f:
+            f.write(self.encryption.encrypt_data(payload))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, os.path.join(self.path, SNAPSHOT_FILE))
+        _fsync_directory(self.path)
+        # Only now are the logged events redundant
+        self._log.truncate(0)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+def list_conversations(directory: str = "data/journal") -> List[str]:
+    """
+    List journaled conversations, least recently written first
+    :param directory: Journal directory
+    :return: Conversation IDs
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    def last_written(conversation_id: str) -> float:
+        path = os.path.join(directory, conversation_id)
+        return max(
+            (os.path.getmtime(os.path.join(path, name)) for name in (LOG_FILE, SNAPSHOT_FILE)
+             if os.path.exists(os.path.join(path, name))),
+            default=0.0
+        )
+
+    conversations = [
+        name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name))
+    ]
+    return sorted(conversations, key=last_written)
+
+def load_conversation(conversation_id: str, encryption: EncryptionService,
+                      directory: str = "data/journal") -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a conversation from its snapshot and the events logged after it
+    :param conversation_id: Conversation ID
+    :param encryption: Service holding the journal key
+    :param directory: Journal directory
+    :return: Conversation as accepted by ConversationManager.restore_state plus "seq",
+             the last sequence number, or None if nothing was journaled; "state" is None
+             if no state was ever recorded
+    """
+    path = os.path.join(directory, conversation_id)
+    logger = logging.getLogger(__name__)
+    conversation: Dict[str, Any] = {"state": None, "conversation_history": [], "seq": 0}
+    found = False
+
+    snapshot_path = os.path.join(path, SNAPSHOT_FILE)
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, encoding="ascii") as f:
+            conversation = encryption.decrypt_data(f.read())
+        found = True
+
+    log_path = os.path.join(path, LOG_FILE)
+    if os.path.exists(log_path):
+        with open(log_path, encoding="ascii", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = encryption.decrypt_data(line)
+                except EncryptionError:
+                    # A line cut short by a crash
+                    logger.warning(f"Skipping unreadable journal line of {conversation_id}")
+                    continue
+                if event["seq"] <= conversation["seq"]:
+                    # Already contained in the snapshot
+                    continue
+                conversation["seq"] = event["seq"]
+                found = True
+                if event["type"] == "message":
+                    conversation["conversation_history"].append(event["message"])
+                elif event["type"] == "state":
+                    conversation["state"] = event["state"]
+                    conversation["language"] = event["language"]
+    return conversation if found else None
+
+def journal_records(encryption: EncryptionService, directory: str = "data/journal",
+                    exclude: Iterable[str] = ()) -> Iterator[HistoryRecord]:
+    """
+    Read the messages of all journaled conversations for the history index, oldest conversation first
+    :param encryption: Service holding the journal key
+    :param directory: Journal directory
+    :param exclude: Conversation IDs to skip, e.g. the one being written
+    :return: Iterator of records
+    """
+    skipped = set(exclude)
+    logger = logging.getLogger(__name__)
+    for conversation_id in list_conversations(directory):
+        if conversation_id in skipped:
+            continue
+        try:
+            conversation = load_conversation(conversation_id, encryption, directory)
+        except EncryptionError:
+            logger.warning(f"Skipping journal of {conversation_id}, it cannot be decrypted")
+            continue
+        for message in (conversation or {}).get("conversation_history", []):
+            yield HistoryRecord(
+                conversation_id=conversation_id,
+                sender=message["sender"],
+                timestamp=message["timestamp"],
+                content=message["content"],
+                message_type=message["message_type"]
+            )
\ No newline at end of file
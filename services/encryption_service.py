@@ -5,15 +5,19 @@ from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 import os
 import json
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 from config.security_config import SECURITY_CONFIG
 
 class EncryptionService:
-    def __init__(self):
-        """Initialize encryption service with secure key generation"""
-        self._encryption_key = self._generate_key()
+    def __init__(self, key: Optional[bytes] = None):
+        """
+        Initialize encryption service with secure key generation
+        :param key: Fernet key to reuse across runs, e.g. for data kept on disk; a new key is generated if omitted
+        """
+        self._encryption_key = key or self._generate_key()
         self._fernet = Fernet(self._encryption_key)
-        self._aesgcm = AESGCM(self._generate_aes_key())
+        # A given key also fixes the AES-GCM key, so both methods can decrypt after a restart
+        self._aesgcm = AESGCM(base64.urlsafe_b64decode(key) if key else self._generate_aes_key())
 
     def _generate_key(self) -> bytes:
         """Generate a secure encryption key using PBKDF2"""
@@ -0,0 +1,119 @@
+import re
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Letters and digits, plus the combining vowel signs of Indic scripts that \w does not match
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u0dff]+")
+
+@dataclass
+class HistoryRecord:
+    """One archived message"""
+    conversation_id: str
+    sender: str
+    timestamp: str
+    content: str
+    message_type: str = "text"
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower case search terms
+    :param text: Text to split
+    :return: List of terms, duplicates included
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _contains(sorted_ids: List[int], record_id: int) -> bool:
+    position = bisect_left(sorted_ids, record_id)
+    return position < len(sorted_ids) and sorted_ids[position] == record_id
+
+class HistoryIndex:
+    def __init__(self):
+        """
+        Initialize an in-memory inverted index over archived messages
+
+        Records get increasing IDs, so every posting list stays sorted by
+        appending. Adding a message costs one dictionary update per distinct
+        term, and a search intersects the posting lists of its terms starting
+        from the shortest, without scanning messages.
+        """
+        self._records: List[HistoryRecord] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: HistoryRecord) -> int:
+        """
+        Index a message
+        :param record: Archived message
+        :return: Record ID
+        """
+        terms = set(tokenize(record.content))
+        with self._lock:
+            record_id = len(self._records)
+            self._records.append(record)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    self._postings[term] = [record_id]
+                else:
+                    postings.append(record_id)
+        return record_id
+
+    def recent(self, offset: int = 0, limit: int = 100) -> Tuple[List[HistoryRecord], int]:
+        """
+        Page through all messages, newest first
+        :param offset: Messages to skip
+        :param limit: Maximum messages returned
+        :return: Tuple of (records, total number of messages)
+        """
+        with self._lock:
+            total = len(self._records)
+            end = max(0, total - offset)
+            return self._records[max(0, end - limit):end][::-1], total
+
+    def search(self, query: str, offset: int = 0, limit: int = 100) -> Tuple[List[HistoryRecord], int]:
+        """
+        Find messages containing every term of a query, newest first
+        :param query: Keywords
+        :param offset: Matches to skip
+        :param limit: Maximum matches returned
+        :return: Tuple of (records, total number of matches)
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return self.recent(offset, limit)
+
+        with self._lock:
+            postings = sorted((self._postings.get(term, []) for term in terms), key=len)
+            if not postings[0]:
+                return [], 0
+            matches = postings[0]
+            for other in postings[1:]:
+                # Binary search the longer, sorted list for each ID of the shorter one
+                matches = [record_id for record_id in matches if _contains(other, record_id)]
+                if not matches:
+                    return [], 0
+            page = matches[::-1][offset:offset + limit]
+            return [self._records[record_id] for record_id in page], len(matches)
+
+def load_index(records: Iterable[HistoryRecord], index: HistoryIndex,
+               progress: Optional[Callable[[int], None]] = None, every: int = 5000) -> int:
+    """
+    Index every archived message
+    :param records: Archived messages, oldest first, e.g. from conversation_journal.journal_records
+    :param index: Index to fill
+    :param progress: Called with the number of indexed messages every few thousand messages
+    :param every: Messages between progress calls
+    :return: Number of indexed messages
+    """
+    count = 0
+    for record in records:
+        index.add(record)
+        count += 1
+        if progress and count % every == 0:
+            progress(count)
+    return count
\ No newline at end of file
@@ -0,0 +1,247 @@
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from typing import BinaryIO, Dict, Optional, Tuple
+from PIL import Image, ImageOps
+
+IMAGE_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# Refuse decompression bombs well before Pillow's default warning threshold
+Image.MAX_IMAGE_PIXELS = 80_000_000
+
+class ImageProcessor:
+    def __init__(self, store_dir: str = "data/images", max_dimension: int = 1600, max_bytes: int = 300 * 1024,
+                 qualities: Tuple[int, ...] = (85, 75, 65, 50), max_downscales: int = 3):
+        """
+        Initialize a processor turning uploaded photos into compact JPEGs
+
+        Compact versions are stored by the SHA-256 of the original upload, so a
+        re-uploaded photo is never decoded twice.
+        :param store_dir: Directory for compact images and their metadata
+        :param max_dimension: Longest side of the compact image in pixels
+        :param max_bytes: Target size of the compact image
+        :param qualities: JPEG qualities tried in order until the image fits max_bytes
+        :param max_downscales: Times the image is shrunk further when no quality fits
+        """
+        self.store_dir = store_dir
+        self.max_dimension = max_dimension
+        self.max_bytes = max_bytes
+        self.qualities = qualities
+        self.max_downscales = max_downscales
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(store_dir, exist_ok=True)
+
+    def _path(self, image_id: str, extension: str) -> str:
+        if not IMAGE_ID_PATTERN.match(image_id):
+            raise ImageProcessingError(f"Invalid image ID: {image_id}")
+        return os.path.join(self.store_dir, image_id[:2], f"{image_id}.{extension}")
+
+    def get_metadata(self, image_id: str) -> Optional[Dict]:
+        """
+        Get the metadata of a processed image
+        :param image_id: Content hash of the original upload
+        :return: Metadata, or None if the image was not processed
+        """
+        path = self._path(image_id, "json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def compact_path(self, image_id: str) -> Optional[str]:
+        """
+        Get the path of the compact JPEG to forward downstream
+        :param image_id: Content hash of the original upload
+        :return: File path, or None if the image was not processed
+        """
+        path = self._path(image_id, "jpg")
+        return path if os.path.exists(path) else None
+
+    def compact_base64(self, image_id: str) -> Optional[str]:
+        """
+        Get the compact JPEG base64 encoded, e.g. for OCR or LLM vision requests
+        :param image_id: Content hash of the original upload
+        :return: Base64 encoded JPEG, or None if the image was not processed
+        """
+        path = self.compact_path(image_id)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return base64.b64encode(f.read()).decode()
+
+    def _downscale(self, source: BinaryIO) -> Tuple[Image.Image, Tuple[int, int]]:
+        """Decode an image at reduced scale, returning it and the original size"""
+        image = Image.open(source)
+        original_size = image.size
+        # JPEG only: let the decoder scale by 1/2, 1/4 or 1/8 instead of decoding every pixel
+        image.draft("RGB", (self.max_dimension, self.max_dimension))
+        image = ImageOps.exif_transpose(image)
+
+        # Cheap integer box reduction first, the final resample then only touches a small image
+        factor = max(image.size) // self.max_dimension
+        if factor >= 2:
+            image = image.reduce(factor)
+        image.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        return image, original_size
+
+    def _encode(self, image: Image.Image) -> Tuple[bytes, int, Tuple[int, int]]:
+        """Re-encode as JPEG within max_bytes, returning the data, quality and size used"""
+        for _ in range(self.max_downscales + 1):
+            for quality in self.qualities:
+                buffer = io.BytesIO()
+                image.save(buffer, format="JPEG", quality=quality)
+                if buffer.tell() <= self.max_bytes:
+                    return buffer.getvalue(), quality, image.size
+            last_size = image.size
+            image = image.resize((max(1, image.width * 3 // 4), max(1, image.height * 3 // 4)), Image.LANCZOS)
+        # Best effort after the bounded number of attempts
+        return buffer.getvalue(), quality, last_size
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def process(self, source: BinaryIO, image_id: str, original_bytes: int) -> Dict:
+        """
+        Downscale and re-encode an uploaded image, reusing a stored result for the same content
+        :param source: Seekable file holding the original upload
+        :param image_id: SHA-256 of the original upload
+        :param original_bytes: Size of the original upload
+        :return: Metadata of the compact image
+        """
+        metadata = self.get_metadata(image_id)
+        if metadata is not None:
+            return {**metadata, "deduplicated": True}
+
+        try:
+            image, original_size = self._downscale(source)
+            data, quality, size = self._encode(image)
+        except Image.UnidentifiedImageError:
+            raise ImageProcessingError("Unsupported or corrupt image")
+        except (Image.DecompressionBombError, OSError, ValueError) as e:
+            raise ImageProcessingError(f"Cannot process image: {str(e)}")
+
+        metadata = {
+            "image_id": image_id,
+            "original_bytes": original_bytes,
+            "original_width": original_size[0],
+            "original_height": original_size[1],
+            "bytes": len(data),
+            "width": size[0],
+            "height": size[1],
+            "quality": quality,
+            "content_type": "image/jpeg"
+        }
+        # Image first, so existing metadata always points at a complete image
+        self._write(self._path(image_id, "jpg"), data)
+        self._write(self._path(image_id, "json"), json.dumps(metadata).encode("utf-8"))
+        self.logger.info(f"Compacted image {image_id[:12]} from {original_bytes} to {len(data)} bytes")
+        return {**metadata, "deduplicated": False}
+
+    def _stage(self, source: BinaryIO) -> str:
+        """Copy an upload into the store, returning the path of the copy"""
+        fd, path = tempfile.mkstemp(dir=self.store_dir, suffix=".upload")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                source.seek(0)
+                shutil.copyfileobj(source, f)
+        except (OSError, ValueError) as e:
+            os.remove(path)
+            raise ImageProcessingError(f"Cannot read upload: {str(e)}")
+        return path
+
+    def _process_staged(self, path: str, image_id: str, original_bytes: int) -> Dict:
+        """Process a staged copy of an upload and remove it"""
+        try:
+            with open(path, "rb") as f:
+                return self.process(f, image_id, original_bytes)
+        except ImageProcessingError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to process image {image_id[:12]}: {str(e)}")
+            raise ImageProcessingError(f"Cannot process image: {str(e)}")
+        finally:
+            os.remove(path)
+
+    async def process_async(self, source: BinaryIO, image_id: str, original_bytes: int) -> Dict:
+        """
+        Process an image off the event loop; concurrent uploads of the same content share one decode
+
+        The shared decode works on a copy of the upload in the store, not on the
+        caller's file, which is closed when the caller's request ends even
+        while other requests still wait for the result.
+        :param source: Seekable file holding the original upload
+        :param image_id: SHA-256 of the original upload
+        :param original_bytes: Size of the original upload
+        :return: Metadata of the compact image
+        :raises ImageProcessingError: If the image cannot be processed
+        """
+        task = self._in_flight.get(image_id)
+        if task is None:
+            metadata = await asyncio.to_thread(self.get_metadata, image_id)
+            if metadata is not None:
+                return {**metadata, "deduplicated": True}
+            staged = await asyncio.to_thread(self._stage, source)
+            task = self._in_flight.get(image_id)
+            if task is None:
+                task = asyncio.ensure_future(
+                    asyncio.to_thread(self._process_staged, staged, image_id, original_bytes)
+                )
+                self._in_flight[image_id] = task
+                task.add_done_callback(lambda _: self._in_flight.pop(image_id, None))
+                return await asyncio.shield(task)
+            # Another upload of the same content started processing while this one was copied
+            await asyncio.to_thread(os.remove, staged)
+
+        metadata = await asyncio.shield(task)
+        return {**metadata, "deduplicated": True}
+
+def hash_stream(source: BinaryIO, max_bytes: int, chunk_size: int = 1024 * 1024) -> Tuple[str, int]:
+    """
+    Hash a file in chunks without reading it into memory
+    :param source: File to hash, rewound afterwards
+    :param max_bytes: Largest accepted size
+    :param chunk_size: Bytes read at a time
+    :return: Tuple of (SHA-256 hex digest, size in bytes)
+    :raises ImageTooLargeError: If the file is larger than max_bytes
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise ImageTooLargeError(f"Image larger than {max_bytes} bytes")
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest(), size
+
+class ImageProcessingError(Exception):
+    """Custom exception for image processing errors"""
+    pass
+
+class ImageTooLargeError(ImageProcessingError):
+    """Raised when an upload exceeds the accepted size"""
+    pass
\ No newline at end of file
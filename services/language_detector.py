@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
+
+# Unicode blocks of the scripts we route on: (start, end, script, default language)
+SCRIPT_BLOCKS = [
+    (0x0041, 0x024F, "Latn", "en"),
+    (0x0600, 0x06FF, "Arab", "ur"),
+    (0x0900, 0x097F, "Deva", "hi"),
+    (0x0980, 0x09FF, "Beng", "bn"),
+    (0x0A00, 0x0A7F, "Guru", "pa"),
+    (0x0A80, 0x0AFF, "Gujr", "gu"),
+    (0x0B00, 0x0B7F, "Orya", "or"),
+    (0x0B80, 0x0BFF, "Taml", "ta"),
+    (0x0C00, 0x0C7F, "Telu", "te"),
+    (0x0C80, 0x0CFF, "Knda", "kn"),
+    (0x0D00, 0x0D7F, "Mlym", "ml"),
+]
+SCRIPTS = [block[2] for block in SCRIPT_BLOCKS]
+LATIN = SCRIPTS.index("Latn")
+
+# Seed vocabularies for the Latin-script n-gram model
+ENGLISH_WORDS = """
+the be to of and a in that have i it for not on with he as you do at this but his by from they we
+say her she or an will my one all would there their what so up out if about who get which go me
+when make can like time no just him know take people into year your good some could them see other
+than then now look only come its over think also back after use two how our work first well way even
+new want because any these give day most us is are was were been has had did does am please help
+legal case court police complaint lawyer property land rent tenant landlord salary job money wife
+husband divorce dowry harassment threat notice document father mother brother sister family house
+filed file report against paid pay owner neighbour need want should tell where why when
+""".split()
+
+HINGLISH_WORDS = """
+hai hain tha thi the ho hoga hogi nahi nahin na mat mera meri mere mujhe mujhko humko hamara hamari
+tera teri tere tujhe aap aapka aapki apna apni apne tum tumhara kya kyu kyun kaise kab kahan kaun
+kitna kitni ke ki ka ko se mein me main hum ye yeh woh vo wo aur bhi toh to lekin par pe wala wali
+wale raha rahi rahe gaya gayi gaye karna karta karti karte kar kiya kiye diya diye liya liye dena
+lena chahiye chahta chahti sakta sakti sakte bata batao bataiye samajh jaldi abhi kal aaj phir sirf
+bahut bohot accha acha theek thik ghar paisa paise zameen zamin makaan makan kiraya kirayedar malik
+naukri tankhwah vakil adalat shikayat thana talaq dahej pati patni bhai behen maa baap beta beti
+sasural dhamki maar maara peeta jhagda case wapas milega mila mili nahi_mila kuch koi sab saath
+""".split()
+
+NGRAM_BUCKETS = 4096
+
+def _word_trigrams(word: str) -> List[str]:
+    padded = f"^{word}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def _bucket(ngram: str) -> int:
+    # Stable across processes, unlike hash()
+    value = 0
+    for char in ngram:
+        value = (value * 131 + ord(char)) & 0xFFFFFFFF
+    return value % NGRAM_BUCKETS
+
+def _trigram_log_probs(words: List[str]) -> np.ndarray:
+    counts = np.ones(NGRAM_BUCKETS, dtype=np.float64)
+    for word in words:
+        for ngram in _word_trigrams(word):
+            counts[_bucket(ngram)] += 1.0
+    return np.log(counts / counts.sum())
+
+@dataclass
+class DetectionResult:
+    """Result of local language detection"""
+    language: Optional[str]  # ISO-639 code, None if the text has no letters
+    script: Optional[str]  # ISO-15924 code of the dominant script
+    confidence: float  # Share of letters (or Latin words) supporting the language
+    code_mixed: bool  # True for Hinglish style text or multiple scripts
+
+class LanguageDetector:
+    def __init__(self, mixed_threshold: float = 0.2, min_hindi_words: int = 2, word_margin: float = 2.0,
+                 romanized_hindi_ok: bool = False):
+        """
+        Initialize the detector
+        :param mixed_threshold: Minimum share of the minority language for text to count as code-mixed
+        :param min_hindi_words: Romanized Hindi words needed before Latin text counts as Hindi or code-mixed
+        :param word_margin: Trigram log likelihood ratio a word outside both lexicons needs to count as Hindi
+        :param romanized_hindi_ok: Whether consumers of Hindi output accept romanized Hindi as is
+        """
+        self.mixed_threshold = mixed_threshold
+        self.min_hindi_words = min_hindi_words
+        self.word_margin = word_margin
+        self.romanized_hindi_ok = romanized_hindi_ok
+        self._block_starts = np.array([block[0] for block in SCRIPT_BLOCKS], dtype=np.int64)
+        self._block_ends = np.array([block[1] for block in SCRIPT_BLOCKS], dtype=np.int64)
+        # Row 0 scores English, row 1 romanized Hindi
+        self._log_probs = np.vstack([
+            _trigram_log_probs(ENGLISH_WORDS),
+            _trigram_log_probs(HINGLISH_WORDS)
+        ])
+        self._hinglish_lexicon = frozenset(HINGLISH_WORDS) - frozenset(ENGLISH_WORDS)
+        self._english_lexicon = frozenset(ENGLISH_WORDS)
+
+    def script_histogram(self, texts: List[str]) -> np.ndarray:
+        """
+        Count letters per script for a batch of texts
+        :param texts: Texts to analyse
+        :return: Array shaped (len(texts), len(SCRIPTS)) of letter counts
+        """
+        histogram = np.zeros((len(texts), len(SCRIPTS)), dtype=np.int64)
+        if not texts:
+            return histogram
+
+        # One codepoint array for the whole batch, with the owning text of each codepoint
+        encoded = [text.encode("utf-32-le") for text in texts]
+        lengths = np.array([len(chunk) // 4 for chunk in encoded])
+        codepoints = np.frombuffer(b"".join(encoded), dtype="<u4").astype(np.int64)
+        owners = np.repeat(np.arange(len(texts)), lengths)
+
+        blocks = np.searchsorted(self._block_starts, codepoints, side="right") - 1
+        inside = (blocks >= 0) & (codepoints <= self._block_ends[np.clip(blocks, 0, None)])
+        # Only count letters in the Latin range, not digits or punctuation
+        latin_letter = ((codepoints | 0x20) >= 0x61) & ((codepoints | 0x20) <= 0x7A) | (codepoints >= 0xC0)
+        inside &= (blocks != LATIN) | latin_letter
+
+        np.add.at(histogram, (owners[inside], blocks[inside]), 1)
+        return histogram
+
+    def hinglish_counts(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count the Latin-script words and the romanized Hindi words among them
+        
+        Lexicon words decide by themselves. Other words only count as Hindi when
+        their trigrams favour Hindi by word_margin; unclear words count as
+        English, the default for Latin script.
+        :param texts: Texts to analyse
+        :return: Tuple of (Latin word counts, romanized Hindi word counts)
+        """
+        buckets, ngram_words, word_owners, lexicon_hits, english_hits = [], [], [], [], []
+        word_index = 0
+        for text_index, text in enumerate(texts):
+            for word in text.lower().split():
+                word = "".join(char for char in word if "a" <= char <= "z")
+                if not word:
+                    continue
+                for ngram in _word_trigrams(word):
+                    buckets.append(_bucket(ngram))
+                    ngram_words.append(word_index)
+                word_owners.append(text_index)
+                lexicon_hits.append(word in self._hinglish_lexicon)
+                english_hits.append(word in self._english_lexicon)
+                word_index += 1
+
+        if word_index == 0:
+            return np.zeros(len(texts), dtype=np.int64), np.zeros(len(texts), dtype=np.int64)
+
+        # Per-word log likelihood ratio, Hindi minus English
+        ratios = self._log_probs[1, buckets] - self._log_probs[0, buckets]
+        word_scores = np.bincount(ngram_words, weights=ratios, minlength=word_index)
+        is_hindi = np.array(lexicon_hits) | ((word_scores >= self.word_margin) & ~np.array(english_hits))
+
+        owners = np.array(word_owners)
+        totals = np.bincount(owners, minlength=len(texts))
+        hindi = np.bincount(owners, weights=is_hindi, minlength=len(texts)).astype(np.int64)
+        return totals, hindi
+
+    def hinglish_share(self, texts: List[str]) -> np.ndarray:
+        """
+        Estimate the share of Latin-script words that are romanized Hindi
+        :param texts: Texts to analyse
+        :return: Array of shares in [0, 1] (0 for texts without Latin words)
+        """
+        totals, hindi = self.hinglish_counts(texts)
+        shares = np.zeros(len(texts), dtype=np.float64)
+        np.divide(hindi, totals, out=shares, where=totals > 0)
+        return shares
+
+    def detect_batch(self, texts: List[str]) -> List[DetectionResult]:
+        """
+        Detect the language of a batch of texts
+        :param texts: Texts to analyse
+        :return: One DetectionResult per text
+        """
+        histogram = self.script_histogram(texts)
+        word_totals, hindi_words = self.hinglish_counts(texts)
+        letters = histogram.sum(axis=1)
+        dominant = histogram.argmax(axis=1)
+
+        results = []
+        for index in range(len(texts)):
+            if letters[index] == 0:
+                results.append(DetectionResult(None, None, 0.0, False))
+                continue
+
+            script_index = int(dominant[index])
+            _, _, script, language = SCRIPT_BLOCKS[script_index]
+            script_share = histogram[index, script_index] / letters[index]
+            code_mixed = bool(1.0 - script_share >= self.mixed_threshold)
+            confidence = float(script_share)
+
+            if script_index == LATIN:
+                share = float(hindi_words[index] / word_totals[index]) if word_totals[index] else 0.0
+                # A stray Hindi-looking word, e.g. a name, does not make a short sentence Hindi
+                enough_hindi = bool(hindi_words[index] >= self.min_hindi_words)
+                language = "hi" if enough_hindi and share >= 0.5 else "en"
+                code_mixed = code_mixed or bool(
+                    enough_hindi and self.mixed_threshold <= share <= 1.0 - self.mixed_threshold
+                )
+                confidence = max(share, 1.0 - share) * confidence
+
+            results.append(DetectionResult(language, script, confidence, code_mixed))
+        return results
+
+    def detect(self, text: str) -> DetectionResult:
+        """
+        Detect the language of a single text
+        :param text: Text to analyse
+        :return: Detection result
+        """
+        return self.detect_batch([text])[0]
+
+    def plan_translation(self, text: str, target_language: str,
+                         source_language: Optional[str] = None) -> Tuple[Optional[str], DetectionResult]:
+        """
+        Decide whether text needs machine translation to reach the target language
+
+        A caller-supplied source language is always honoured. Detected romanized
+        or code-mixed Hindi is translated like Hindi, except into Hindi itself:
+        that is skipped only when romanized_hindi_ok says the reader accepts it,
+        otherwise the Latin text goes through English to Hindi NMT.
+        :param text: Text to translate
+        :param target_language: Target language code
+        :param source_language: Caller-supplied source language, detected if None
+        :return: Tuple of (source language to translate from or None to skip, detection result)
+        """
+        detection = self.detect(text)
+        if source_language:
+            return (None if source_language == target_language else source_language), detection
+
+        romanized_hindi = detection.script == "Latn" and (detection.language == "hi" or detection.code_mixed)
+        if romanized_hindi:
+            if target_language != "hi":
+                return "hi", detection
+            return (None if self.romanized_hindi_ok else "en"), detection
+
+        source = detection.language or target_language
+        return (None if source == target_language else source), detection
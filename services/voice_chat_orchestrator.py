@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import re
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from services.azure_openai_service import AzureOpenAIService
+from services.bhashini_service import BhashiniService
+from services.language_detector import LanguageDetector
+
+# Sentence ends: Latin punctuation, the Devanagari danda, or a line break
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?।])\s+|\n+")
+
+def split_sentences(buffer: str, min_chars: int = 25) -> Tuple[List[str], str]:
+    """
+    Split complete sentences off the front of streamed text
+    :param buffer: Text received so far and not yet emitted
+    :param min_chars: Short fragments (list markers, headings) are merged with what follows
+    :return: Tuple of (complete sentences, remaining partial text)
+    """
+    sentences = []
+    start = 0
+    pending = ""
+    for match in SENTENCE_BOUNDARY.finditer(buffer):
+        pending += buffer[start:match.start()]
+        start = match.end()
+        if len(pending.strip()) >= min_chars:
+            sentences.append(pending.strip())
+            pending = ""
+        else:
+            pending += " "
+    return sentences, pending + buffer[start:]
+
+class StageTimer:
+    """Accumulates wall-clock time per pipeline stage, in milliseconds"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    def add(self, stage: str, started: float):
+        self.timings[stage] = self.timings.get(stage, 0.0) + (time.perf_counter() - started) * 1000
+
+    def mark(self, stage: str):
+        """Record the time since the pipeline started, once"""
+        self.timings.setdefault(stage, (time.perf_counter() - self.started) * 1000)
+
+    def report(self) -> Dict[str, float]:
+        self.mark("total")
+        return {stage: round(value, 1) for stage, value in self.timings.items()}
+
+class VoiceChatOrchestrator:
+    def __init__(self, bhashini_service: BhashiniService, openai_service: AzureOpenAIService,
+                 language_detector: Optional[LanguageDetector] = None, max_concurrent_sentences: int = 3):
+        """
+        Initialize the orchestrator
+        :param bhashini_service: Service for ASR, NMT and TTS
+        :param openai_service: Service for legal reasoning
+        :param language_detector: Detector used to skip no-op translations
+        :param max_concurrent_sentences: Sentences back-translated and synthesized at once
+        """
+        self.bhashini_service = bhashini_service
+        self.openai_service = openai_service
+        self.language_detector = language_detector or LanguageDetector()
+        self.max_concurrent_sentences = max_concurrent_sentences
+        self.logger = logging.getLogger(__name__)
+
+    async def _render_sentence(self, sentence: str, language: str, include_speech: bool,
+                               semaphore: asyncio.Semaphore, timer: StageTimer) -> Dict:
+        """Back-translate and synthesize one response sentence"""
+        async with semaphore:
+            text = sentence
+            if language != "en":
+                started = time.perf_counter()
+                text = await self.bhashini_service.translate_text(sentence, "en", language)
+                timer.add("nmt_out", started)
+
+            audio = None
+            if include_speech:
+                started = time.perf_counter()
+                audio = await self.bhashini_service.text_to_speech(text, language)
+                timer.add("tts", started)
+
+        return {"text": text, "source_text": sentence, "audio": audio}
+
+    async def run(self, audio_data: str, language: str, conversation_history: Optional[List[str]] = None,
+                  include_speech: bool = True) -> AsyncIterator[Dict]:
+        """
+        Answer a spoken legal question: ASR, NMT, LLM, NMT, TTS
+
+        The LLM response is split into sentences as it streams. Each sentence is
+        back-translated and synthesized while later ones are still being
+        generated, and results are emitted in order as soon as they are ready.
+        :param audio_data: Base64 encoded audio from the client
+        :param language: Language the user speaks and wants the answer in
+        :param conversation_history: Previous turns in English, alternating user and assistant
+        :param include_speech: Whether to synthesize the answer
+        :return: Async iterator of events: transcript, query, sentence, done
+        """
+        timer = StageTimer()
+
+        started = time.perf_counter()
+        audio_data = await self.bhashini_service.prepare_audio(audio_data)
+        timer.add("normalize", started)
+
+        started = time.perf_counter()
+        transcript = await self.bhashini_service.speech_to_text(audio_data, language)
+        timer.add("asr", started)
+        yield {"event": "transcript", "text": transcript, "language": language}
+
+        source_language, _ = self.language_detector.plan_translation(transcript, "en", language)
+        query = transcript
+        if source_language:
+            started = time.perf_counter()
+            query = await self.bhashini_service.translate_text(transcript, source_language, "en")
+            timer.add("nmt_in", started)
+        yield {"event": "query", "text": query}
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_sentences)
+        pending: asyncio.Queue = asyncio.Queue()
+        response_parts: List[str] = []
+
+        def schedule(sentence: str):
+            pending.put_nowait(asyncio.ensure_future(
+                self._render_sentence(sentence, language, include_speech, semaphore, timer)
+            ))
+
+        async def generate():
+            started = time.perf_counter()
+            buffer = ""
+            try:
+                async for token in self.openai_service.stream_legal_response(conversation_history or [], query):
+                    timer.mark("llm_first_token")
+                    response_parts.append(token)
+                    buffer += token
+                    sentences, buffer = split_sentences(buffer)
+                    for sentence in sentences:
+                        schedule(sentence)
+                if buffer.strip():
+                    schedule(buffer.strip())
+            finally:
+                timer.add("llm", started)
+                pending.put_nowait(None)
+
+        producer = asyncio.ensure_future(generate())
+        try:
+            index = 0
+            while True:
+                task = await pending.get()
+                if task is None:
+                    break
+                rendered = await task
+                if rendered["audio"]:
+                    timer.mark("first_audio")
+                yield {"event": "sentence", "index": index, **rendered}
+                index += 1
+
+            # Surface LLM errors raised after the last sentence was queued
+            await producer
+        finally:
+            producer.cancel()
+            while not pending.empty():
+                task = pending.get_nowait()
+                if task is not None:
+                    task.cancel()
+
+        yield {"event": "done", "response_text": "".join(response_parts), "timings": timer.report()}
@@ -25,8 +25,6 @@ class SessionManager:
         if not os.path.exists(session_dir):
             os.makedirs(session_dir)
             
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
     def save_session(self, session_name):
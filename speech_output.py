@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Tuple
+import numpy as np
+import sounddevice as sd
+from services.audio_processing import decode_wav
+from services.voice_chat_orchestrator import split_sentences
+
+logger = logging.getLogger(__name__)
+
+class JitterBuffer:
+    def __init__(self, prebuffer_frames: int):
+        """
+        Buffer audio between a bursty producer and the audio callback
+
+        Output starts once prebuffer_frames are buffered, or once the producer
+        ended a shorter utterance, and pauses to refill after an underrun, so
+        uneven chunk arrival becomes a short delay instead of crackling.
+        :param prebuffer_frames: Frames buffered before output starts
+        """
+        self.prebuffer_frames = prebuffer_frames
+        self.started_at: Optional[float] = None
+        self.underruns = 0
+        self._chunks: Deque[np.ndarray] = deque()
+        self._offset = 0
+        self._buffered = 0
+        self._playing = False
+        self._ended = False
+        self._lock = threading.Lock()
+
+    @property
+    def buffered_frames(self) -> int:
+        return self._buffered
+
+    def push(self, samples: np.ndarray):
+        """
+        Queue mono float32 samples for output
+        :param samples: Samples
+        """
+        with self._lock:
+            self._chunks.append(samples)
+            self._buffered += len(samples)
+            self._ended = False
+
+    def end(self):
+        """Mark the end of the utterance, so a tail shorter than the prebuffer still plays"""
+        with self._lock:
+            self._ended = True
+
+    def clear(self):
+        """Drop everything buffered, e.g. when the user interrupts"""
+        with self._lock:
+            self._chunks.clear()
+            self._offset = 0
+            self._buffered = 0
+            self._playing = False
+            self._ended = False
+            self.started_at = None
+
+    def fill(self, out: np.ndarray):
+        """
+        Copy the next frames into an output block, padding with silence; called by the audio callback
+        :param out: Mono output block
+        """
+        with self._lock:
+            if not self._playing:
+                if self._buffered >= self.prebuffer_frames or (self._ended and self._buffered):
+                    self._playing = True
+                    if self.started_at is None:
+                        self.started_at = time.perf_counter()
+                else:
+                    out.fill(0)
+                    return
+
+            written = 0
+            while written < len(out) and self._chunks:
+                chunk = self._chunks[0]
+                count = min(len(out) - written, len(chunk) - self._offset)
+                out[written:written + count] = chunk[self._offset:self._offset + count]
+                written += count
+                self._offset += count
+                if self._offset == len(chunk):
+                    self._chunks.popleft()
+                    self._offset = 0
+            self._buffered -= written
+
+            if written < len(out):
+                out[written:] = 0
+                self._playing = False
+                if not self._ended:
+                    self.underruns += 1
+
+class SpeechOutput:
+    def __init__(self, synthesize: Callable[[str, str], Awaitable[str]], prebuffer_ms: int = 100,
+                 block_ms: int = 20, max_concurrent: int = 2):
+        """
+        Play synthesized speech through a sounddevice output stream as it arrives
+
+        The stream stays open while the client runs, so a new utterance only
+        has to fill the jitter buffer before it is heard: with the defaults,
+        output starts within about 120 ms of the first chunk.
+        :param synthesize: TTS source, called with (text, language), returning base64 WAV audio
+        :param prebuffer_ms: Audio buffered before output starts
+        :param block_ms: Audio callback block size
+        :param max_concurrent: Sentences synthesized ahead of the one playing
+        """
+        # Fails early when there is no output device
+        sd.query_devices(kind="output")
+        self.synthesize = synthesize
+        self.prebuffer_ms = prebuffer_ms
+        self.block_ms = block_ms
+        self.max_concurrent = max_concurrent
+        self.sample_rate: Optional[int] = None
+        self.buffer: Optional[JitterBuffer] = None
+        self.stream: Optional[sd.OutputStream] = None
+        self._speaker: Optional["ResponseSpeaker"] = None
+        self._speaker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _open(self, sample_rate: int):
+        self.close()
+        buffer = JitterBuffer(sample_rate * self.prebuffer_ms // 1000)
+
+        def callback(outdata, frames, time, status):
+            buffer.fill(outdata[:, 0])
+
+        self.stream = sd.OutputStream(
+            samplerate=sample_rate,
+            channels=1,
+            dtype="float32",
+            blocksize=sample_rate * self.block_ms // 1000,
+            latency="low",
+            callback=callback
+        )
+        self.stream.start()
+        self.sample_rate = sample_rate
+        self.buffer = buffer
+
+    def play(self, samples: np.ndarray, sample_rate: int):
+        """
+        Queue decoded audio behind what is already playing
+        :param samples: Samples shaped (frames, channels)
+        :param sample_rate: Sample rate
+        """
+        if sample_rate != self.sample_rate:
+            self._open(sample_rate)
+        self.buffer.push(samples.mean(axis=1, dtype=np.float32) if samples.shape[1] > 1 else samples[:, 0])
+
+    def speak(self, language: str) -> "ResponseSpeaker":
+        """
+        Start speaking an answer, replacing any answer still being spoken; call on the event loop
+        :param language: Language to synthesize
+        :return: Speaker to feed the answer text to
+        """
+        self.interrupt()
+        self._speaker = ResponseSpeaker(self, language)
+        self._speaker_loop = asyncio.get_running_loop()
+        return self._speaker
+
+    def interrupt(self):
+        """Stop speaking at once, e.g. when the user starts talking; callable from any thread"""
+        speaker, loop = self._speaker, self._speaker_loop
+        self._speaker = None
+        if speaker is not None:
+            loop.call_soon_threadsafe(speaker.cancel)
+        if self.buffer is not None:
+            self.buffer.clear()
+
+    def close(self):
+        """Close the output stream"""
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+            self.sample_rate = None
+
+class ResponseSpeaker:
+    def __init__(self, output: SpeechOutput, language: str):
+        """
+        Speak an answer while it streams, created by SpeechOutput.speak
+
+        Text is split into sentences as it arrives. Each sentence is synthesized
+        while earlier ones play, and sentences are played in order.
+        :param output: Speech output
+        :param language: Language to synthesize
+        """
+        self.output = output
+        self.language = language
+        self.cancelled = False
+        self.first_chunk_at: Optional[float] = None
+        self._text = ""
+        self._semaphore = asyncio.Semaphore(output.max_concurrent)
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.ensure_future(self._play())
+
+    def add(self, text: str):
+        """
+        Add streamed answer text
+        :param text: Text fragment
+        """
+        if self.cancelled:
+            return
+        self._text += text
+        sentences, self._text = split_sentences(self._text)
+        for sentence in sentences:
+            self._schedule(sentence)
+
+    def end(self):
+        """Speak the remaining text; the answer is complete"""
+        if self.cancelled:
+            return
+        if self._text.strip():
+            self._schedule(self._text.strip())
+        self._text = ""
+        self._pending.put_nowait(None)
+
+    def cancel(self):
+        """Stop synthesizing and playing"""
+        self.cancelled = True
+        self._task.cancel()
+        while not self._pending.empty():
+            task = self._pending.get_nowait()
+            if task is not None:
+                task.cancel()
+
+    def _schedule(self, sentence: str):
+        self._pending.put_nowait(asyncio.ensure_future(self._synthesize(sentence)))
+
+    async def _synthesize(self, sentence: str) -> Tuple[np.ndarray, int]:
+        async with self._semaphore:
+            audio = await self.output.synthesize(sentence, self.language)
+        return decode_wav(audio)
+
+    async def _play(self):
+        while True:
+            task = await self._pending.get()
+            if task is None:
+                break
+            try:
+                samples, sample_rate = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Skipping a sentence that could not be synthesized: {str(e)}")
+                continue
+            if self.first_chunk_at is None:
+                self.first_chunk_at = time.perf_counter()
+            self.output.play(samples, sample_rate)
+
+        buffer = self.output.buffer
+        if buffer is None:
+            return
+        buffer.end()
+        # A short answer starts playing with one of the next audio callbacks
+        for _ in range(5):
+            if buffer.started_at is not None:
+                break
+            await asyncio.sleep(self.output.block_ms / 1000)
+        if buffer.started_at is not None and self.first_chunk_at is not None:
+            logger.info(
+                f"Speech started {(buffer.started_at - self.first_chunk_at) * 1000:.0f} ms after the first "
+                f"audio chunk, {buffer.underruns} underruns"
+            )
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Local stand-in for the Azure OpenAI chat completions API.
+
+Serves /openai/deployments/{deployment}/chat/completions the way the
+AzureOpenAI clients call it, with deterministic answers, optional SSE
+streaming, configurable time to first token, token rate and error rate, so the
+chat and voice chat paths can be tested and benchmarked offline.
+
+Usage:
+    python -m tools.azure_openai_standin --port 8002 --first-token-ms 400 --tokens-per-second 50
+    AZURE_OPENAI_ENDPOINT=http://localhost:8002 AZURE_OPENAI_API_KEY=standin python main.py --api
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Dict, List
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SENTENCES = [
+    "Under Section 498A of the Indian Penal Code, cruelty by a husband or his relatives is a cognizable offence.",
+    "You can file a complaint at the nearest police station or approach the magistrate directly.",
+    "Keep copies of the rent agreement, payment receipts and any messages with the landlord.",
+    "A legal notice under Section 80 of the Code of Civil Procedure is required before suing the government.",
+    "The limitation period for recovering money under a written contract is three years.",
+    "You may approach the District Legal Services Authority for free legal aid.",
+    "Unpaid wages can be claimed before the Labour Commissioner under the Payment of Wages Act.",
+    "Do you have any written record of the agreement or the payments made?"
+]
+
+@dataclass
+class StandinSettings:
+    """Behaviour knobs for the stand-in server"""
+    first_token_ms: float = 400.0  # Latency until the first token
+    jitter_ms: float = 100.0  # Uniform random latency added to the first token
+    tokens_per_second: float = 50.0  # Streaming rate after the first token, 0 for no delay
+    answer_tokens: int = 120  # Approximate answer length in words
+    error_rate: float = 0.0  # Probability of answering with a 503
+    seed: int = 0  # Seed for jitter and error injection
+
+def fake_answer(messages: List[Dict], answer_tokens: int) -> List[str]:
+    """
+    Produce a deterministic answer for the last user message, split into tokens
+    :param messages: Chat completion messages
+    :param answer_tokens: Approximate answer length in words
+    :return: List of tokens, each with its leading space
+    """
+    question = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    digest = hashlib.sha256(question.encode()).digest()
+    words: List[str] = []
+    index = 0
+    while len(words) < answer_tokens:
+        words.extend(SENTENCES[(digest[index % len(digest)] + index) % len(SENTENCES)].split())
+        index += 1
+    return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+def _chunk(completion_id: str, model: str, created: int, delta: Dict, finish_reason=None) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+def create_app(settings: StandinSettings) -> FastAPI:
+    """
+    Create the stand-in application
+    :param settings: Latency, token rate and fault settings
+    :return: FastAPI application
+    """
+    app = FastAPI(title="Azure OpenAI Stand-in")
+    rng = random.Random(settings.seed)
+    counters: Counter = Counter()
+
+    @app.post("/openai/deployments/{deployment}/chat/completions")
+    async def chat_completions(deployment: str, request: Request):
+        payload = await request.json()
+        counters["requests"] += 1
+        await asyncio.sleep((settings.first_token_ms + rng.uniform(0, settings.jitter_ms)) / 1000)
+
+        if rng.random() < settings.error_rate:
+            counters["errors"] += 1
+            return JSONResponse(
+                {"error": {"code": "ServiceUnavailable", "message": "Injected upstream failure"}},
+                status_code=503
+            )
+
+        tokens = fake_answer(payload.get("messages", []), settings.answer_tokens)
+        token_delay = 1 / settings.tokens_per_second if settings.tokens_per_second > 0 else 0.0
+        completion_id = f"chatcmpl-standin-{counters['requests']}"
+        created = int(time.time())
+        counters["tokens"] += len(tokens)
+
+        if not payload.get("stream"):
+            await asyncio.sleep(token_delay * len(tokens))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": deployment,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)}
+            }
+
+        async def events() -> AsyncIterator[str]:
+            yield _chunk(completion_id, deployment, created, {"role": "assistant", "content": ""})
+            for token in tokens:
+                yield _chunk(completion_id, deployment, created, {"content": token})
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+            yield _chunk(completion_id, deployment, created, {}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats() -> Dict:
+        return {"settings": asdict(settings), "counters": dict(counters)}
+
+    @app.post("/stats/reset")
+    async def reset_stats() -> Dict:
+        counters.clear()
+        return {"status": "reset"}
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Azure OpenAI API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--first-token-ms", type=float, default=StandinSettings.first_token_ms)
+    parser.add_argument("--jitter-ms", type=float, default=StandinSettings.jitter_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=StandinSettings.tokens_per_second)
+    parser.add_argument("--answer-tokens", type=int, default=StandinSettings.answer_tokens)
+    parser.add_argument("--error-rate", type=float, default=StandinSettings.error_rate)
+    parser.add_argument("--seed", type=int, default=StandinSettings.seed)
+    args = parser.parse_args()
+
+    settings = StandinSettings(
+        first_token_ms=args.first_token_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        answer_tokens=args.answer_tokens,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+
+    import uvicorn
+    uvicorn.run(create_app(settings), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+Local stand-in for the Bhashini pipeline API.
+
+Implements the /v1/pipeline/search, /config and /compute endpoints used by
+BhashiniService with deterministic ASR, NMT and TTS outputs, plus configurable
+latency, payload-size dependent delay, error rate and rate limiting so the
+Bhashini path can be tested and benchmarked offline.
+
+Usage:
+    python -m tools.bhashini_standin --port 8001 --latency-ms 300 --error-rate 0.02
+    BHASHINI_BASE_URL=http://localhost:8001 python main.py --api
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import io
+import math
+import random
+import struct
+import time
+import wave
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+VOCABULARY = """
+mera makaan malik kiraya wapas nahi de raha hai mujhe police mein shikayat karni
+hai pati ne dahej ki maang ki adalat mein case chal raha hai vakil ki fees zameen
+ke kagaz naukri se nikal diya tankhwah nahi mili notice bheja
+""".split()
+
+@dataclass
+class StandinSettings:
+    """Behaviour knobs for the stand-in server"""
+    latency_ms: float = 200.0  # Base latency of every call
+    jitter_ms: float = 50.0  # Uniform random latency added on top
+    ms_per_kb: float = 0.5  # Extra latency per KB of request payload
+    asr_realtime_factor: float = 0.1  # Extra ASR latency per second of audio, in seconds
+    error_rate: float = 0.0  # Probability of answering with a 503
+    rate_limit: float = 0.0  # Requests per second across all clients, 0 disables
+    burst: int = 20  # Rate limiter bucket size
+    seed: int = 0  # Seed for jitter and error injection
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize a token bucket
+        :param rate: Tokens added per second
+        :param capacity: Maximum number of stored tokens
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> Optional[float]:
+        """
+        Take one token
+        :return: None if a token was available, otherwise seconds until one is
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return None
+        return (1.0 - self.tokens) / self.rate
+
+def _digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode()).digest()
+
+def audio_duration(audio_data: str) -> float:
+    """
+    Get the duration of base64 WAV audio, estimating from size for other formats
+    :param audio_data: Base64 encoded audio
+    :return: Duration in seconds
+    """
+    try:
+        with wave.open(io.BytesIO(base64.b64decode(audio_data))) as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except Exception:
+        # Assume 16 kHz 16-bit mono
+        return len(audio_data) * 3 / 4 / 32000.0
+
+def fake_transcript(audio_data: str) -> str:
+    """
+    Produce a deterministic transcript, about 2.5 words per second of audio
+    :param audio_data: Base64 encoded audio
+    :return: Transcript
+    """
+    word_count = max(1, int(audio_duration(audio_data) * 2.5))
+    digest = _digest(audio_data)
+    return " ".join(
+        VOCABULARY[digest[i % len(digest)] * (i + 1) % len(VOCABULARY)]
+        for i in range(word_count)
+    )
+
+def fake_translation(text: str, source_language: str, target_language: str) -> str:
+    """
+    Produce a deterministic translation
+    :param text: Source text
+    :param source_language: Source language code
+    :param target_language: Target language code
+    :return: Translated text
+    """
+    return f"[{source_language}->{target_language}] {text}"
+
+def fake_speech(text: str, sample_rate: int = 16000) -> str:
+    """
+    Produce deterministic speech audio, 60 ms of tone per character
+    :param text: Text to speak
+    :param sample_rate: Sample rate of the generated audio
+    :return: Base64 encoded 16-bit mono WAV
+    """
+    # Whole periods of a tone, so one period can be repeated instead of computed per sample
+    period = 80 + _digest(text)[0] % 80
+    cycle = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * i / period)))
+        for i in range(period)
+    )
+    frame_count = int(sample_rate * 0.06 * max(1, len(text)))
+    frames = (cycle * (frame_count // period + 1))[:frame_count * 2]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+def run_tasks(task_sequence: List[str], source_language: str, target_language: str,
+              input_data: str) -> Dict:
+    """
+    Run a task sequence over the input the way the pipeline compute endpoint does
+    :param task_sequence: List of tasks (ASR, NMT, TTS)
+    :param source_language: Source language code
+    :param target_language: Target language code
+    :param input_data: Input data (text or audio base64)
+    :return: Compute response
+    """
+    result = {}
+    text = input_data
+    for task in task_sequence:
+        if task == "ASR":
+            text = fake_transcript(input_data)
+            result["text"] = text
+        elif task == "NMT":
+            text = fake_translation(text, source_language, target_language)
+            result["translation"] = text
+        elif task == "TTS":
+            result["audio"] = fake_speech(text)
+    return result
+
+def create_app(settings: StandinSettings) -> FastAPI:
+    """
+    Create the stand-in application
+    :param settings: Latency, fault and rate limit settings
+    :return: FastAPI application
+    """
+    app = FastAPI(title="Bhashini Stand-in")
+    rng = random.Random(settings.seed)
+    bucket = TokenBucket(settings.rate_limit, settings.burst) if settings.rate_limit > 0 else None
+    counters: Counter = Counter()
+    configs: Dict[str, Dict] = {}
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if not request.url.path.startswith("/v1/"):
+            return await call_next(request)
+
+        counters[f"requests:{request.url.path}"] += 1
+        body = await request.body()
+
+        if bucket is not None:
+            retry_after = bucket.take()
+            if retry_after is not None:
+                counters["rate_limited"] += 1
+                return JSONResponse(
+                    {"detail": "Rate limit exceeded"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(retry_after))}
+                )
+
+        delay = settings.latency_ms + rng.uniform(0, settings.jitter_ms)
+        delay += settings.ms_per_kb * len(body) / 1024
+        await asyncio.sleep(delay / 1000)
+
+        if rng.random() < settings.error_rate:
+            counters["errors"] += 1
+            return JSONResponse({"detail": "Injected upstream failure"}, status_code=503)
+
+        return await call_next(request)
+
+    @app.post("/v1/pipeline/search")
+    async def search(payload: Dict) -> Dict:
+        return {
+            "pipelines": [{
+                "pipelineId": "standin-pipeline",
+                "taskSequence": payload.get("taskSequence", []),
+                "languages": [{
+                    "sourceLanguage": payload.get("sourceLanguage"),
+                    "targetLanguage": payload.get("targetLanguage")
+                }]
+            }]
+        }
+
+    @app.post("/v1/pipeline/config")
+    async def config(payload: Dict) -> Dict:
+        task_sequence = payload.get("taskSequence", [])
+        config_id = hashlib.sha1(repr(sorted(payload.items())).encode()).hexdigest()[:12]
+        configs[config_id] = payload
+        return {
+            "configId": config_id,
+            "pipelineId": payload.get("pipelineId") or "standin-pipeline",
+            "taskSequence": task_sequence,
+            "sourceLanguage": payload.get("sourceLanguage"),
+            "targetLanguage": payload.get("targetLanguage")
+        }
+
+    @app.post("/v1/pipeline/compute")
+    async def compute(payload: Dict) -> Dict:
+        config = payload.get("config") or {}
+        task_sequence = config.get("taskSequence", [])
+        input_data = payload.get("input", "")
+        if "ASR" in task_sequence and settings.asr_realtime_factor > 0:
+            await asyncio.sleep(audio_duration(input_data) * settings.asr_realtime_factor)
+        for task in task_sequence:
+            counters[f"tasks:{task}"] += 1
+        return run_tasks(
+            task_sequence,
+            config.get("sourceLanguage", ""),
+            config.get("targetLanguage", ""),
+            input_data
+        )
+
+    @app.get("/stats")
+    async def stats() -> Dict:
+        return {"settings": asdict(settings), "counters": dict(counters)}
+
+    @app.post("/stats/reset")
+    async def reset_stats() -> Dict:
+        counters.clear()
+        return {"status": "reset"}
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Bhashini API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=StandinSettings.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=StandinSettings.jitter_ms)
+    parser.add_argument("--ms-per-kb", type=float, default=StandinSettings.ms_per_kb)
+    parser.add_argument("--asr-realtime-factor", type=float, default=StandinSettings.asr_realtime_factor)
+    parser.add_argument("--error-rate", type=float, default=StandinSettings.error_rate)
+    parser.add_argument("--rate-limit", type=float, default=StandinSettings.rate_limit)
+    parser.add_argument("--burst", type=int, default=StandinSettings.burst)
+    parser.add_argument("--seed", type=int, default=StandinSettings.seed)
+    args = parser.parse_args()
+
+    settings = StandinSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        ms_per_kb=args.ms_per_kb,
+        asr_realtime_factor=args.asr_realtime_factor,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed
+    )
+
+    import uvicorn
+    uvicorn.run(create_app(settings), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
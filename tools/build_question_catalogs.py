@@ -0,0 +1,115 @@
+"""
+Build localized question catalogs for the ConversationManager flow.
+
+Every user-facing flow string is translated once per language through Bhashini
+and written to locales/<language>.json, tagged with the flow version and a hash
+of each English source string. Re-running the build only translates strings
+that are new or changed since the previous catalog.
+
+Usage:
+    python -m tools.build_question_catalogs --languages hi ta te
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List
+from conversation_manager import CATALOG_DIR, ConversationManager, source_hash
+from services.bhashini_service import BhashiniService
+
+SUPPORTED_LANGUAGES = ["hi", "bn", "gu", "kn", "ml", "mr", "or", "pa", "ta", "te"]
+
+logger = logging.getLogger(__name__)
+
+async def translate_batch(service: BhashiniService, texts: List[str], language: str,
+                          semaphore: asyncio.Semaphore) -> List[str]:
+    """
+    Translate a batch of strings, one NMT call per batch when the line count survives
+    :param service: Bhashini service
+    :param texts: English strings without newlines
+    :param language: Target language code
+    :param semaphore: Bounds concurrent upstream calls
+    :return: Translations in input order
+    """
+    async with semaphore:
+        joined = await service.translate_text("\n".join(texts), "en", language)
+    lines = [line.strip() for line in joined.split("\n")]
+    if len(lines) == len(texts):
+        return lines
+
+    # The model merged or split lines, translate one by one instead
+    logger.warning(f"Batch translation to '{language}' lost line alignment, retrying per string")
+
+    async def translate_one(text: str) -> str:
+        async with semaphore:
+            return await service.translate_text(text, "en", language)
+
+    return list(await asyncio.gather(*(translate_one(text) for text in texts)))
+
+async def build_catalog(service: BhashiniService, manager: ConversationManager, language: str,
+                        output_dir: str, batch_size: int, semaphore: asyncio.Semaphore) -> int:
+    """
+    Build or refresh the catalog for one language
+    :return: Number of strings sent for translation
+    """
+    path = os.path.join(output_dir, f"{language}.json")
+    previous: Dict[str, List[str]] = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            previous = json.load(f).get("strings", {})
+
+    strings = manager.flow_strings()
+    catalog = {}
+    pending = []
+    for key, text in strings.items():
+        entry = previous.get(key)
+        if entry and entry[0] == source_hash(text):
+            catalog[key] = entry
+        else:
+            pending.append(key)
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    results = await asyncio.gather(*(
+        translate_batch(service, [strings[key] for key in batch], language, semaphore)
+        for batch in batches
+    ))
+    for batch, translations in zip(batches, results):
+        for key, translation in zip(batch, translations):
+            catalog[key] = [source_hash(strings[key]), translation]
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": manager.flow_version(), "language": language, "strings": catalog},
+            f,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            sort_keys=True
+        )
+    return len(pending)
+
+async def build_catalogs(languages: List[str], output_dir: str, batch_size: int, concurrency: int):
+    os.makedirs(output_dir, exist_ok=True)
+    manager = ConversationManager()
+    semaphore = asyncio.Semaphore(concurrency)
+    async with BhashiniService() as service:
+        counts = await asyncio.gather(*(
+            build_catalog(service, manager, language, output_dir, batch_size, semaphore)
+            for language in languages
+        ))
+    for language, count in zip(languages, counts):
+        logger.info(f"Catalog '{language}': translated {count} strings")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build localized question catalogs")
+    parser.add_argument("--languages", nargs="+", default=SUPPORTED_LANGUAGES)
+    parser.add_argument("--output", default=CATALOG_DIR)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(build_catalogs(args.languages, args.output, args.batch_size, args.concurrency))
+
+if __name__ == "__main__":
+    main()
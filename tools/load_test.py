@@ -0,0 +1,383 @@
+"""
+Load test the API with a realistic request mix at a target rate.
+
+Sends an open-loop stream of requests (arrivals do not wait for responses) mixing
+short and long voice clips, short and long texts, chat turns, voice chat and the
+speech endpoints across several languages. Reports latency percentiles,
+throughput and error rates per scenario, and compares them against a stored
+baseline, exiting non-zero on a regression. Meant to run against the local
+Bhashini and Azure OpenAI stand-ins, so results measure this service only.
+
+Usage:
+    python -m tools.bhashini_standin --port 8001 &
+    python -m tools.azure_openai_standin --port 8002 &
+    API_KEYS=$(python -m tools.load_test --print-keys) BHASHINI_BASE_URL=http://localhost:8001 \\
+        AZURE_OPENAI_ENDPOINT=http://localhost:8002 AZURE_OPENAI_API_KEY=standin python main.py --api &
+    python -m tools.load_test --rps 20 --duration 60 --save-baseline loadtest_baseline.json
+    python -m tools.load_test --rps 20 --duration 60 --baseline loadtest_baseline.json
+"""
+import argparse
+import asyncio
+import base64
+import io
+import json
+import math
+import random
+import struct
+import sys
+import time
+import wave
+from dataclasses import dataclass
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from tools.replay_capture import Result, print_summary, summarize
+
+LANGUAGES = ["hi", "ta", "te", "bn", "mr"]
+
+SHORT_TEXTS = {
+    "hi": "मेरा मकान मालिक किराया वापस नहीं दे रहा है",
+    "ta": "என் வீட்டு உரிமையாளர் வைப்புத் தொகையைத் திருப்பித் தரவில்லை",
+    "te": "నా ఇంటి యజమాని డిపాజిట్ తిరిగి ఇవ్వడం లేదు",
+    "bn": "আমার বাড়িওয়ালা জামানত ফেরত দিচ্ছেন না",
+    "mr": "माझा घरमालक अनामत रक्कम परत देत नाही"
+}
+
+LONG_TEXT = (
+    "I worked at a private company for three years. Last month I was dismissed without notice "
+    "and my salary for the last two months has not been paid. The company says I resigned, "
+    "but I never signed any resignation letter. I have my appointment letter, salary slips "
+    "and emails with my manager. What are my rights, where should I file a complaint, and is "
+    "there a time limit for claiming the unpaid wages and compensation for wrongful termination? "
+) * 2
+
+CHAT_QUESTIONS = [
+    "My landlord is not returning my security deposit. What can I do?",
+    "My employer has not paid my salary for two months.",
+    "How do I file a complaint about dowry harassment?",
+    "What documents do I need to transfer agricultural land?"
+]
+
+# name: (weight, route)
+DEFAULT_MIX = {
+    "text/short": (0.25, "/api/process-text"),
+    "text/long": (0.10, "/api/process-text"),
+    "voice/short": (0.20, "/api/process-voice"),
+    "voice/long": (0.05, "/api/process-voice"),
+    "speech-to-text": (0.05, "/api/speech-to-text"),
+    "text-to-speech": (0.10, "/api/text-to-speech"),
+    "chat": (0.15, "/api/chat"),
+    "voice-chat": (0.10, "/api/voice-chat")
+}
+
+# Clip lengths in seconds; speech-to-text takes the audio in the query string, so its clip is tiny
+AUDIO_SECONDS = {"short": 3.0, "long": 20.0, "query": 0.2, "voice-chat": 4.0}
+
+def synthetic_speech(seconds: float, sample_rate: int = 16000) -> bytes:
+    """
+    Build a speech-like WAV clip: tone bursts separated by pauses, so silence splitting has work to do
+    :param seconds: Clip length
+    :param sample_rate: Sample rate
+    :return: 16-bit mono WAV bytes
+    """
+    frames = bytearray()
+    burst, pause = int(0.8 * sample_rate), int(0.25 * sample_rate)
+    total = int(seconds * sample_rate)
+    period = 97
+    while len(frames) // 2 < total:
+        cycle = b"".join(
+            struct.pack("<h", int(6000 * math.sin(2 * math.pi * i / period))) for i in range(period)
+        )
+        frames += (cycle * (burst // period + 1))[:burst * 2]
+        frames += b"\x00\x00" * pause
+        period = 80 + (period * 7) % 80
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames[:total * 2]))
+    return buffer.getvalue()
+
+@dataclass
+class Request:
+    method: str
+    route: str
+    params: Optional[Dict] = None
+    body: Optional[Dict] = None
+    streaming: bool = False  # NDJSON response whose events may report failures in-band
+
+class PayloadFactory:
+    def __init__(self, seed: int = 0):
+        """
+        Initialize request builders for every scenario
+
+        Each audio payload differs in a few samples, so server side caches see
+        distinct clips the way they would with real users.
+        :param seed: Seed for languages and payload choices
+        """
+        self.rng = random.Random(seed)
+        self.clips = {name: synthetic_speech(seconds) for name, seconds in AUDIO_SECONDS.items()}
+        self.counter = count()
+        self.chat_sessions: List[str] = []
+        self.builders: Dict[str, Callable[[], Request]] = {
+            "text/short": self.text_short,
+            "text/long": self.text_long,
+            "voice/short": lambda: self.voice("short"),
+            "voice/long": lambda: self.voice("long"),
+            "speech-to-text": self.speech_to_text,
+            "text-to-speech": self.text_to_speech,
+            "chat": self.chat,
+            "voice-chat": self.voice_chat
+        }
+
+    def audio(self, clip: str) -> str:
+        data = bytearray(self.clips[clip])
+        # Overwrite the first samples after the 44 byte header with a request counter
+        data[44:52] = struct.pack("<Q", next(self.counter))
+        return base64.b64encode(bytes(data)).decode()
+
+    def text_short(self) -> Request:
+        language = self.rng.choice(LANGUAGES)
+        # Half of the requests leave the source language to local detection
+        source = language if self.rng.random() < 0.5 else None
+        return Request("POST", "/api/process-text", body={
+            "text": SHORT_TEXTS[language], "source_language": source, "target_language": "en"
+        })
+
+    def text_long(self) -> Request:
+        return Request("POST", "/api/process-text", body={
+            "text": LONG_TEXT, "source_language": "en", "target_language": self.rng.choice(LANGUAGES),
+            "include_speech": self.rng.random() < 0.3
+        })
+
+    def voice(self, clip: str) -> Request:
+        return Request("POST", "/api/process-voice", body={
+            "audio_data": self.audio(clip), "source_language": self.rng.choice(LANGUAGES),
+            "target_language": "en", "include_speech": False
+        })
+
+    def speech_to_text(self) -> Request:
+        return Request("POST", "/api/speech-to-text", params={
+            "audio_data": self.audio("query"), "language": self.rng.choice(LANGUAGES)
+        })
+
+    def text_to_speech(self) -> Request:
+        language = self.rng.choice(LANGUAGES)
+        return Request("POST", "/api/text-to-speech", params={"text": SHORT_TEXTS[language], "language": language})
+
+    def chat(self) -> Request:
+        body = {"message": self.rng.choice(CHAT_QUESTIONS), "language": "en"}
+        # Most turns continue an earlier conversation
+        if self.chat_sessions and self.rng.random() < 0.7:
+            body["session_id"] = self.rng.choice(self.chat_sessions)
+        return Request("POST", "/api/chat", body=body)
+
+    def voice_chat(self) -> Request:
+        return Request("POST", "/api/voice-chat", streaming=True, body={
+            "audio_data": self.audio("voice-chat"), "language": self.rng.choice(LANGUAGES),
+            "include_speech": True
+        })
+
+def parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    """
+    Parse a mix like 'voice/short=0.5,chat=0.5'; scenarios not named are left out
+    :param spec: Mix specification, None for the default mix
+    :return: Dictionary of scenario to weight
+    """
+    if not spec:
+        return {name: weight for name, (weight, _) in DEFAULT_MIX.items()}
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario {name!r}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[name.strip()] = float(weight or 1.0)
+    return mix
+
+async def run_load(target: str, mix: Dict[str, float], rps: float, duration: float, warmup: float = 5.0,
+                   concurrency: int = 256, clients: int = 100, timeout: float = 60.0, poisson: bool = True,
+                   seed: int = 0) -> Tuple[List[Result], float]:
+    """
+    Send requests at a target rate and record their outcome
+
+    Arrivals are scheduled independently of responses. When the concurrency
+    bound is reached requests start late, and the lag is reported so an
+    overloaded load generator is not mistaken for a slow server.
+    :param target: Base URL of the server under test
+    :param mix: Scenario weights
+    :param rps: Target requests per second
+    :param duration: Measured seconds, after the warmup
+    :param warmup: Seconds of load before measuring starts
+    :param concurrency: Maximum requests in flight
+    :param clients: Distinct X-API-Key values, so the per-client rate limit is not what gets measured;
+                    the server must list them in API_KEYS, see client_keys
+    :param timeout: Per-request timeout in seconds
+    :param poisson: Exponential inter-arrival times instead of a fixed interval
+    :param seed: Seed for arrivals and payloads
+    :return: Tuple of (results of the measured window, measured wall time in seconds)
+    """
+    rng = random.Random(seed)
+    factory = PayloadFactory(seed)
+    keys = client_keys(clients)
+    names, weights = list(mix), list(mix.values())
+    results: List[Result] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        async def send(name: str, request: Request, api_key: str, lag_ms: float, measured: bool):
+            started = time.perf_counter()
+            status: Optional[int] = None
+            try:
+                async with session.request(request.method, target.rstrip("/") + request.route,
+                                           params=request.params, json=request.body,
+                                           headers={"X-API-Key": api_key}) as response:
+                    body = await response.read()
+                    status = response.status
+                if request.streaming and status == 200 and b'"event": "error"' in body:
+                    # Voice chat reports failures after the 200 has been sent
+                    status = None
+                elif name == "chat" and status == 200:
+                    factory.chat_sessions.append(json.loads(body)["session_id"])
+                    del factory.chat_sessions[:-1000]
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = None
+            finally:
+                semaphore.release()
+            if measured:
+                results.append((name, status, (time.perf_counter() - started) * 1000, lag_ms))
+
+        tasks = []
+        started = time.perf_counter()
+        end = warmup + duration
+        due = 0.0
+        for sequence in count():
+            due += rng.expovariate(rps) if poisson else 1 / rps
+            if due >= end:
+                break
+            delay = due - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await semaphore.acquire()
+            lag_ms = max(0.0, (time.perf_counter() - started - due) * 1000)
+            name = rng.choices(names, weights)[0]
+            tasks.append(asyncio.create_task(send(
+                name, factory.builders[name](), keys[sequence % clients], lag_ms, due >= warmup
+            )))
+
+        await asyncio.gather(*tasks)
+        measured_duration = time.perf_counter() - started - warmup
+
+    return results, measured_duration
+
+def client_keys(clients: int) -> List[str]:
+    """
+    API keys the load is spread over
+    :param clients: Number of keys
+    :return: Keys, to be registered in the server's API_KEYS
+    """
+    return [f"loadtest-{index}" for index in range(clients)]
+
+def compare(summary: Dict[str, Dict], baseline: Dict[str, Dict], latency_tolerance: float = 0.2,
+            min_latency_delta_ms: float = 25.0, error_tolerance: float = 0.01,
+            throughput_tolerance: float = 0.1) -> List[str]:
+    """
+    Find regressions against a baseline summary
+    :param summary: Summary of this run
+    :param baseline: Summary of the baseline run
+    :param latency_tolerance: Allowed relative growth of p50, p95 and p99
+    :param min_latency_delta_ms: Latency growth below this is treated as noise
+    :param error_tolerance: Allowed absolute growth of the error rate
+    :param throughput_tolerance: Allowed relative drop of the overall throughput
+    :return: List of regression descriptions, empty if none
+    """
+    regressions = []
+    for name, base in baseline.items():
+        current = summary.get(name)
+        if current is None:
+            continue
+        for column in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = max(base[column] * (1 + latency_tolerance), base[column] + min_latency_delta_ms)
+            if current[column] > limit:
+                regressions.append(f"{name} {column} {current[column]} > {round(limit, 1)} (baseline {base[column]})")
+        if current["error_rate"] > base["error_rate"] + error_tolerance:
+            regressions.append(f"{name} error_rate {current['error_rate']} > baseline {base['error_rate']}")
+
+    if "all" in baseline and "all" in summary:
+        floor = baseline["all"]["throughput_rps"] * (1 - throughput_tolerance)
+        if summary["all"]["throughput_rps"] < floor:
+            regressions.append(
+                f"all throughput_rps {summary['all']['throughput_rps']} < {round(floor, 2)} "
+                f"(baseline {baseline['all']['throughput_rps']})"
+            )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API with a realistic request mix")
+    parser.add_argument("--target", default="http://localhost:8000", help="Base URL of the server under test")
+    parser.add_argument("--rps", type=float, default=10.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds of load before measuring")
+    parser.add_argument("--mix", help="Scenario weights, e.g. 'voice/short=0.5,chat=0.5'; default is the full mix")
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--clients", type=int, default=100, help="Distinct API keys the load is spread over")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--uniform", action="store_true", help="Fixed inter-arrival time instead of Poisson")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Also write the summary to this file")
+    parser.add_argument("--save-baseline", help="Store this run as the baseline")
+    parser.add_argument("--baseline", help="Compare against this stored baseline and fail on regressions")
+    parser.add_argument("--print-keys", action="store_true",
+                        help="Print the API keys for the server's API_KEYS, comma separated, and exit")
+    parser.add_argument("--latency-tolerance", type=float, default=0.2, help="Allowed relative latency growth")
+    parser.add_argument("--error-tolerance", type=float, default=0.01, help="Allowed absolute error rate growth")
+    args = parser.parse_args()
+
+    if args.print_keys:
+        print(",".join(client_keys(args.clients)))
+        return
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    results, duration = asyncio.run(run_load(
+        args.target, mix, args.rps, args.duration, args.warmup, args.concurrency, args.clients,
+        args.timeout, not args.uniform, args.seed
+    ))
+    summary = summarize(results, duration)
+    print(f"Sent {len(results)} measured requests in {duration:.1f}s at a target of {args.rps} rps")
+    print_summary(summary)
+
+    report = {
+        "target_rps": args.rps,
+        "duration_seconds": round(duration, 2),
+        "mix": mix,
+        "routes": summary
+    }
+    for path in (args.json_path, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("target_rps") != args.rps or baseline.get("mix") != mix:
+            print("WARNING: baseline was recorded with a different rate or mix", file=sys.stderr)
+        regressions = compare(summary, baseline["routes"], args.latency_tolerance,
+                              error_tolerance=args.error_tolerance)
+        if regressions:
+            print(f"\nREGRESSION against {args.baseline}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
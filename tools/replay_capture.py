@@ -0,0 +1,213 @@
+"""
+Replay captured API traffic against a target server.
+
+Reads the envelopes written by the capture middleware (CAPTURE_SAMPLE_RATE),
+re-sends them with their original inter-arrival times, optionally scaled, under
+a concurrency bound and reports latency percentiles and error rates per route.
+
+Usage:
+    python -m tools.replay_capture captures --target http://localhost:8000
+    python -m tools.replay_capture captures --target http://localhost:8000 --speed 4 --concurrency 64
+    python -m tools.replay_capture captures --target http://localhost:8000 --speed 0 --route /api/process-text
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+# (route, status or None on transport failure, latency ms, dispatch lag ms)
+Result = Tuple[str, Optional[int], float, float]
+
+def load_envelopes(capture_dir: str, routes: Optional[Iterable[str]] = None,
+                   limit: Optional[int] = None) -> List[Dict]:
+    """
+    Read captured envelopes, including rotated files, ordered by arrival time
+    :param capture_dir: Capture directory
+    :param routes: Only replay these routes
+    :param limit: Maximum number of envelopes
+    :return: List of envelopes
+    """
+    base = os.path.join(capture_dir, "requests.jsonl")
+    rotated = sorted(
+        (name for name in os.listdir(capture_dir) if name.startswith("requests.jsonl.")),
+        key=lambda name: int(name.rsplit(".", 1)[1]),
+        reverse=True
+    )
+    paths = [os.path.join(capture_dir, name) for name in rotated] + [base]
+    selected = set(routes) if routes else None
+
+    envelopes = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                envelope = json.loads(line)
+                if selected is None or envelope["route"] in selected:
+                    envelopes.append(envelope)
+
+    envelopes.sort(key=lambda envelope: envelope["ts"])
+    return envelopes[:limit] if limit else envelopes
+
+def load_body(capture_dir: str, envelope: Dict) -> Optional[bytes]:
+    """
+    Load the stored body of an envelope
+    :param capture_dir: Capture directory
+    :param envelope: Captured envelope
+    :return: Body bytes, b"" for requests without a body, None if the body was not stored
+    """
+    if envelope.get("body_ref"):
+        digest = envelope["body_ref"]
+        with open(os.path.join(capture_dir, "bodies", digest[:2], digest), "rb") as f:
+            return f.read()
+    return b"" if envelope.get("request_bytes", 0) == 0 else None
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile
+    :param values: Sorted values
+    :param q: Percentile between 0 and 100
+    :return: Percentile value, 0.0 for no values
+    """
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+def summarize(results: List[Result], duration: float) -> Dict[str, Dict]:
+    """
+    Summarize replay results per route
+    :param results: Replay results
+    :param duration: Wall time of the replay in seconds
+    :return: Dictionary of route to statistics, plus an 'all' entry
+    """
+    by_route: Dict[str, List[Result]] = defaultdict(list)
+    for result in results:
+        by_route[result[0]].append(result)
+        by_route["all"].append(result)
+
+    summary = {}
+    for route, route_results in sorted(by_route.items()):
+        latencies = sorted(latency for _, _, latency, _ in route_results)
+        lags = sorted(lag for _, _, _, lag in route_results)
+        statuses = Counter(str(status) if status is not None else "failed" for _, status, _, _ in route_results)
+        errors = sum(1 for _, status, _, _ in route_results if status is None or status >= 500)
+        summary[route] = {
+            "requests": len(route_results),
+            "throughput_rps": round(len(route_results) / duration, 2) if duration > 0 else 0.0,
+            "error_rate": round(errors / len(route_results), 4),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(latencies[-1], 1),
+            "p95_lag_ms": round(percentile(lags, 95), 1),
+            "statuses": dict(statuses)
+        }
+    return summary
+
+async def replay(capture_dir: str, envelopes: List[Dict], target: str, speed: float = 1.0,
+                 concurrency: int = 32, timeout: float = 60.0) -> Tuple[List[Result], int, float]:
+    """
+    Re-send captured requests on their original schedule
+
+    With speed 2 requests arrive twice as fast as captured, with speed 0 as fast
+    as the concurrency bound allows. When the bound is reached, requests start
+    late; the lag is reported so an overloaded client is not mistaken for a slow
+    server.
+    :param capture_dir: Capture directory holding the bodies
+    :param envelopes: Envelopes ordered by arrival time
+    :param target: Base URL of the server under test
+    :param speed: Inter-arrival time scale
+    :param concurrency: Maximum requests in flight
+    :param timeout: Per-request timeout in seconds
+    :return: Tuple of (results, skipped envelopes, wall time in seconds)
+    """
+    results: List[Result] = []
+    skipped = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        async def send(envelope: Dict, body: bytes, lag_ms: float):
+            url = target.rstrip("/") + envelope["route"]
+            if envelope.get("query"):
+                url += "?" + envelope["query"]
+            headers = {"content-type": envelope["content_type"]} if envelope.get("content_type") else {}
+            started = time.perf_counter()
+            try:
+                async with session.request(envelope["method"], url, data=body or None, headers=headers) as response:
+                    await response.read()
+                    status = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = None
+            finally:
+                semaphore.release()
+            results.append((envelope["route"], status, (time.perf_counter() - started) * 1000, lag_ms))
+
+        tasks = []
+        first_ts = envelopes[0]["ts"] if envelopes else 0.0
+        started = time.perf_counter()
+        for envelope in envelopes:
+            body = load_body(capture_dir, envelope)
+            if body is None:
+                skipped += 1
+                continue
+
+            due = (envelope["ts"] - first_ts) / speed if speed > 0 else 0.0
+            delay = due - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await semaphore.acquire()
+            lag_ms = max(0.0, (time.perf_counter() - started - due) * 1000)
+            tasks.append(asyncio.create_task(send(envelope, body, lag_ms)))
+
+        await asyncio.gather(*tasks)
+        duration = time.perf_counter() - started
+
+    return results, skipped, duration
+
+def print_summary(summary: Dict[str, Dict]):
+    columns = ("requests", "throughput_rps", "error_rate", "p50_ms", "p95_ms", "p99_ms", "max_ms", "p95_lag_ms")
+    print(f"{'route':<28}" + "".join(f"{column:>15}" for column in columns))
+    for route, stats in summary.items():
+        print(f"{route:<28}" + "".join(f"{stats[column]:>15}" for column in columns))
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured API traffic")
+    parser.add_argument("capture_dir", help="Directory written by the capture middleware")
+    parser.add_argument("--target", default="http://localhost:8000", help="Base URL of the server under test")
+    parser.add_argument("--speed", type=float, default=1.0, help="Inter-arrival time scale, 0 for no delays")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--route", action="append", help="Only replay this route, can be repeated")
+    parser.add_argument("--limit", type=int, help="Replay at most this many requests")
+    parser.add_argument("--json", dest="json_path", help="Also write the summary to this file")
+    args = parser.parse_args()
+
+    envelopes = load_envelopes(args.capture_dir, args.route, args.limit)
+    if not envelopes:
+        parser.error(f"No captured requests in {args.capture_dir}")
+
+    results, skipped, duration = asyncio.run(
+        replay(args.capture_dir, envelopes, args.target, args.speed, args.concurrency, args.timeout)
+    )
+    summary = summarize(results, duration)
+    print(f"Replayed {len(results)} requests in {duration:.1f}s ({skipped} skipped without a stored body)")
+    print_summary(summary)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"duration_seconds": round(duration, 2), "skipped": skipped, "routes": summary}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Report where the import time of an entrypoint goes.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+prints the slowest imports by cumulative time, so cold start regressions of
+the API workers are easy to spot.
+
+Usage:
+    python -m tools.startup_report --module api.server --top 20
+    python -m tools.startup_report --module api.server --max-ms 800  # fail if slower
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_imports(module: str) -> Tuple[float, List[Tuple[int, int, int, str]]]:
+    """
+    Import a module in a fresh interpreter with -X importtime
+    :param module: Dotted module name
+    :return: Tuple of (wall time in ms, list of (self us, cumulative us, depth, name))
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(errors[-10:]))
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return wall_ms, entries
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time breakdown of an entrypoint")
+    parser.add_argument("--module", default="api.server")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=None, help="Exit non-zero if imports take longer")
+    args = parser.parse_args()
+
+    wall_ms, entries = measure_imports(args.module)
+    total_us = sum(entry[0] for entry in entries)
+
+    print(f"{args.module}: {total_us / 1000:.1f} ms importing {len(entries)} modules "
+          f"({wall_ms:.1f} ms wall including interpreter start)")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    # Top-level packages first: these are the imports worth making lazy
+    roots = sorted((entry for entry in entries if entry[2] <= 1), key=lambda entry: -entry[1])
+    for self_us, cumulative_us, depth, name in roots[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {'  ' * depth}{name}")
+
+    if args.max_ms is not None and total_us / 1000 > args.max_ms:
+        print(f"Import time exceeds budget of {args.max_ms:.0f} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()